@@ -1,19 +1,233 @@
 # -*- coding: utf-8 -*-
 import tkinter as tk
 from tkinter import messagebox, Toplevel, Label, Entry, Button, Frame, Canvas, Checkbutton, BooleanVar
-import pyttsx3
 import random
 import pygame
 import webbrowser
-import pyperclip
 from PIL import Image, ImageTk
 import os
 import sys
 import json
+import re
+import sqlite3
+import hashlib
+import importlib
+import socket
+import struct
+import tempfile
+import time
+import queue
+import argparse
+import functools
+from collections import deque
+from contextlib import contextmanager
+from urllib.parse import urlparse
 from dotenv import load_dotenv
-import requests
-import google.generativeai as genai
-from threading import Thread, Event, Lock
+from threading import Thread, Event, Lock, current_thread, local
+from concurrent.futures import ThreadPoolExecutor
+
+
+# --- Instrumentation ---
+TRACE_CAPACITY = 4096  # Spans kept in memory; the oldest are dropped first
+TRACE_FORMATS = ("json", "chrome")
+
+
+class Tracer:
+    """Named spans on the monotonic clock, kept in a fixed-size ring buffer
+
+    Recording is always on (two perf_counter calls and a deque append), and the
+    buffer is only written out when a trace path is configured with --trace or
+    TRIVIA_TRACE. "json" holds every span plus a per-name summary; "chrome" is
+    the trace event format that chrome://tracing and Perfetto open directly.
+    """
+    def __init__(self, capacity=TRACE_CAPACITY):
+        self._spans = deque(maxlen=capacity)
+        self._lock = Lock()
+        self._origin = time.perf_counter()
+        self._open = {}  # Token -> span started with begin() and not yet ended
+        self._next_token = 0
+        self._screen = None  # (name, token) of the screen on display
+        self.recorded = 0
+        self.path = None
+        self.format = "json"
+
+    def configure(self, path, fmt=None):
+        """Writes the trace to path on exit; fmt defaults to chrome for *.trace / *.trace.json"""
+        if fmt is None:
+            fmt = "chrome" if path.endswith((".trace", ".trace.json")) else "json"
+        if fmt not in TRACE_FORMATS:
+            raise ValueError(f"Unknown trace format {fmt!r} (expected one of {', '.join(TRACE_FORMATS)})")
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.format = fmt
+
+    def record(self, name, category, start, end=None, async_id=None, thread=None, **args):
+        """Adds a span that started at perf_counter() value start and ends now (or at end)"""
+        end = time.perf_counter() if end is None else end
+        thread = thread or current_thread()
+        with self._lock:
+            self._spans.append((name, category, start - self._origin, end - start,
+                                thread.ident, thread.name, async_id, args))
+            self.recorded += 1
+
+    @contextmanager
+    def span(self, name, category="app", **args):
+        """Times the with-block; add result details to the yielded args dict"""
+        start = time.perf_counter()
+        try:
+            yield args
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            self.record(name, category, start, **args)
+
+    def begin(self, name, category="app", **args):
+        """Starts a span that a later callback (or another thread) ends; returns the token for end()"""
+        with self._lock:
+            self._next_token += 1
+            token = self._next_token
+            self._open[token] = (name, category, time.perf_counter(), current_thread(), args)
+        return token
+
+    def end(self, token, **args):
+        with self._lock:
+            entry = self._open.pop(token, None)
+        if entry is not None:
+            name, category, start, thread, begin_args = entry
+            self.record(name, category, start, async_id=token, thread=thread, **dict(begin_args, **args))
+
+    def enter_screen(self, name):
+        """Ends the time spent on the previous screen and starts timing name (no-op if already there)"""
+        if self._screen and self._screen[0] == name:
+            return
+        previous, self._screen = self._screen, (name, self.begin(f"screen.{name}", "screen")) if name else None
+        if previous:
+            self.end(previous[1])
+
+    def spans(self):
+        with self._lock:
+            return list(self._spans)
+
+    def summary(self):
+        """Per span name: count, total, mean and max in milliseconds"""
+        by_name = {}
+        for name, _, _, duration, *_ in self.spans():
+            by_name.setdefault(name, []).append(duration * 1000)
+        return {name: {"count": len(values), "total_ms": round(sum(values), 3),
+                       "mean_ms": round(sum(values) / len(values), 3), "max_ms": round(max(values), 3)}
+                for name, values in sorted(by_name.items())}
+
+    def to_json(self):
+        spans = self.spans()
+        return {
+            "capacity": self._spans.maxlen,
+            "recorded": self.recorded,
+            "dropped": self.recorded - len(spans),
+            "spans": [{"name": name, "category": category, "start_ms": round(start * 1000, 3),
+                       "duration_ms": round(duration * 1000, 3), "thread": thread_name, "args": args}
+                      for name, category, start, duration, _, thread_name, _, args in spans],
+            "summary": self.summary(),
+        }
+
+    def to_chrome(self):
+        """Complete ("X") events per thread; spans ended from callbacks become async ("b"/"e") pairs"""
+        pid = os.getpid()
+        events = []
+        threads = {}
+        for name, category, start, duration, tid, thread_name, async_id, args in self.spans():
+            threads[tid] = thread_name
+            ts, dur = round(start * 1e6, 1), round(duration * 1e6, 1)
+            if async_id is None:
+                events.append({"name": name, "cat": category, "ph": "X", "ts": ts, "dur": dur,
+                               "pid": pid, "tid": tid, "args": args})
+            else:
+                common = {"name": name, "cat": category, "id": async_id, "pid": pid, "tid": tid}
+                events.append(dict(common, ph="b", ts=ts, args=args))
+                events.append(dict(common, ph="e", ts=round(ts + dur, 1)))
+        events.extend({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": thread_name}}
+                      for tid, thread_name in threads.items())
+        return {"traceEvents": events, "displayTimeUnit": "ms",
+                "otherData": {"recorded": self.recorded, "dropped": self.recorded - len(self._spans)}}
+
+    def dump(self, path=None, fmt=None):
+        """Writes the buffer to path (default: the configured path); returns the path or None"""
+        path = path or self.path
+        if not path:
+            return None
+        fmt = fmt or (self.format if path == self.path else ("chrome" if path.endswith((".trace", ".trace.json")) else "json"))
+        self.enter_screen(None)  # Close the dwell span of the last screen
+        payload = self.to_chrome() if fmt == "chrome" else self.to_json()
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"### ERROR: Could not write trace to {path}: {e}")
+            return None
+        print(f"✓ Trace with {len(self._spans)} spans written to {path} ({fmt})")
+        return path
+
+
+TRACER = Tracer()
+
+
+def traced_screen(name):
+    """Marks a TriviaGame method as showing a screen: times building it and how long it stays up"""
+    def decorate(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            TRACER.enter_screen(name)
+            with TRACER.span(f"screen.build.{name}", "screen"):
+                return method(self, *args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# --- Deferred Imports ---
+LAZY_IMPORT_SECONDS = {}  # Module name -> seconds its first use spent importing it
+
+
+class LazyModule:
+    """Imports the named module on first attribute access
+
+    The LLM clients alone take over a second to import and are not needed until
+    questions are generated, so they stay out of the cold start. The title screen
+    warm-up (AssetWarmer) loads them ahead of time from a background thread.
+    """
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = Lock()
+
+    def load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    TRACER.record(f"import.{self._name}", "startup", start)
+                    LAZY_IMPORT_SECONDS[self._name] = round(time.perf_counter() - start, 4)
+                    print(f"### DEBUG: Imported {self._name} in {LAZY_IMPORT_SECONDS[self._name]:.2f}s")
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+
+genai = LazyModule("google.generativeai")  # Question generation only
+requests = LazyModule("requests")  # Mistral and the fact-check search link
+pyttsx3 = LazyModule("pyttsx3")  # Offline voice, only used when gTTS fails
+pyperclip = LazyModule("pyperclip")  # Fact-check copy to clipboard
+LAZY_MODULES = [genai, requests, pyttsx3, pyperclip]
+
+
 # import traceback # No longer needed
 
 # --- Setup Environment and Paths ---
@@ -26,8 +240,30 @@ GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
 MISTRAL_API_KEY = os.getenv('MISTRAL_API_KEY')
 
 # --- LLM Model Names ---
-GEMINI_MODEL = "gemini-2.0-flash" # Or "gemini-1.5-flash", "gemini-2.5-pro-exp-03-25" - MATCH THE ONE IN generate_trivia_questions_gemini
-MISTRAL_MODEL = "mistral-large-latest" # MATCH THE ONE IN generate_trivia_questions_mistral
+# Defaults; override with GEMINI_MODEL / MISTRAL_MODEL (env or config.json)
+GEMINI_MODEL = "gemini-2.0-flash" # Or "gemini-1.5-flash", "gemini-2.5-pro-exp-03-25"
+MISTRAL_MODEL = "mistral-large-latest"
+LOCAL_LLM_MODEL = "standin-trivia"  # Sent to the LOCAL_LLM_URL server (llm_standin_server.py ignores it)
+# Chat-completions endpoint root; override with MISTRAL_BASE_URL (env or config.json) to use
+# a compatible server such as the local stand-in: python llm_standin_server.py
+MISTRAL_BASE_URL = "https://api.mistral.ai/v1"
+GEMINI_API_HOST = "generativelanguage.googleapis.com"
+GTTS_HOST = "translate.google.com"
+# Seconds before the backup provider is also asked for questions while the first is still working.
+# 0 fires every provider at once; "off" (LLM_HEDGE_DELAY env/config) waits for a provider to fail first.
+LLM_HEDGE_DELAY_S = 2.5
+# Large games are generated as several smaller prompts in parallel; long single completions are slow and get truncated
+QUESTION_SHARD_SIZE = 15
+QUESTION_SHARD_WORKERS = 4
+QUESTION_SHARD_RETRIES = 1  # Extra attempts for a shard that came back short, asking only for the missing questions
+# Shared HTTP client for the chat-completions API (keep-alive pool, timeouts, retries on 429/5xx)
+HTTP_CONNECT_TIMEOUT_S = 5.0
+HTTP_READ_TIMEOUT_S = 30.0  # Longest wait for the next bytes; every streamed chunk restarts it
+HTTP_POOL_SIZE = 8  # Kept-alive connections per host, enough for every question shard at once
+HTTP_RETRIES = 2  # Extra attempts after a 429/5xx answer or a failed connection
+HTTP_BACKOFF_BASE_S = 0.5
+HTTP_BACKOFF_MAX_S = 8.0
+HTTP_RETRY_STATUSES = (429, 500, 502, 503, 504)
 
 # --- Determine Base Directory for Assets ---
 try:
@@ -47,6 +283,508 @@ def get_asset_path(relative_path):
          print(f"### WARNING: Asset not found at expected path: {full_path}")
     return full_path
 
+# --- User Data Directory ---
+CONFIG_DIR = os.path.expanduser('~/.trivia_royale')
+TTS_CACHE_DIR = os.path.join(CONFIG_DIR, 'tts_cache')
+TTS_CACHE_MAX_BYTES = 200 * 1024 * 1024  # 200 MB is several thousand spoken clips
+TTS_PREFETCH_LOOKAHEAD = 4  # Questions (and their answers) synthesized ahead of the current one
+TTS_PREFETCH_WORKERS = 2
+IMAGE_CACHE_DIR = os.path.join(CONFIG_DIR, 'image_cache')
+IMAGE_CACHE_MAX_BYTES = 100 * 1024 * 1024  # A full-screen 1920x1080 background is ~6 MB of raw RGB
+ASSET_WARMUP_WORKERS = 4  # Title screen warm-up jobs (image decode, music reads, imports, DNS) run side by side
+ICON_SIZE = (80, 80)
+THINKING_THEMES = [f"audio/TQ_music_{i}.mp3" for i in range(1, 8)]  # play_thinking_theme picks one per question
+FINAL_ROUND_THEME = "audio/FinalQuestionRound.mp3"
+INTRO_THEME = "audio/TriviaRoyaleTheme(2).mp3"
+WINNER_THEME = "audio/TriviaChampion.mp3"
+MUSIC_VOLUME = 0.5
+MUSIC_CACHE_MAX_MB = 96  # Decoded PCM is ~10 MB per stereo minute; the thinking, final and winner tracks take ~80 MB (MUSIC_CACHE_MB env/config)
+MUSIC_CROSSFADE_MS = 400  # Overlap when one cached track replaces another that is still playing
+SPEECH_CHANNEL_ID = 0  # Reserved mixer channel so speech never competes with SFX or pygame.mixer.music
+MUSIC_CHANNEL_IDS = (1, 2)  # Reserved pair so a cached track can fade in while the previous one fades out
+RESERVED_CHANNELS = max(SPEECH_CHANNEL_ID, *MUSIC_CHANNEL_IDS) + 1  # Sound effects play on the channels after these
+QUESTION_BANK_PATH = os.path.join(CONFIG_DIR, 'question_bank.sqlite3')
+QUESTION_STORE_DIR = os.path.join(CONFIG_DIR, 'question_store')  # Indexed packs of the bundled default question files
+GENERATION_METRICS_PATH = os.path.join(CONFIG_DIR, 'generation_metrics.jsonl')  # Summarize with generation_metrics.py
+GENERATION_METRICS_MAX_BYTES = 20 * 1024 * 1024  # The full log is moved to .1 (replacing the previous one) past this
+PROVIDER_STATS_PATH = os.path.join(CONFIG_DIR, 'provider_stats.json')  # Router latency/error estimates between runs
+ROUTER_EWMA_ALPHA = 0.3  # Weight of the newest sample in each provider's latency and error-rate averages
+ROUTER_ERROR_PENALTY = 4.0  # Ranking latency is multiplied by 1 + penalty * error rate
+ROUTER_FAILURE_THRESHOLD = 3  # Consecutive failures that open a provider's circuit
+ROUTER_COOLDOWN_S = 60.0  # First open period; doubles each time a trial request fails
+ROUTER_MAX_COOLDOWN_S = 15 * 60.0
+# Opt-in replay of earlier LLM responses for identical setups (LLM_RESPONSE_CACHE=on, env/config)
+LLM_CACHE_DIR = os.path.join(CONFIG_DIR, 'llm_cache')
+LLM_CACHE_TTL_HOURS = 24 * 7  # A week; cached responses older than this are refetched (LLM_CACHE_TTL_HOURS env/config)
+LLM_CACHE_MAX_BYTES = 20 * 1024 * 1024
+LLM_CACHE_FRESH_FRACTION = 0.25  # Share of each shard still generated fresh on a cache hit (LLM_CACHE_FRESH)
+LLM_CACHE_POOL_FACTOR = 4  # A cached entry keeps at most this many times a shard's size, newest first
+DEFAULT_VENUE = "default"  # Seen-question history is kept per venue (TRIVIA_VENUE env/config)
+# Near-duplicate detection: MinHash over character shingles, bucketed with LSH so only likely matches are compared
+NEAR_DUP_SHINGLE_CHARS = 5
+NEAR_DUP_PERMUTATIONS = 32
+NEAR_DUP_BANDS = 16  # 2 rows per band: pairs around 0.5 shingle overlap almost always share a bucket
+NEAR_DUP_THRESHOLD = 0.5  # Shingle overlap that makes two questions with the same answer a paraphrase
+
+
+# --- TTS Audio Cache ---
+class TTSCache:
+    """Content-addressed on-disk cache of synthesized speech clips with LRU eviction"""
+    def __init__(self, cache_dir=TTS_CACHE_DIR, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0  # Playback lookups only, so hit_rate is what players hear
+        self.misses = 0
+        self.prefetch_hits = 0
+        self.prefetch_misses = 0
+        self._lock = Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, lang='en', engine='gtts'):
+        """Hash of engine + language + text, so a voice change never serves a stale clip"""
+        payload = f"{engine}\0{lang}\0{text}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _path_for(self, key):
+        return os.path.join(self.cache_dir, f"{key}.mp3")
+
+    def get(self, text, lang='en', engine='gtts', prefetch=False):
+        """Return the cached clip path, or None on a miss; prefetch lookups are counted separately"""
+        path = self._path_for(self.make_key(text, lang, engine))
+        with self._lock:
+            if os.path.exists(path):
+                if prefetch:
+                    self.prefetch_hits += 1
+                else:
+                    self.hits += 1
+                try:
+                    os.utime(path, None)  # Refresh recency for LRU eviction
+                except OSError:
+                    pass
+                return path
+            if prefetch:
+                self.prefetch_misses += 1
+            else:
+                self.misses += 1
+            return None
+
+    def contains(self, text, lang='en', engine='gtts'):
+        """Check for a clip without touching the hit/miss counters"""
+        return os.path.exists(self._path_for(self.make_key(text, lang, engine)))
+
+    def put(self, text, audio_path, lang='en', engine='gtts'):
+        """Move a freshly synthesized clip into the cache and return its cached path"""
+        path = self._path_for(self.make_key(text, lang, engine))
+        with self._lock:
+            os.replace(audio_path, path)
+            self._evict()
+        return path
+
+    def new_temp_path(self):
+        """Temp file inside the cache dir so put() is an atomic rename"""
+        fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.cache_dir)
+        os.close(fd)
+        return temp_path
+
+    def _evict(self):
+        """Delete least recently used clips until the cache fits under max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.mp3'):
+                continue
+            full_path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, full_path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, full_path in entries:
+            try:
+                os.remove(full_path)
+                total -= size
+            except OSError:
+                pass
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        """Playback hit/miss counters, plus what the prefetcher found cached or had to synthesize"""
+        lookups = self.hits + self.misses
+        hit_rate = (self.hits / lookups) if lookups else 0.0
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(hit_rate, 3),
+                "prefetch_hits": self.prefetch_hits, "prefetch_synthesized": self.prefetch_misses}
+
+
+# --- Image Asset Cache ---
+class ImageAssetCache:
+    """Decodes and resizes each (path, size) once; optionally persists scaled pixels to disk with LRU eviction"""
+    def __init__(self, cache_dir=IMAGE_CACHE_DIR, max_bytes=IMAGE_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._images = {}  # (path, size) -> resized PIL Image
+        self._photos = {}  # (path, size) -> ImageTk.PhotoImage
+        self._failed = set()  # (path, size) keys that could not be loaded
+        self._lock = Lock()
+
+    def _disk_path(self, path, size, mode):
+        """Raw pixel file named by source path, mtime and target size so edits invalidate it"""
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            mtime = 0
+        digest = hashlib.sha256(f"{os.path.abspath(path)}\0{mtime}".encode('utf-8')).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"{digest}_{size[0]}x{size[1]}.{mode.lower()}")
+
+    def _load_from_disk(self, path, size):
+        for mode in ("RGB", "RGBA"):
+            disk_path = self._disk_path(path, size, mode)
+            if os.path.exists(disk_path):
+                try:
+                    with open(disk_path, 'rb') as f:
+                        img = Image.frombytes(mode, size, f.read())
+                    os.utime(disk_path, None)  # Refresh recency for LRU eviction
+                    return img
+                except Exception as e:
+                    print(f"### WARNING: Discarding unreadable image cache {disk_path}: {e}")
+                    try:
+                        os.remove(disk_path)
+                    except OSError:
+                        pass
+        return None
+
+    def _save_to_disk(self, path, size, img):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            disk_path = self._disk_path(path, size, img.mode)
+            temp_path = disk_path + ".part"
+            with open(temp_path, 'wb') as f:
+                f.write(img.tobytes())
+            os.replace(temp_path, disk_path)
+            self._evict()
+        except Exception as e:
+            print(f"### WARNING: Could not persist scaled image {os.path.basename(path)}: {e}")
+
+    def _evict(self):
+        """Delete least recently used scaled images until the disk cache fits under max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(('.rgb', '.rgba')):
+                continue
+            full_path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, full_path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, full_path in entries:
+            try:
+                os.remove(full_path)
+                total -= size
+            except OSError:
+                pass
+            if total <= self.max_bytes:
+                break
+
+    def get_image(self, path, size, persist=False, source=None):
+        """Return the PIL image at path resized to size, resampling only on the first request"""
+        key = (path, tuple(size))
+        with self._lock:
+            img = self._images.get(key)
+            if img is not None:
+                return img
+            if persist:
+                img = self._load_from_disk(path, key[1])
+            if img is None:
+                src = source if source is not None else Image.open(path)
+                if src.mode not in ("RGB", "RGBA"):
+                    src = src.convert("RGBA" if "transparency" in src.info else "RGB")
+                img = src.resize(key[1], Image.LANCZOS)
+                if persist:
+                    self._save_to_disk(path, key[1], img)
+            self._images[key] = img
+            return img
+
+    def get_photo(self, path, size, persist=False, source=None):
+        """Return a shared PhotoImage for (path, size); must be called on the Tk thread"""
+        key = (path, tuple(size))
+        photo = self._photos.get(key)
+        if photo is None:
+            if key in self._failed:
+                raise FileNotFoundError(f"Image previously failed to load: {path}")
+            try:
+                photo = ImageTk.PhotoImage(self.get_image(path, size, persist, source))
+            except Exception:
+                self._failed.add(key)  # Don't hit the disk again every screen for a missing asset
+                raise
+            self._photos[key] = photo
+        return photo
+
+
+# --- TTS Pre-synthesis ---
+class TTSPrefetcher:
+    """Synthesizes upcoming question/answer clips into the TTS cache on a small worker pool"""
+    def __init__(self, tts_cache, synthesize, lookahead=TTS_PREFETCH_LOOKAHEAD, max_workers=TTS_PREFETCH_WORKERS):
+        self.tts_cache = tts_cache
+        self.synthesize = synthesize
+        self.lookahead = lookahead
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tts-prefetch")
+        self._pending = {}  # (question_index, "question"/"answer") -> Future
+        self._lock = Lock()
+
+    def schedule(self, questions, start_index):
+        """Queue clips for questions[start_index:start_index + lookahead] in play order"""
+        end_index = min(len(questions), start_index + self.lookahead)
+        with self._lock:
+            self._drop_finished()
+            self._cancel_where(lambda index: index < start_index)
+            for index in range(start_index, end_index):
+                q_data = questions[index]
+                for kind in ("question", "answer"):
+                    text = q_data.get(kind) if isinstance(q_data, dict) else None
+                    key = (index, kind)
+                    if not text or key in self._pending or self.tts_cache.contains(text):
+                        continue
+                    self._pending[key] = self._executor.submit(self._run, text)
+
+    def _run(self, text):
+        if self.tts_cache.contains(text):
+            return
+        try:
+            self.synthesize(text)
+        except Exception as e:
+            print(f"### WARNING: TTS prefetch failed: {e}")
+
+    def cancel(self, question_index):
+        """Cancel queued work for a question that will not be shown (e.g. skipped)"""
+        with self._lock:
+            self._cancel_where(lambda index: index == question_index)
+
+    def cancel_all(self):
+        with self._lock:
+            self._cancel_where(lambda index: True)
+
+    def _cancel_where(self, predicate):
+        for key in [k for k in self._pending if predicate(k[0])]:
+            self._pending.pop(key).cancel()  # No-op for work that already started
+
+    def _drop_finished(self):
+        for key in [k for k, fut in self._pending.items() if fut.done()]:
+            del self._pending[key]
+
+    def shutdown(self):
+        self.cancel_all()
+        self._executor.shutdown(wait=False)
+
+
+# --- Speech Playback Service ---
+class SpeechPlayer:
+    """Synthesizes and plays speech on a background thread using a reserved mixer channel"""
+    def __init__(self, root, get_clip, fallback_speak):
+        self.root = root
+        self.get_clip = get_clip
+        self.fallback_speak = fallback_speak
+        self._commands = queue.Queue()
+        self._generation = 0
+        self._lock = Lock()
+        self._busy = Event()
+
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self._channel = pygame.mixer.Channel(SPEECH_CHANNEL_ID)
+
+        self._thread = Thread(target=self._run, name="speech-player", daemon=True)
+        self._thread.start()
+
+    def play(self, text, on_complete=None):
+        """Queue text after anything already playing"""
+        with self._lock:
+            generation = self._generation
+        self._commands.put(("play", generation, text, on_complete))
+
+    def preempt(self, text, on_complete=None):
+        """Cut off current and queued speech, then speak text"""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._commands.put(("stop",))
+        self._commands.put(("play", generation, text, on_complete))
+
+    def stop(self):
+        with self._lock:
+            self._generation += 1
+        self._commands.put(("stop",))
+
+    def shutdown(self):
+        self.stop()
+        self._commands.put(("quit",))
+
+    def is_busy(self):
+        return self._busy.is_set()
+
+    def _is_stale(self, generation):
+        with self._lock:
+            return generation != self._generation
+
+    def _complete(self, generation, on_complete):
+        """Marshal the completion callback onto the Tk thread unless it was preempted"""
+        if on_complete and not self._is_stale(generation):
+            try:
+                self.root.after(0, on_complete)
+            except (RuntimeError, tk.TclError):
+                pass  # Root already destroyed
+
+    def _run(self):
+        backlog = deque()
+        current = None  # (generation, on_complete, trace token) of the clip on the channel
+        while True:
+            try:
+                command = self._commands.get(timeout=0.05)
+            except queue.Empty:
+                command = None
+
+            if command is not None:
+                action = command[0]
+                if action == "quit":
+                    self._channel.stop()
+                    if current:
+                        TRACER.end(current[2], interrupted=True)
+                    return
+                if action == "stop":
+                    self._channel.stop()
+                    backlog.clear()
+                    if current:
+                        TRACER.end(current[2], interrupted=True)
+                    current = None
+                elif action == "play":
+                    backlog.append(command[1:])
+
+            if current and not self._channel.get_busy():
+                TRACER.end(current[2])
+                self._complete(current[0], current[1])
+                current = None
+
+            if current is None:
+                self._busy.clear()
+                while backlog and current is None:
+                    generation, text, on_complete = backlog.popleft()
+                    if not self._is_stale(generation):
+                        current = self._start(generation, text, on_complete)
+
+    def _start(self, generation, text, on_complete):
+        """Begin playing text; returns the playing entry, or None if it finished synchronously"""
+        self._busy.set()
+        try:
+            clip_path, is_temp = self.get_clip(text)
+            try:
+                sound = pygame.mixer.Sound(clip_path)
+            finally:
+                if is_temp:
+                    try:
+                        os.remove(clip_path)
+                    except OSError:
+                        pass
+            if self._is_stale(generation):
+                return None  # Preempted while synthesizing
+            self._channel.play(sound)
+            return (generation, on_complete, TRACER.begin("tts.playback", "tts", chars=len(text)))
+        except ImportError:
+            print("### WARNING: gTTS not available, falling back to pyttsx3")
+        except Exception as e:
+            print(f"### ERROR: gTTS failed ({e}), falling back to pyttsx3")
+
+        if not self._is_stale(generation):
+            self.fallback_speak(text)
+        self._complete(generation, on_complete)
+        return None
+
+
+# --- Title Screen Warm-up ---
+def read_mp3_file(path, chunk_size=1024 * 1024):
+    """Reads path through once (so the OS has it cached); True if it starts like an MP3 (ID3 tag or frame sync)"""
+    with open(path, 'rb') as f:
+        head = f.read(4)
+        while f.read(chunk_size):
+            pass
+    return head[:3] == b"ID3" or (len(head) >= 2 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0)
+
+
+def resolve_hosts(hosts):
+    """Looks up each host once so the first real request finds it in the resolver cache; returns how many resolved"""
+    resolved = 0
+    for host in hosts:
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+            resolved += 1
+        except OSError as e:
+            print(f"### WARNING: Could not resolve {host}: {e}")
+    return resolved
+
+
+class AssetWarmer:
+    """Runs independent warm-up jobs on a small thread pool while the title screen plays
+
+    Each job's outcome is kept in results (and traced as warmup.<name>), so a
+    slow or broken asset shows up in the log instead of as a stall on the
+    first screen that needs it.
+    """
+    def __init__(self, max_workers=ASSET_WARMUP_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="asset-warmup")
+        self._lock = Lock()
+        self._pending = 0
+        self._start = None
+        self.results = {}  # Job name -> {"ok", "seconds", "detail"}
+        self.seconds = None
+        self.done = Event()
+
+    def run(self, jobs):
+        """Starts every (name, callable) job at once and returns immediately"""
+        self._start = time.perf_counter()
+        with self._lock:
+            self._pending = len(jobs)
+        if not jobs:
+            self.done.set()
+        for name, job in jobs:
+            self._pool.submit(self._run_job, name, job)
+
+    def _run_job(self, name, job):
+        start = time.perf_counter()
+        ok, detail = True, None
+        try:
+            detail = job()
+        except Exception as e:
+            ok, detail = False, str(e)
+            print(f"### WARNING: Warm-up of {name} failed: {e}")
+        TRACER.record(f"warmup.{name}", "warmup", start, ok=ok, detail=detail)
+        with self._lock:
+            self.results[name] = {"ok": ok, "seconds": round(time.perf_counter() - start, 4), "detail": detail}
+            self._pending -= 1
+            finished = self._pending == 0
+        if finished:
+            self.seconds = round(time.perf_counter() - self._start, 4)
+            failed = [name for name, result in self.results.items() if not result["ok"]]
+            print(f"✓ Title screen warm-up finished in {self.seconds:.2f}s"
+                  + (f" ({', '.join(failed)} failed)" if failed else ""))
+            self.done.set()
+
+    def stats(self):
+        with self._lock:
+            return {"seconds": self.seconds, "jobs": dict(self.results)}
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
 
 # --- Sound Effect Manager ---
 class SoundEffectManager:
@@ -102,30 +840,145 @@ class SoundEffectManager:
         return self.enabled
 
 
+# --- Music Manager ---
+class MusicManager:
+    """Keeps game music decoded in memory and plays it on two reserved mixer channels
+
+    A cached track starts without touching the disk, and replacing a track
+    that is still playing fades it out while the new one fades in. A track
+    that was not preloaded (or did not fit in max_bytes) streams from disk
+    through pygame.mixer.music as before, since decoding a long MP3 on the Tk
+    thread would freeze the screen. The least recently played tracks are
+    evicted to stay under max_bytes; the playing track never is.
+    """
+    def __init__(self, max_bytes=MUSIC_CACHE_MAX_MB * 1024 * 1024, crossfade_ms=MUSIC_CROSSFADE_MS,
+                 volume=MUSIC_VOLUME):
+        self.max_bytes = max_bytes
+        self.crossfade_ms = crossfade_ms
+        self.volume = volume
+        self._tracks = {}  # filename -> (pygame Sound, bytes), least recently played first
+        self._too_large = set()
+        self._lock = Lock()
+        self.bytes = 0
+        self.current = None  # Filename of the playing track
+        self._streaming = False  # True when current is playing through pygame.mixer.music
+        self._counts = {"hits": 0, "misses": 0, "decoded": 0, "evicted": 0, "failed": 0}
+
+        frequency, size, channels = pygame.mixer.get_init()
+        self._bytes_per_second = frequency * (abs(size) // 8) * channels
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        self._channels = [pygame.mixer.Channel(channel_id) for channel_id in MUSIC_CHANNEL_IDS]
+        self._active = 0  # Index into _channels of the one playing current
+
+    def is_cached(self, filename):
+        with self._lock:
+            return filename in self._tracks
+
+    def load(self, filename):
+        """Decodes filename into the cache (safe off the Tk thread); returns True if it is cached"""
+        with self._lock:
+            if filename in self._tracks:
+                return True
+            if filename in self._too_large:
+                return False
+        start = time.perf_counter()
+        try:
+            sound = pygame.mixer.Sound(get_asset_path(filename))
+        except (pygame.error, OSError) as e:
+            with self._lock:
+                self._counts["failed"] += 1
+            print(f"### WARNING: Could not decode music {filename}, it will stream from disk: {e}")
+            return False
+        size = int(sound.get_length() * self._bytes_per_second)
+        TRACER.record("music.decode", "audio", start, track=filename, bytes=size)
+        with self._lock:
+            if size > self.max_bytes:
+                self._too_large.add(filename)
+                return False
+            while self._tracks and self.bytes + size > self.max_bytes:
+                victim = next((name for name in self._tracks if name != self.current), None)
+                if victim is None:
+                    return False
+                self.bytes -= self._tracks.pop(victim)[1]
+                self._counts["evicted"] += 1
+            self._tracks[filename] = (sound, size)
+            self.bytes += size
+            self._counts["decoded"] += 1
+        return True
+
+    def preload(self, filenames):
+        """Decodes each file in order until the cache is full; returns how many are cached"""
+        return sum(1 for filename in filenames if self.load(filename))
+
+    def play(self, filename, loops=-1):
+        """Starts filename, fading out whatever is still playing as it fades in; call on the Tk thread"""
+        with self._lock:
+            entry = self._tracks.get(filename)
+            if entry:
+                self._tracks[filename] = self._tracks.pop(filename)  # Most recently played goes last
+            self._counts["hits" if entry else "misses"] += 1
+
+        playing = self.current is not None and (pygame.mixer.music.get_busy() if self._streaming
+                                                else self._channels[self._active].get_busy())
+        fade_ms = self.crossfade_ms if playing else 0
+        self.stop(fade_ms)
+        self.current = filename
+        if entry:
+            self._active = 1 - self._active
+            channel = self._channels[self._active]
+            channel.set_volume(self.volume)
+            channel.play(entry[0], loops=loops, fade_ms=fade_ms)
+            self._streaming = False
+            return
+        pygame.mixer.music.load(get_asset_path(filename))
+        pygame.mixer.music.set_volume(self.volume)
+        pygame.mixer.music.play(loops=loops, fade_ms=fade_ms)
+        self._streaming = True
+
+    def stop(self, fade_ms=0):
+        """Stops the music, fading cached tracks out over fade_ms (streamed music always stops at once)"""
+        for channel in self._channels:
+            if fade_ms:
+                channel.fadeout(fade_ms)
+            else:
+                channel.stop()
+        if self._streaming:
+            pygame.mixer.music.stop()
+            pygame.mixer.music.unload()
+            self._streaming = False
+        self.current = None
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, tracks=len(self._tracks), mb=round(self.bytes / (1024 * 1024), 1),
+                        max_mb=round(self.max_bytes / (1024 * 1024), 1))
+
+
 # --- Visual Feedback Animator ---
 class FeedbackAnimator:
     """Handles visual feedback animations"""
-    def __init__(self, root):
+    IMAGE_SIZE = (100, 100)
+    IMAGE_FILES = {"checkmark_image": 'images/ui/checkmark.png', "x_mark_image": 'images/ui/x_mark.png'}
+
+    def __init__(self, root, image_cache=None):
         self.root = root
+        self.image_cache = image_cache or ImageAssetCache()
         self.current_feedback = None
         self.checkmark_image = None
         self.x_mark_image = None
-        self._load_images()
-    
-    def _load_images(self):
-        """Load checkmark and X mark images"""
+        self.images_loaded = False  # Loaded by the title screen warm-up, or on first feedback
+
+    def image_paths(self):
+        return [get_asset_path(relative_path) for relative_path in self.IMAGE_FILES.values()]
+
+    def load_images(self):
+        """Load checkmark and X mark images; must be called on the Tk thread"""
+        self.images_loaded = True
         try:
-            check_path = get_asset_path('images/ui/checkmark.png')
-            if os.path.exists(check_path):
-                img = Image.open(check_path)
-                img = img.resize((100, 100), Image.LANCZOS)
-                self.checkmark_image = ImageTk.PhotoImage(img)
-            
-            x_path = get_asset_path('images/ui/x_mark.png')
-            if os.path.exists(x_path):
-                img = Image.open(x_path)
-                img = img.resize((100, 100), Image.LANCZOS)
-                self.x_mark_image = ImageTk.PhotoImage(img)
+            for attr, relative_path in self.IMAGE_FILES.items():
+                path = get_asset_path(relative_path)
+                if os.path.exists(path):
+                    setattr(self, attr, self.image_cache.get_photo(path, self.IMAGE_SIZE))
         except Exception as e:
             print(f"### ERROR: Failed to load feedback images: {e}")
     
@@ -133,6 +986,8 @@ class FeedbackAnimator:
         """Show checkmark or X mark with fade-in animation"""
         if parent_widget is None:
             parent_widget = self.root
+        if not self.images_loaded:
+            self.load_images()
         
         # Clear any existing feedback
         if self.current_feedback and self.current_feedback.winfo_exists():
@@ -195,9 +1050,1498 @@ CATEGORIES = [
     "Linguistics", "National Parks", "Hiking", "Pets", "Other", "Other", "Other"
 ]
 
+# --- Pooled HTTP Client ---
+class PooledHTTPClient:
+    """One keep-alive requests.Session for every LLM call, with timeouts and jittered retries
+
+    A 429/5xx answer or a failed connection is retried up to `retries` times.
+    Before retry n the client sleeps a random time up to
+    min(backoff_max, backoff_base * 2**n), or at least the server's Retry-After
+    (still capped at backoff_max). Streamed bodies are never retried
+    mid-stream. A stall longer than read_timeout raises and lets the question
+    race fail over.
+    """
+    def __init__(self, pool_size=HTTP_POOL_SIZE, connect_timeout=HTTP_CONNECT_TIMEOUT_S,
+                 read_timeout=HTTP_READ_TIMEOUT_S, retries=HTTP_RETRIES,
+                 backoff_base=HTTP_BACKOFF_BASE_S, backoff_max=HTTP_BACKOFF_MAX_S, rng=None):
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._rng = rng or random.Random()
+        self._session = None  # Created on first use so requests stays out of the cold start
+        self._adapter = None
+        self._lock = Lock()
+        self._counts = {"requests": 0, "retries": 0, "timeouts": 0, "connection_errors": 0, "statuses": {}}
+        self._local = local()  # Retries made by this thread's last post()
+
+    @property
+    def session(self):
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    # Retries are done here (with jitter and Retry-After), not by urllib3
+                    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size,
+                                                            max_retries=0)
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._adapter = adapter
+                    self._session = session
+        return self._session
+
+    def _count(self, key, status=None):
+        with self._lock:
+            if status is None:
+                self._counts[key] += 1
+            else:
+                self._counts["statuses"][str(status)] = self._counts["statuses"].get(str(status), 0) + 1
+
+    @staticmethod
+    def _retry_after(response):
+        try:
+            return max(0.0, float(response.headers.get("Retry-After", "")))
+        except ValueError:
+            return None  # Missing, or an HTTP date (not worth parsing for a capped wait)
+
+    def backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt + 1"""
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return min(delay, self.backoff_max)
+
+    def post(self, url, **kwargs):
+        """session.post with the client's timeouts and retries; returns the last response, error statuses included"""
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlparse(url).netloc
+        self._local.retries = 0
+        for attempt in range(self.retries + 1):
+            self._count("requests")
+            try:
+                response = self.session.post(url, **kwargs)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                self._count("timeouts" if isinstance(e, requests.exceptions.Timeout) else "connection_errors")
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff(attempt)
+                print(f"### WARNING: Request to {host} failed ({type(e).__name__}), retrying in {delay:.2f}s.")
+            else:
+                self._count(None, response.status_code)
+                if response.status_code not in HTTP_RETRY_STATUSES or attempt == self.retries:
+                    return response
+                delay = self.backoff(attempt, self._retry_after(response))
+                response.close()
+                print(f"### WARNING: {host} answered {response.status_code}, retrying in {delay:.2f}s.")
+            self._count("retries")
+            self._local.retries += 1
+            with TRACER.span("http.backoff", "llm", host=host, attempt=attempt + 1):
+                time.sleep(delay)
+
+    def last_retries(self):
+        """Retries made by the calling thread's most recent post()"""
+        return getattr(self._local, "retries", 0)
+
+    def stats(self):
+        """Request/retry counts plus connections opened and reused by the pool"""
+        with self._lock:
+            stats = dict(self._counts, statuses=dict(self._counts["statuses"]))
+        opened = served = 0
+        if self._adapter is not None:
+            pools = self._adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    opened += pool.num_connections
+                    served += pool.num_requests
+        stats.update(connections_opened=opened, connections_reused=max(0, served - opened))
+        return stats
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+# --- LLM Providers ---
+PROVIDER_REGISTRY = {}  # Provider name -> LLMProvider subclass, in preference order for providers without history
+
+
+def register_provider(cls):
+    """Class decorator that makes an LLMProvider subclass available to every game under its name"""
+    PROVIDER_REGISTRY[cls.name] = cls
+    return cls
+
+
+class LLMProvider:
+    """A question-generating backend: one long-lived client, built on first use and shared by every thread
+
+    generate(prompt) returns the whole response text or None on failure;
+    stream(prompt) yields text chunks as they arrive and raises on failure.
+    from_settings() builds the provider from the game's settings dict, and
+    host names the server the title screen warm-up resolves ahead of time.
+    last_call() then reports what the calling thread's request cost
+    (retries, token usage when the API reports it).
+    """
+    name = None
+    host = None
+
+    def __init__(self, api_key, model):
+        self.api_key = api_key
+        self.model = model
+        self._client = None
+        self._lock = Lock()
+        self._calls = local()
+
+    def _note_call(self, **info):
+        self._calls.info = info
+
+    def last_call(self):
+        info = getattr(self._calls, "info", {})
+        self._calls.info = {}
+        return info
+
+    @property
+    def available(self):
+        return bool(self.api_key)
+
+    def client(self):
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    with TRACER.span("llm.client_setup", "llm", provider=self.name):
+                        self._client = self._build_client()
+        return self._client
+
+    @classmethod
+    def from_settings(cls, settings, http):
+        raise NotImplementedError
+
+    def _build_client(self):
+        raise NotImplementedError
+
+    def generate(self, prompt):
+        raise NotImplementedError
+
+    def stream(self, prompt):
+        raise NotImplementedError
+
+
+@register_provider
+class GeminiProvider(LLMProvider):
+    name = "Gemini"
+    host = GEMINI_API_HOST
+
+    @classmethod
+    def from_settings(cls, settings, http):
+        return cls(settings.get("GEMINI_API_KEY"), settings.get("GEMINI_MODEL") or GEMINI_MODEL)
+
+    def _build_client(self):
+        genai.configure(api_key=self.api_key)
+        return genai.GenerativeModel(self.model)
+
+    def generate(self, prompt):
+        if not self.available:
+            print("### ERROR: Gemini API Key not found.")
+            return None
+        try:
+            model = self.client()
+            with TRACER.span("llm.request", "llm", provider=self.name, prompt_chars=len(prompt)):
+                response = model.generate_content(prompt)
+            self._note_call(usage=self._usage(response))
+            return response.text
+        except Exception as e:
+            print(f"### ERROR: Gemini API Exception: {e}")
+            return None
+
+    def stream(self, prompt):
+        """Yields Gemini response text chunks as they arrive."""
+        if not self.available:
+            raise RuntimeError("Gemini API Key not found.")
+        usage = None
+        try:
+            for chunk in self.client().generate_content(prompt, stream=True):
+                usage = self._usage(chunk) or usage
+                if chunk.text:
+                    yield chunk.text
+        finally:
+            self._note_call(usage=usage)
+
+    @staticmethod
+    def _usage(response):
+        metadata = getattr(response, "usage_metadata", None)
+        if not metadata:
+            return None
+        return {"prompt_tokens": getattr(metadata, "prompt_token_count", None),
+                "completion_tokens": getattr(metadata, "candidates_token_count", None)}
+
+
+@register_provider
+class MistralProvider(LLMProvider):
+    """Mistral (or any compatible chat-completions server at base_url) over the shared pooled HTTP client"""
+    name = "Mistral"
+
+    @classmethod
+    def from_settings(cls, settings, http):
+        return cls(settings.get("MISTRAL_API_KEY"), settings.get("MISTRAL_MODEL") or MISTRAL_MODEL,
+                   settings.get("MISTRAL_BASE_URL") or MISTRAL_BASE_URL, http)
+
+    def __init__(self, api_key, model, base_url=MISTRAL_BASE_URL, http=None):
+        super().__init__(api_key, model)
+        self.url = f"{base_url.rstrip('/')}/chat/completions"
+        self.http = http or PooledHTTPClient()
+        self._headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+
+    @property
+    def host(self):
+        return urlparse(self.url).hostname
+
+    def _build_client(self):
+        self.http.session  # Imports requests and builds the connection pool
+        return self.http
+
+    def generate(self, prompt):
+        if not self.available:
+            print(f"### ERROR: {self.name} API Key not found.")
+            return None
+        try:
+            data = {"model": self.model, "messages": [{"role": "user", "content": prompt}]}
+            with TRACER.span("llm.request", "llm", provider=self.name, prompt_chars=len(prompt)) as span_args:
+                response = self.client().post(self.url, headers=self._headers, json=data)
+                span_args["status_code"] = response.status_code
+            self._note_call(retries=self.http.last_retries())
+            if response.status_code == 200:
+                body = response.json()
+                self._note_call(retries=self.http.last_retries(), usage=body.get("usage"))
+                return body['choices'][0]['message']['content']
+            else:
+                print(f"### ERROR: {self.name} API Error: {response.status_code}")
+                return None
+        except Exception as e:
+            print(f"### ERROR: {self.name} API Exception: {e}")
+            return None
+
+    def stream(self, prompt):
+        """Yields Mistral response text chunks from the server-sent event stream."""
+        if not self.available:
+            raise RuntimeError(f"{self.name} API Key not found.")
+        headers = dict(self._headers, Accept="text/event-stream")
+        data = {"model": self.model, "messages": [{"role": "user", "content": prompt}], "stream": True}
+        usage = None
+        try:
+            with self.client().post(self.url, headers=headers, json=data, stream=True) as response:
+                if response.status_code != 200:
+                    raise RuntimeError(f"{self.name} API Error: {response.status_code}")
+                for line in response.iter_lines(decode_unicode=True):
+                    if not line or not line.startswith("data:"):
+                        continue
+                    payload = line[len("data:"):].strip()
+                    if payload == "[DONE]":
+                        break
+                    event = json.loads(payload)
+                    usage = event.get("usage") or usage  # Sent with the final chunk
+                    delta = (event.get("choices") or [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        finally:
+            self._note_call(retries=self.http.last_retries(), usage=usage)
+
+
+@register_provider
+class LocalStandInProvider(MistralProvider):
+    """A chat-completions server on this machine, e.g. llm_standin_server.py; enabled by LOCAL_LLM_URL"""
+    name = "Local"
+
+    @classmethod
+    def from_settings(cls, settings, http):
+        url = settings.get("LOCAL_LLM_URL")
+        return cls("local" if url else None, settings.get("LOCAL_LLM_MODEL") or LOCAL_LLM_MODEL, url or "", http)
+
+
+# --- Provider Routing ---
+class ProviderRouter:
+    """Orders providers by a rolling latency/error estimate and keeps failing ones out with a circuit breaker
+
+    Latency is time to the first valid question. A provider cancelled before
+    producing any question can only raise its estimate: it was at least that
+    slow. ROUTER_FAILURE_THRESHOLD failures in a row open the provider's
+    circuit for a cooldown. After that one trial request is allowed, ranked
+    last: ranked() hands the provider to one caller until that request is
+    recorded or released. Success closes the circuit and failure reopens it
+    with a doubled cooldown. Estimates and circuit state persist in
+    PROVIDER_STATS_PATH.
+    """
+    def __init__(self, providers, path=PROVIDER_STATS_PATH, alpha=ROUTER_EWMA_ALPHA):
+        self.providers = list(providers)
+        self.path = path
+        self.alpha = alpha
+        self._lock = Lock()
+        self._state = {}
+        self._trials = set()  # Half-open providers whose one trial request has been handed out
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                saved = json.load(f).get("providers", {})
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"### WARNING: Ignoring unreadable provider stats {self.path}: {e}")
+            return
+        for name, state in saved.items():
+            if isinstance(state, dict):
+                self._state[name] = state
+
+    def save(self):
+        with self._lock:
+            payload = {"version": 1, "providers": {name: dict(state) for name, state in self._state.items()}}
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(payload, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"### WARNING: Could not save provider stats: {e}")
+
+    def _entry(self, name):
+        return self._state.setdefault(name, {"latency_ewma": None, "error_ewma": 0.0, "samples": 0,
+                                             "consecutive_failures": 0, "open_until": 0.0, "cooldown_s": 0.0})
+
+    def score(self, name):
+        """Expected seconds to a first question, inflated by the error rate; None without history"""
+        state = self._state.get(name)
+        if not state or state.get("latency_ewma") is None:
+            return None
+        return state["latency_ewma"] * (1 + ROUTER_ERROR_PENALTY * state.get("error_ewma", 0.0))
+
+    def ranked(self, claim=True):
+        """Available providers with a closed circuit, fastest first, then any due a trial request
+
+        A trial provider is only returned to one caller (claim=False just looks); pass the ones that did not get
+        a request to release().
+        """
+        now = time.time()
+        ready, trials = [], []
+        with self._lock:
+            for index, provider in enumerate(self.providers):
+                if not provider.available:
+                    continue
+                state = self._state.get(provider.name, {})
+                if state.get("open_until", 0.0) > now:
+                    continue
+                score = self.score(provider.name)
+                key = (0, score, index) if score is not None else (1, 0.0, index)
+                if not state.get("cooldown_s"):
+                    ready.append((key, provider))
+                elif provider.name not in self._trials:
+                    trials.append((key, provider))
+                    if claim:
+                        self._trials.add(provider.name)
+        return [provider for _, provider in sorted(ready, key=lambda item: item[0])] + \
+               [provider for _, provider in sorted(trials, key=lambda item: item[0])]
+
+    def release(self, names):
+        """Hands back trial requests that were claimed through ranked() but never sent"""
+        with self._lock:
+            self._trials.difference_update(names)
+
+    def record(self, name, ok, latency=None, censored=False):
+        """One request outcome; censored latencies (cancelled while still waiting) only raise the estimate"""
+        with self._lock:
+            self._trials.discard(name)
+            state = self._entry(name)
+            if censored:
+                if latency is not None and state["latency_ewma"] is not None and latency > state["latency_ewma"]:
+                    state["latency_ewma"] = self.alpha * latency + (1 - self.alpha) * state["latency_ewma"]
+                elif latency is not None and state["latency_ewma"] is None:
+                    state["latency_ewma"] = latency
+                return
+            state["samples"] += 1
+            state["error_ewma"] = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * state["error_ewma"]
+            if ok:
+                if latency is not None:
+                    previous = state["latency_ewma"]
+                    state["latency_ewma"] = latency if previous is None else \
+                        self.alpha * latency + (1 - self.alpha) * previous
+                if state["cooldown_s"]:
+                    print(f"### INFO: {name} is healthy again, closing its circuit.")
+                state.update(consecutive_failures=0, open_until=0.0, cooldown_s=0.0)
+                return
+            state["consecutive_failures"] += 1
+            if state["cooldown_s"] or state["consecutive_failures"] >= ROUTER_FAILURE_THRESHOLD:
+                cooldown = min(ROUTER_MAX_COOLDOWN_S, state["cooldown_s"] * 2 or ROUTER_COOLDOWN_S)
+                state.update(cooldown_s=cooldown, open_until=time.time() + cooldown)
+                print(f"### WARNING: {name} failed {state['consecutive_failures']} times in a row, "
+                      f"skipping it for {cooldown:.0f}s.")
+
+    def record_race(self, race_stats):
+        """Feeds every started provider's outcome from a HedgedQuestionRace.stats dict"""
+        for name, stats in race_stats["providers"].items():
+            if "started_s" not in stats:
+                self.release([name])
+                continue
+            if "first_question_s" in stats:
+                self.record(name, True, stats["first_question_s"] - stats["started_s"])
+            elif stats["status"] == "failed" or stats.get("error"):
+                self.record(name, False)
+            elif "ended_s" in stats:
+                self.record(name, True, stats["ended_s"] - stats["started_s"], censored=True)
+
+    def describe(self):
+        """One line per provider for the log: estimate, error rate and circuit state"""
+        now = time.time()
+        parts = []
+        for provider in self.providers:
+            if not provider.available:
+                continue
+            state = self._state.get(provider.name, {})
+            latency = state.get("latency_ewma")
+            text = f"{provider.name} " + (f"{latency:.2f}s" if latency is not None else "untested")
+            text += f", {state.get('error_ewma', 0.0):.0%} errors"
+            if state.get("open_until", 0.0) > now:
+                text += f", circuit open {state['open_until'] - now:.0f}s"
+            parts.append(text)
+        return "; ".join(parts)
+
+    def stats(self):
+        with self._lock:
+            return {name: dict(state) for name, state in self._state.items()}
+
+
+# --- Streaming Question Parser ---
+class IncrementalQuestionParser:
+    """Yields each complete {question, answer} object as LLM text streams in.
+
+    Only brace/string structure is tracked, so code fences, prose and a
+    wrapper like {"questions": [...]} around the objects are tolerated, and
+    a truncated response still gives up every object completed before the cut.
+    This is the one parser for LLM output; whole responses go through
+    extract_questions().
+    """
+    _TRAILING_COMMA = re.compile(r",\s*([}\]])")
+
+    def __init__(self):
+        self._text = ""
+        self._pos = 0  # Next character of _text to scan
+        self._starts = []  # Offsets of currently open '{'
+        self._in_string = False
+        self._escape = False
+        self.emitted = 0
+        self.rejected = 0
+
+    @classmethod
+    def _load_object(cls, raw):
+        try:
+            return json.loads(raw)
+        except ValueError:
+            pass
+        try:
+            return json.loads(cls._TRAILING_COMMA.sub(r"\1", raw))  # {"question": "...", "answer": "...",}
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _as_question(obj):
+        """{question, answer} from a parsed object (keys matched case-insensitively), or None"""
+        if not isinstance(obj, dict):
+            return None
+        fields = {str(key).strip().lower(): value for key, value in obj.items()}
+        question, answer = fields.get('question'), fields.get('answer')
+        if not isinstance(question, str) or not question.strip():
+            return None
+        if answer is None or isinstance(answer, (dict, list)) or not str(answer).strip():
+            return None
+        return {"question": question, "answer": answer}
+
+    def feed(self, chunk):
+        """Add streamed text; returns the question dicts completed by it"""
+        self._text += chunk
+        text = self._text
+        found = []
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == '\\':
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = bool(self._starts)  # Quotes in prose outside objects are ignored
+            elif c == '{':
+                self._starts.append(i)
+            elif c == '}' and self._starts:
+                start = self._starts.pop()
+                obj = self._load_object(text[start:i + 1])
+                q_data = self._as_question(obj)
+                if q_data:
+                    found.append(q_data)
+                elif not (isinstance(obj, dict) and any(isinstance(v, (list, dict)) for v in obj.values())):
+                    self.rejected += 1  # Wrapper objects holding the questions are not rejections
+
+        # Drop text that can no longer be part of an open object
+        keep_from = self._starts[0] if self._starts else len(text)
+        self._text = text[keep_from:]
+        self._starts = [start - keep_from for start in self._starts]
+        self._pos = len(self._text)
+        self.emitted += len(found)
+        return found
+
+    @property
+    def has_partial(self):
+        """True if the stream ended inside an unfinished object (i.e. it was truncated)"""
+        return bool(self._starts)
+
+    def report(self):
+        return {"recovered": self.emitted, "rejected": self.rejected, "truncated": self.has_partial}
+
+
+def extract_questions(text):
+    """Every complete {question, answer} object in a whole LLM response; returns (questions, report)"""
+    parser = IncrementalQuestionParser()
+    questions = parser.feed(text or "")
+    return questions, parser.report()
+
+
+# --- LLM Response Cache ---
+class LLMResponseCache:
+    """Validated questions from earlier LLM responses, keyed by model and normalized prompt
+
+    The question count is normalized out of the prompt, so every request for the
+    same topics and difficulties shares one entry. Fresh questions are merged into
+    it (newest first, up to a bound). Entries expire ttl_hours after they were
+    first written, and least recently used entries are evicted to stay under max_bytes.
+    """
+    def __init__(self, cache_dir=LLM_CACHE_DIR, ttl_hours=LLM_CACHE_TTL_HOURS, max_bytes=LLM_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_hours * 3600
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def normalize_prompt(prompt):
+        text = " ".join(prompt.lower().split())
+        return re.sub(r"\bgenerate \d+\b", "generate N", text)
+
+    def _path_for(self, model, prompt):
+        key = hashlib.sha256(f"{model}\0{self.normalize_prompt(prompt)}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read_live(self, path):
+        """The entry at path, or None if it is missing, unreadable or past its TTL (expired entries are removed)"""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - entry.get("created_at", 0) > self.ttl_seconds:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        return entry
+
+    def get(self, models, prompt):
+        """(model, questions) for the first of models with a live entry, or (None, [])"""
+        with self._lock:
+            for model in models:
+                path = self._path_for(model, prompt)
+                entry = self._read_live(path)
+                if entry is None or not entry.get("questions"):
+                    continue
+                self.hits += 1
+                try:
+                    os.utime(path, None)  # Refresh recency for LRU eviction
+                except OSError:
+                    pass
+                return model, entry["questions"]
+            self.misses += 1
+        return None, []
+
+    def put(self, model, prompt, questions, max_questions):
+        """Merges questions into model's entry for prompt, keeping the newest max_questions distinct ones"""
+        path = self._path_for(model, prompt)
+        now = time.time()
+        with self._lock:
+            entry = self._read_live(path) or {"model": model, "prompt": self.normalize_prompt(prompt),
+                                              "created_at": now, "questions": []}
+            merged, keys = [], set()
+            for q_data in list(questions) + entry["questions"]:
+                key = normalize_question_text(q_data["question"])
+                if key not in keys:
+                    keys.add(key)
+                    merged.append({"question": q_data["question"], "answer": q_data["answer"]})
+            entry["questions"] = merged[:max_questions]
+            entry["updated_at"] = now
+
+            fd, temp_path = tempfile.mkstemp(suffix='.part', dir=self.cache_dir)
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, ensure_ascii=False)
+                os.replace(temp_path, path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                raise
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until the cache fits under max_bytes"""
+        entries = []
+        total = 0
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith('.json'):
+                continue
+            full_path = os.path.join(self.cache_dir, name)
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, full_path))
+            total += st.st_size
+
+        if total <= self.max_bytes:
+            return
+        entries.sort()
+        for _, size, full_path in entries:
+            try:
+                os.remove(full_path)
+                total -= size
+            except OSError:
+                pass
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+# --- Generation Metrics ---
+class GenerationMetrics:
+    """Append-only JSON-lines log with one record per LLM generation call; summarize with generation_metrics.py"""
+    def __init__(self, path=GENERATION_METRICS_PATH, max_bytes=GENERATION_METRICS_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.written = 0
+        self._lock = Lock()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def append(self, record):
+        line = json.dumps(dict(ts=round(time.time(), 3), **record), ensure_ascii=False) + "\n"
+        with self._lock:
+            try:
+                try:
+                    if self.max_bytes and os.path.getsize(self.path) + len(line) > self.max_bytes:
+                        os.replace(self.path, self.path + ".1")
+                except FileNotFoundError:
+                    pass
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(line)
+                self.written += 1
+            except OSError as e:
+                print(f"### WARNING: Could not append generation metrics: {e}")
+
+
+# --- Hedged Question Generation ---
+class HedgedQuestionRace:
+    """Streams questions from several providers at once and keeps the first valid response
+
+    Provider i starts after i * hedge_delay seconds (hedge_delay=None means only
+    once every earlier provider has failed), and any failure starts the next
+    provider immediately. The first provider to deliver min_ready questions, or
+    to finish its stream with at least one, wins: its questions go to
+    on_question and the others are cancelled at their next chunk.
+    """
+    def __init__(self, providers, min_ready, on_question, hedge_delay=LLM_HEDGE_DELAY_S, on_start=None,
+                 on_finish=None):
+        self.providers = providers  # [(name, stream_fn)] in preference order
+        self.min_ready = max(1, min_ready)
+        self.on_question = on_question
+        self.hedge_delay = hedge_delay
+        self.on_start = on_start
+        self.on_finish = on_finish  # on_finish(name, stats) from each started provider's own thread
+        self.winner = None
+        self.stats = {
+            "mode": "sequential" if hedge_delay is None else ("parallel" if hedge_delay <= 0 else f"hedged {hedge_delay:g}s"),
+            "winner": None,
+            "win_seconds": None,
+            "providers": {name: {"status": "not started"} for name, _ in providers},
+        }
+        self._lock = Lock()
+        self._failover = [Event() for _ in providers]
+        self._done = Event()
+        self._finished = 0
+        self._t0 = None
+
+    def run(self, prompt):
+        """Blocks until the winner's stream ends or every provider has failed; returns the winner's name or None"""
+        if not self.providers:
+            return None
+        self._t0 = time.perf_counter()
+        for index, (name, stream_fn) in enumerate(self.providers):
+            Thread(target=self._run_provider, args=(index, name, stream_fn, prompt),
+                   name=f"llm-{name.lower()}", daemon=True).start()
+        self._done.wait()
+        return self.winner
+
+    def _elapsed(self):
+        return round(time.perf_counter() - self._t0, 3)
+
+    def _run_provider(self, index, name, stream_fn, prompt):
+        if index:
+            delay = None if self.hedge_delay is None else index * max(0.0, self.hedge_delay)
+            self._failover[index].wait(delay)
+        stats = self.stats["providers"][name]
+        if self._done.is_set() or self.winner is not None:
+            self._provider_finished()
+            return
+        stats.update(status="running", started_s=self._elapsed())
+        stream_start = time.perf_counter()
+        if self.on_start:
+            self.on_start(name)
+        print(f"### INFO: Requesting questions from {name} at +{stats['started_s']:.2f}s ({self.stats['mode']}).")
+
+        parser = IncrementalQuestionParser()
+        buffered = []
+        stream = None
+        response_chars = 0
+        try:
+            stream = stream_fn(prompt)
+            for chunk in stream:
+                if not response_chars:
+                    stats["first_chunk_s"] = self._elapsed()
+                response_chars += len(chunk)
+                if self.winner not in (None, name):
+                    stats["status"] = "cancelled"
+                    break
+                for q_data in parser.feed(chunk):
+                    if not buffered:
+                        stats["first_question_s"] = self._elapsed()
+                    buffered.append(q_data)
+                    self._deliver(name, buffered, q_data, enough=len(buffered) >= self.min_ready)
+            else:
+                # Stream completed: a short but complete response still beats waiting on the others
+                if buffered:
+                    self._deliver(name, buffered, None, enough=True)
+        except Exception as e:
+            stats["error"] = str(e)
+            print(f"### ERROR: {name} stream failed after {len(buffered)} questions: {e}")
+        finally:
+            if stream is not None and hasattr(stream, "close"):
+                try:
+                    stream.close()  # Releases the HTTP response of a cancelled loser
+                except Exception:
+                    pass
+
+        stats["ended_s"] = self._elapsed()
+        stats["response_chars"] = response_chars
+        stats["questions"] = len(buffered)
+        stats["parse"] = parser.report()
+        if parser.rejected:
+            print(f"### WARNING: {name} produced {parser.rejected} objects without question/answer keys.")
+        if parser.has_partial and stats["status"] == "running":
+            print(f"### WARNING: {name} response was truncated; kept the {len(buffered)} complete questions before the cut.")
+        if self.winner == name:
+            stats["status"] = "won"
+        elif stats["status"] == "running":
+            stats["status"] = "failed" if self.winner is None else "lost"
+            print(f"### INFO: {name} {stats['status']} after {self._elapsed():.2f}s with {len(buffered)} questions.")
+            for event in self._failover[index + 1:]:
+                event.set()
+        TRACER.record("llm.stream", "llm", stream_start, provider=name, status=stats["status"],
+                      questions=len(buffered), prompt_chars=len(prompt), error=stats.get("error"))
+        if self.on_finish:
+            try:
+                self.on_finish(name, stats)
+            except Exception as e:
+                print(f"### WARNING: Could not record {name} generation metrics: {e}")
+        if self.winner == name:
+            self._end_race()  # After on_finish, so the winner's record is written before run() returns
+        self._provider_finished()
+
+    def _deliver(self, name, buffered, q_data, enough):
+        """Forwards questions once name holds the win; claims the win when it has enough"""
+        with self._lock:
+            if self.winner is None and enough:
+                self.winner = name
+                self.stats["winner"] = name
+                self.stats["win_seconds"] = self._elapsed()
+                print(f"### INFO: {name} won the question race in {self.stats['win_seconds']:.2f}s.")
+                pending = list(buffered)
+            elif self.winner == name and q_data is not None:
+                pending = [q_data]
+            else:
+                return
+        for item in pending:
+            self.on_question(item)
+
+    def _provider_finished(self):
+        with self._lock:
+            self._finished += 1
+            if self._finished == len(self.providers):
+                self._end_race()
+
+    def _end_race(self):
+        self._done.set()
+        for event in self._failover:
+            event.set()  # Lets providers still waiting for their turn exit without starting
+
+
+# --- Generated Question Bank ---
+def normalize_question_text(text):
+    """Case, punctuation and whitespace-insensitive key used to spot repeated questions"""
+    return " ".join(re.sub(r"[^\w\s]", "", str(text).lower()).split())
+
+
+class NearDuplicateIndex:
+    """MinHash/LSH index that catches reworded repeats of earlier questions
+
+    Candidates come from LSH buckets, so a lookup costs about the same with ten
+    questions indexed as with ten thousand. A candidate is a duplicate if its
+    shingle overlap (Jaccard) reaches NEAR_DUP_THRESHOLD and the answers agree
+    (one answer's words contain the other's). Requiring the same answer keeps
+    templated pairs like "capital of France" / "capital of Spain", or "increase"
+    / "decrease" in otherwise identical wording, apart.
+    """
+    _PRIME = (1 << 61) - 1
+
+    def __init__(self, num_perm=NEAR_DUP_PERMUTATIONS, bands=NEAR_DUP_BANDS, threshold=NEAR_DUP_THRESHOLD, seed=1):
+        rng = random.Random(seed)  # Fixed seed: signatures stored in the question bank stay comparable
+        self._perms = [(rng.randrange(1, self._PRIME), rng.randrange(self._PRIME)) for _ in range(num_perm)]
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self._buckets = [{} for _ in range(bands)]  # band -> {band values: [item index]}
+        self._items = []  # (question text, normalized answer words)
+        self._shingle_cache = {}
+        self.signature_struct = struct.Struct(f"<{num_perm}Q")
+
+    def __len__(self):
+        return len(self._items)
+
+    def shingles(self, text):
+        norm = normalize_question_text(text)
+        cached = self._shingle_cache.get(norm)
+        if cached is None:
+            k = NEAR_DUP_SHINGLE_CHARS
+            cached = {norm[i:i + k] for i in range(max(1, len(norm) - k + 1))}
+            self._shingle_cache[norm] = cached
+        return cached
+
+    def signature(self, text):
+        hashes = [int.from_bytes(hashlib.blake2b(sh.encode('utf-8'), digest_size=8).digest(), 'little')
+                  for sh in self.shingles(text)]
+        return [min((a * h + b) % self._PRIME for h in hashes) for a, b in self._perms]
+
+    def pack(self, signature):
+        return self.signature_struct.pack(*signature)
+
+    def unpack(self, blob):
+        if not blob or len(blob) != self.signature_struct.size:
+            return None
+        return list(self.signature_struct.unpack(blob))
+
+    @staticmethod
+    def _answer_words(answer):
+        words = normalize_question_text(answer).split()
+        if words and words[0] in ("the", "a", "an"):
+            words = words[1:]
+        return frozenset(words)
+
+    def _band_keys(self, signature):
+        rows = self.rows
+        return [tuple(signature[band * rows:(band + 1) * rows]) for band in range(len(self._buckets))]
+
+    def find(self, question, answer, signature=None):
+        """Text of an indexed question this one repeats, or None"""
+        signature = signature or self.signature(question)
+        candidates = set()
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            candidates.update(bucket.get(key, ()))
+        if not candidates:
+            return None
+        shingles = self.shingles(question)
+        answer_words = self._answer_words(answer)
+        if not answer_words:
+            return None
+        for index in candidates:
+            other_text, other_answer = self._items[index]
+            if not other_answer or not (answer_words <= other_answer or other_answer <= answer_words):
+                continue
+            other = self.shingles(other_text)
+            if len(shingles & other) / len(shingles | other) >= self.threshold:
+                return other_text
+        return None
+
+    def add(self, question, answer, signature=None):
+        signature = signature or self.signature(question)
+        index = len(self._items)
+        self._items.append((question, self._answer_words(answer)))
+        for bucket, key in zip(self._buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(index)
+        return signature
+
+
+class QuestionBank:
+    """SQLite store of validated LLM questions, tagged by category and difficulty, with per-venue seen history
+
+    A question is tagged with every (category, difficulty) pair of the prompt that
+    produced it, and is only served to a game whose selection covers all of its tags.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS questions (
+            id INTEGER PRIMARY KEY,
+            norm TEXT NOT NULL UNIQUE,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            source TEXT,
+            created_at REAL NOT NULL,
+            minhash BLOB
+        );
+        CREATE TABLE IF NOT EXISTS question_tags (
+            question_id INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+            category TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            PRIMARY KEY (question_id, category, difficulty)
+        );
+        CREATE INDEX IF NOT EXISTS idx_tags_lookup ON question_tags (category, difficulty, question_id);
+        CREATE TABLE IF NOT EXISTS seen (
+            question_id INTEGER NOT NULL REFERENCES questions(id) ON DELETE CASCADE,
+            venue TEXT NOT NULL,
+            seen_at REAL NOT NULL,
+            PRIMARY KEY (venue, question_id)
+        );
+    """
+
+    def __init__(self, path=QUESTION_BANK_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # Cheap commits; marking a question seen runs on the Tk thread
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(questions)")}
+        if "minhash" not in columns:  # Banks created before near-duplicate detection
+            self._conn.execute("ALTER TABLE questions ADD COLUMN minhash BLOB")
+        self.served = 0
+        self.stored = 0
+
+    def add_many(self, questions, categories, difficulties, source=None, signatures=None):
+        """Stores questions generated for these categories/difficulties; returns how many were new
+
+        signatures optionally maps question text to its packed NearDuplicateIndex signature.
+        """
+        tags = [(c, d) for c in categories for d in difficulties]
+        signatures = signatures or {}
+        added = 0
+        now = time.time()
+        with self._lock, self._conn:
+            for q_data in questions:
+                norm = normalize_question_text(q_data["question"])
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO questions (norm, question, answer, source, created_at, minhash) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (norm, q_data["question"], str(q_data["answer"]), source, now, signatures.get(q_data["question"])))
+                if cursor.rowcount:
+                    added += 1
+                    question_id = cursor.lastrowid
+                else:
+                    question_id = self._conn.execute("SELECT id FROM questions WHERE norm = ?", (norm,)).fetchone()[0]
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO question_tags (question_id, category, difficulty) VALUES (?, ?, ?)",
+                    [(question_id, c, d) for c, d in tags])
+            self.stored += added
+        return added
+
+    def fetch(self, categories, difficulties, venue=DEFAULT_VENUE, limit=None):
+        """Random unseen questions whose tags all fall inside the selected categories and difficulties"""
+        if not categories or not difficulties:
+            return []
+        cat_marks = ",".join("?" * len(categories))
+        diff_marks = ",".join("?" * len(difficulties))
+        sql = f"""
+            SELECT q.question, q.answer FROM questions q
+            WHERE EXISTS (SELECT 1 FROM question_tags t WHERE t.question_id = q.id)
+              AND NOT EXISTS (SELECT 1 FROM question_tags t WHERE t.question_id = q.id
+                              AND (t.category NOT IN ({cat_marks}) OR t.difficulty NOT IN ({diff_marks})))
+              AND NOT EXISTS (SELECT 1 FROM seen s WHERE s.venue = ? AND s.question_id = q.id)
+            ORDER BY RANDOM()"""
+        params = [*categories, *difficulties, venue]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        self.served += len(rows)
+        return [{"question": question, "answer": answer} for question, answer in rows]
+
+    def seen_questions(self, venue=DEFAULT_VENUE):
+        """[(question, answer, minhash or None)] for every question this venue has already been asked"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT q.question, q.answer, q.minhash FROM seen s JOIN questions q ON q.id = s.question_id "
+                "WHERE s.venue = ?", (venue,)).fetchall()
+
+    def store_signatures(self, signatures):
+        """Backfills packed MinHash signatures, given as {question text: blob}"""
+        with self._lock, self._conn:
+            self._conn.executemany("UPDATE questions SET minhash = ? WHERE norm = ?",
+                                   [(blob, normalize_question_text(text)) for text, blob in signatures.items()])
+
+    def mark_seen(self, questions, venue=DEFAULT_VENUE):
+        """Records that venue was asked these question dicts
+
+        Questions not in the bank (default files) are stored untagged, so they count as
+        seen for the history check but fetch() never serves them.
+        """
+        now = time.time()
+        rows = [(normalize_question_text(q_data["question"]), q_data["question"], str(q_data["answer"]))
+                for q_data in questions]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO questions (norm, question, answer, source, created_at) "
+                "VALUES (?, ?, ?, 'default', ?)",
+                [(norm, question, answer, now) for norm, question, answer in rows])
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO seen (question_id, venue, seen_at) "
+                "SELECT id, ?, ? FROM questions WHERE norm = ?",
+                [(venue, now, norm) for norm, _, _ in rows])
+
+    def stats(self):
+        with self._lock:
+            total = self._conn.execute("SELECT COUNT(DISTINCT question_id) FROM question_tags").fetchone()[0]
+        return {"questions": total, "stored_this_session": self.stored, "served_this_session": self.served}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+# --- Default Question Store ---
+class QuestionStore:
+    """Packed copy of a default question JSON file with an offset index
+
+    Layout: MAGIC, uint32 record count, count x (uint64 offset, uint32 length),
+    then one UTF-8 JSON object per record. The pack is rebuilt only when the
+    source file changes, so sampling k questions reads k index entries and k
+    records instead of parsing and shuffling the whole file.
+    """
+    MAGIC = b"TRQSTOR1"
+    HEADER = struct.Struct("<8sI")
+    ENTRY = struct.Struct("<QI")
+
+    def __init__(self, source_path, cache_dir=QUESTION_STORE_DIR):
+        self.source_path = source_path
+        self.cache_dir = cache_dir
+        self.path = self._pack_path()
+        self.count = self._open()
+
+    def __len__(self):
+        return self.count
+
+    def _stem(self):
+        return os.path.splitext(os.path.basename(self.source_path))[0]
+
+    def _pack_path(self):
+        stat = os.stat(self.source_path)  # FileNotFoundError for a missing bank
+        identity = f"{os.path.abspath(self.source_path)}\0{stat.st_mtime_ns}\0{stat.st_size}"
+        digest = hashlib.sha256(identity.encode('utf-8')).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{self._stem()}-{digest}.qstore")
+
+    def _open(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, count = self.HEADER.unpack(f.read(self.HEADER.size))
+            if magic == self.MAGIC:
+                return count
+        except (OSError, struct.error):
+            pass
+        return self._build()
+
+    def _build(self):
+        with open(self.source_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        records = [json.dumps({"question": q["question"], "answer": q["answer"]}, ensure_ascii=False).encode('utf-8')
+                   for q in data if isinstance(q, dict) and 'question' in q and 'answer' in q]
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        offset = self.HEADER.size + self.ENTRY.size * len(records)
+        fd, tmp_path = tempfile.mkstemp(suffix='.part', dir=self.cache_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self.HEADER.pack(self.MAGIC, len(records)))
+                for record in records:
+                    f.write(self.ENTRY.pack(offset, len(record)))
+                    offset += len(record)
+                for record in records:
+                    f.write(record)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        # Drop packs built from older versions of the same file
+        for name in os.listdir(self.cache_dir):
+            stale = os.path.join(self.cache_dir, name)
+            if name.startswith(f"{self._stem()}-") and name.endswith(".qstore") and stale != self.path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+        print(f"✓ Indexed {len(records)} questions from {os.path.basename(self.source_path)}")
+        return len(records)
+
+    def read(self, indices):
+        """Records at the given positions, returned in the order given"""
+        records = {}
+        with open(self.path, 'rb') as f:
+            for index in sorted(set(indices)):  # Ascending offsets keep the reads moving forward through the file
+                f.seek(self.HEADER.size + index * self.ENTRY.size)
+                offset, length = self.ENTRY.unpack(f.read(self.ENTRY.size))
+                f.seek(offset)
+                records[index] = json.loads(f.read(length).decode('utf-8'))
+        return [records[index] for index in indices]
+
+    @staticmethod
+    def sample_questions(stores, k, rng=random):
+        """k questions drawn uniformly from the union of stores, in random order"""
+        total = sum(len(store) for store in stores)
+        picks = rng.sample(range(total), min(k, total))
+        wanted = {}  # store index -> [(position in result, index within store)]
+        for position, index in enumerate(picks):
+            for store_index, store in enumerate(stores):
+                if index < len(store):
+                    wanted.setdefault(store_index, []).append((position, index))
+                    break
+                index -= len(store)
+        result = [None] * len(picks)
+        for store_index, entries in wanted.items():
+            for (position, _), record in zip(entries, stores[store_index].read([i for _, i in entries])):
+                result[position] = record
+        return result
+
+
+# --- Headless Game Engine ---
+class GameStateError(RuntimeError):
+    """Raised when a GameEngine action is not valid in the current phase"""
+
+
+class GameEngine:
+    """UI-free trivia rules: turn order, scoring, wagers and final-round resolution.
+
+    Front-ends call the action methods and react to events delivered to
+    subscribers as callback(event_name, payload_dict). Events:
+    question, answer, question_skipped, score_changed, final_round,
+    wager_needed, final_question, final_answer, final_judgement_needed,
+    waiting_for_questions, game_over.
+
+    With questions_pending=True the question list is still being filled
+    (streamed generation); running short pauses the game in the "waiting"
+    phase until questions_arrived() or finish_questions() is called.
+    """
+    POINTS_PER_CORRECT = 10
+
+    def __init__(self, team_names, num_rounds, questions, questions_pending=False):
+        self.team_names = list(team_names)
+        self.num_teams = len(self.team_names)
+        self.num_rounds = num_rounds
+        self.questions = questions
+        self.questions_pending = questions_pending
+        self._subscribers = []
+        self._reset()
+
+    def _reset(self):
+        self.scores = [0] * self.num_teams
+        self.wagers = {}  # team_index -> wager
+        self.current_round = 1
+        self.current_team = 0
+        self.question_index = 0
+        self.final_team = 0  # Team whose wager / final judgement is pending
+        self.phase = "setup"
+
+    # --- Events ---
+    def subscribe(self, callback):
+        self._subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _emit(self, event, **payload):
+        for callback in list(self._subscribers):
+            callback(event, payload)
+
+    def _require(self, *phases):
+        if self.phase not in phases:
+            raise GameStateError(f"Action not allowed during '{self.phase}' (expected {', '.join(phases)})")
+
+    # --- Queries ---
+    def current_question(self):
+        if 0 <= self.question_index < len(self.questions):
+            return self.questions[self.question_index]
+        return None
+
+    def progress(self):
+        """Returns (current_question_num, total_questions) across all rounds and teams"""
+        total_questions = self.num_rounds * self.num_teams
+        current_question_num = ((self.current_round - 1) * self.num_teams) + self.current_team + 1
+        return current_question_num, total_questions
+
+    def max_wager(self, team_index):
+        return max(0, self.scores[team_index])
+
+    def winners(self):
+        """Returns (max_score, [(team_name, score), ...]) for everyone tied at the top"""
+        if not self.scores:
+            return 0, []
+        max_score = max(self.scores)
+        return max_score, [(self.team_names[i], score) for i, score in enumerate(self.scores) if score == max_score]
+
+    # --- Regular rounds ---
+    def start(self):
+        self._reset()
+        self._ask_next()
+
+    def reveal_answer(self):
+        self._require("question")
+        self.phase = "answer"
+        q_data = self.current_question()
+        self._emit("answer", index=self.question_index, team_index=self.current_team,
+                   question=q_data["question"], answer=q_data["answer"])
+
+    def mark_answer(self, correct):
+        self._require("answer")
+        if correct:
+            self._add_points(self.current_team, self.POINTS_PER_CORRECT)
+        self._advance()
+
+    def skip_question(self):
+        self._require("question")
+        self._emit("question_skipped", index=self.question_index, team_index=self.current_team)
+        self._advance()
+
+    def _add_points(self, team_index, points):
+        self.scores[team_index] += points
+        self._emit("score_changed", team_index=team_index, delta=points, score=self.scores[team_index])
+
+    def _advance(self):
+        self.current_team = (self.current_team + 1) % self.num_teams
+        if self.current_team == 0:
+            self.current_round += 1
+        self.question_index += 1
+        self._ask_next()
+
+    def _ask_next(self):
+        if self.current_round > self.num_rounds:
+            self._start_final_round()
+            return
+        q_data = self.current_question()
+        if q_data is None:
+            if self.questions_pending:
+                self._wait_for_questions()
+            else:
+                self._finish(reason="out_of_questions")
+            return
+        self.phase = "question"
+        self._emit("question", index=self.question_index, round=self.current_round,
+                   team_index=self.current_team, question=q_data["question"])
+
+    def _wait_for_questions(self):
+        self.phase = "waiting"
+        self._emit("waiting_for_questions", index=self.question_index)
+
+    def questions_arrived(self):
+        """Call after appending to the question list; resumes a game that ran short"""
+        if self.phase == "waiting" and self.current_question() is not None:
+            self._ask_next()
+
+    def finish_questions(self):
+        """Call once no more questions will be appended"""
+        self.questions_pending = False
+        if self.phase == "waiting":
+            self._ask_next()
+
+    # --- Final round ---
+    def _start_final_round(self):
+        if self.current_question() is None:
+            if self.questions_pending:
+                self._wait_for_questions()
+            else:
+                self._finish(reason="no_final_question")
+            return
+        self.phase = "wagers"
+        self.wagers = {}
+        self.final_team = 0
+        self._emit("final_round")
+        self._emit("wager_needed", team_index=0, max_wager=self.max_wager(0))
+
+    def submit_wager(self, amount):
+        """Record the pending team's wager; raises ValueError if out of range"""
+        self._require("wagers")
+        max_wager = self.max_wager(self.final_team)
+        if not 0 <= amount <= max_wager:
+            raise ValueError(f"Wager must be between 0 and {max_wager}")
+        self.wagers[self.final_team] = amount
+        self.final_team += 1
+        if self.final_team < self.num_teams:
+            self._emit("wager_needed", team_index=self.final_team, max_wager=self.max_wager(self.final_team))
+        else:
+            self.phase = "final_question"
+            self._emit("final_question", index=self.question_index, question=self.current_question()["question"])
+
+    def reveal_final_answer(self):
+        """Reveal the final answer; judgements are then collected starting with team 0"""
+        self._require("final_question")
+        self.phase = "final_answer"
+        self.final_team = 0
+        q_data = self.current_question()
+        self._emit("final_answer", question=q_data["question"], answer=q_data["answer"], team_index=0)
+
+    def mark_final_answer(self, correct):
+        self._require("final_answer")
+        wager = self.wagers.get(self.final_team, 0)
+        self._add_points(self.final_team, wager if correct else -wager)
+        self.final_team += 1
+        if self.final_team < self.num_teams:
+            self._emit("final_judgement_needed", team_index=self.final_team)
+        else:
+            self._finish()
+
+    def _finish(self, reason=None):
+        self.phase = "finished"
+        max_score, winners = self.winners()
+        self._emit("game_over", reason=reason, max_score=max_score, winners=winners)
+
+
+# --- Retained In-Game Screen ---
+class GameScreen:
+    """Question/answer screen built once per game and updated in place each turn"""
+    def __init__(self, root, load_icon):
+        self.root = root
+        wraplength = root.winfo_screenwidth() * 0.8
+
+        self.frame = Frame(root, bg=COLORS["light_blue"])
+        self.frame.pack(fill=tk.BOTH, expand=True)
+
+        # Title with icon
+        title_frame = Frame(self.frame, bg=COLORS["light_blue"])
+        title_frame.pack(pady=(10, 5))
+        load_icon(title_frame)
+        Label(title_frame, text="Trivia Royale", font=FONTS["big"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"]).pack()
+
+        # Scoreboard shell; team cells are (re)built only when the team list changes
+        score_container = Frame(self.frame, bg=COLORS["dark_teal"], padx=2, pady=2)
+        score_container.pack(pady=10, padx=40, fill=tk.X)
+        self.score_frame = Frame(score_container, bg=COLORS["light_blue"], padx=10, pady=5)
+        self.score_frame.pack(fill=tk.X)
+        self.team_cells = []
+        self.team_names = None
+
+        # Progress bar
+        self.progress_container = Frame(self.frame, bg=COLORS["light_blue"])
+        self.progress_container.pack(fill=tk.X, padx=100, pady=(0, 20))
+        bar_bg = Frame(self.progress_container, bg=COLORS["dark_teal"], height=10)
+        bar_bg.pack(fill=tk.X, pady=5)
+        bar_bg.pack_propagate(False)
+        self.bar_fg = Frame(bar_bg, bg=COLORS["soft_yellow"], height=10)
+        self.bar_fg.place(relx=0, rely=0, relwidth=0)
+        self.progress_label = Label(self.progress_container, text="", font=FONTS["xsmall"], fg=COLORS["soft_coral"], bg=COLORS["light_blue"])
+        self.progress_label.pack()
+
+        # Question view widgets
+        self.turn_frame = Frame(self.frame, bg=COLORS["dark_teal"], padx=2, pady=2)
+        self.turn_label = Label(self.turn_frame, text="", font=FONTS["big_italic"], fg=COLORS["light_blue"], bg=COLORS["dark_teal"])
+        self.turn_label.pack()
+        self.question_label = Label(self.frame, text="", font=FONTS["medium"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"],
+                                    wraplength=wraplength, justify="center")
+
+        # Answer view widgets
+        self.answer_heading = Label(self.frame, text="Answer", font=FONTS["big_italic"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"])
+        self.answer_container = Frame(self.frame, bg=COLORS["dark_teal"], padx=3, pady=3)
+        self.answer_label = Label(self.answer_container, text="", font=("Helvetica", 28, "bold"),
+                                  fg=COLORS["soft_yellow"], bg=COLORS["light_blue"], wraplength=wraplength, padx=40, pady=20)
+        self.answer_label.pack()
+
+        # Shared prompt label (reveal prompt on questions, correctness prompt on answers)
+        self.prompt_label = Label(self.frame, text="", font=FONTS["medium_bold"], fg=COLORS["soft_coral"], bg=COLORS["light_blue"])
+
+        self._view_widgets = [self.turn_frame, self.question_label, self.answer_heading, self.answer_container, self.prompt_label]
+
+    def is_alive(self):
+        try:
+            return bool(self.frame.winfo_exists())
+        except tk.TclError:
+            return False
+
+    def update_scoreboard(self, team_names, scores, current_team):
+        if self.team_names != list(team_names):
+            for cell in self.score_frame.winfo_children():
+                cell.destroy()
+            self.team_cells = []
+            for name in team_names:
+                team_container = Frame(self.score_frame, bg=COLORS["light_blue"])
+                team_container.pack(side=tk.LEFT, expand=True, padx=10)
+                name_label = Label(team_container, text=f"{name}", bg=COLORS["light_blue"])
+                name_label.pack(side=tk.TOP)
+                score_label = Label(team_container, text="", font=("Helvetica", 18, "bold"), fg=COLORS["soft_yellow"], bg=COLORS["light_blue"])
+                score_label.pack(side=tk.TOP)
+                self.team_cells.append((name_label, score_label))
+            self.team_names = list(team_names)
+
+        for i, ((name_label, score_label), score) in enumerate(zip(self.team_cells, scores)):
+            # Highlight current team
+            is_current = (i == current_team)
+            name_label.config(fg=COLORS["soft_yellow"] if is_current else COLORS["soft_coral"],
+                              font=("Helvetica", 16, "bold") if is_current else ("Helvetica", 14, "bold"))
+            score_label.config(text=f"{score} pts")
+
+    def update_progress(self, current_question_num, total_questions):
+        if total_questions <= 0:
+            return
+        progress_percent = min(1.0, current_question_num / total_questions)
+        self.bar_fg.place_configure(relwidth=progress_percent)
+        self.progress_label.config(text=f"Question {current_question_num} of {total_questions}")
+
+    def _show_view(self, packing):
+        for widget in self._view_widgets:
+            widget.pack_forget()
+        for widget, pack_options in packing:
+            widget.pack(**pack_options)
+
+    def show_question_view(self, turn_text, question_text):
+        self.turn_label.config(text=turn_text)
+        self.question_label.config(text=question_text)
+        self.prompt_label.config(text="")
+        self._show_view([(self.turn_frame, {"pady": 10}),
+                         (self.question_label, {"pady": 30}),
+                         (self.prompt_label, {"pady": 40})])
+        return self.prompt_label
+
+    def show_answer_view(self, answer_text, prompt_text):
+        self.answer_label.config(text=answer_text)
+        self.prompt_label.config(text=prompt_text)
+        self._show_view([(self.answer_heading, {"pady": 40}),
+                         (self.answer_container, {"pady": 20}),
+                         (self.prompt_label, {"pady": 60})])
+        return self.prompt_label
+
+
 class TriviaGame:
     def __init__(self, root):
         self.root = root
+        startup_start = time.perf_counter()
         # Load API keys
         self._load_api_keys()
         
@@ -206,97 +2550,239 @@ class TriviaGame:
         self.root.title("Trivia Royale")
 
         self.root.bind("<Escape>", self.quit_game)
-
-        self.question_index = 0
+        TRACER.record("startup", "startup", startup_start)
+        # Runs once the first frame has been drawn and the event loop is idle
+        self.root.after_idle(TRACER.record, "startup.first_frame", "startup", startup_start)
 
     def _load_api_keys(self):
         """Load API keys from environment and config file."""
+        config_start = time.perf_counter()
         # Try environment first
         self.gemini_key = os.getenv('GEMINI_API_KEY')
         self.mistral_key = os.getenv('MISTRAL_API_KEY')
         
-        # Try config file if needed
-        if not self.gemini_key or not self.mistral_key:
-            config_dir = os.path.expanduser('~/.trivia_royale')
-            config_file = os.path.join(config_dir, 'config.json')
-            
-            if os.path.exists(config_file):
-                try:
-                    with open(config_file, 'r') as f:
-                        stored_keys = json.load(f)
-                        if not self.gemini_key and 'GEMINI_API_KEY' in stored_keys:
-                            self.gemini_key = stored_keys['GEMINI_API_KEY'].strip()
-                        if not self.mistral_key and 'MISTRAL_API_KEY' in stored_keys:
-                            self.mistral_key = stored_keys['MISTRAL_API_KEY'].strip()
-                except Exception as e:
-                    print(f"### ERROR: Failed to load config file: {e}")
+        # Config file fills in keys missing from the environment and can hold the optional settings below
+        stored_keys = {}
+        config_file = os.path.join(CONFIG_DIR, 'config.json')
+        if os.path.exists(config_file):
+            try:
+                with open(config_file, 'r') as f:
+                    stored_keys = json.load(f)
+            except Exception as e:
+                print(f"### ERROR: Failed to load config file: {e}")
+        if not self.gemini_key and 'GEMINI_API_KEY' in stored_keys:
+            self.gemini_key = stored_keys['GEMINI_API_KEY'].strip()
+        if not self.mistral_key and 'MISTRAL_API_KEY' in stored_keys:
+            self.mistral_key = stored_keys['MISTRAL_API_KEY'].strip()
+
+        def setting(name):
+            """Environment value, else config.json value, else None"""
+            value = os.getenv(name)
+            if value is None and name in stored_keys:
+                value = str(stored_keys[name])
+            return value.strip() if value is not None else None
+
+        self.mistral_base_url = (setting('MISTRAL_BASE_URL') or MISTRAL_BASE_URL).rstrip('/')
+        if self.mistral_base_url != MISTRAL_BASE_URL:
+            print(f"### INFO: Using Mistral-compatible endpoint at {self.mistral_base_url}")
+        self.llm_hedge_delay = self._parse_hedge_delay(setting('LLM_HEDGE_DELAY'))
+        self.venue = setting('TRIVIA_VENUE') or DEFAULT_VENUE
+        self.llm_cache_enabled = (setting('LLM_RESPONSE_CACHE') or "off").lower() in ("1", "on", "true", "yes")
+        self.llm_cache_ttl_hours = self._parse_float_setting('LLM_CACHE_TTL_HOURS', setting('LLM_CACHE_TTL_HOURS'),
+                                                             LLM_CACHE_TTL_HOURS, 0.0)
+        self.llm_cache_fresh = self._parse_float_setting('LLM_CACHE_FRESH', setting('LLM_CACHE_FRESH'),
+                                                         LLM_CACHE_FRESH_FRACTION, 0.0, 1.0)
+        self.generation_metrics_enabled = (setting('GENERATION_METRICS') or "on").lower() not in ("0", "off", "false", "no")
+        self.music_cache_mb = self._parse_float_setting('MUSIC_CACHE_MB', setting('MUSIC_CACHE_MB'),
+                                                        MUSIC_CACHE_MAX_MB, 0.0)
+        trace_path = setting('TRIVIA_TRACE')
+        if trace_path and not TRACER.path:  # --trace on the command line wins
+            try:
+                TRACER.configure(trace_path, setting('TRIVIA_TRACE_FORMAT') or None)
+                print(f"### INFO: Writing a {TRACER.format} trace to {TRACER.path} on exit")
+            except ValueError as e:
+                print(f"### WARNING: Ignoring TRIVIA_TRACE: {e}")
+        TRACER.record("startup.config", "startup", config_start)
 
         # If keys are still missing, show dialog
         if not self.gemini_key or not self.mistral_key:
-            self._show_api_key_dialog()
+            with TRACER.span("startup.api_key_dialog", "startup"):
+                self._show_api_key_dialog()
+
+        # Everything a registered provider may read in from_settings()
+        self.provider_settings = {name: setting(name) for name in
+                                  ("GEMINI_MODEL", "MISTRAL_MODEL", "LOCAL_LLM_URL", "LOCAL_LLM_MODEL")}
+        self.provider_settings.update(GEMINI_API_KEY=self.gemini_key, MISTRAL_API_KEY=self.mistral_key,
+                                      MISTRAL_BASE_URL=self.mistral_base_url)
 
         # Debug output
         print(f"### DEBUG: Loaded GEMINI_API_KEY: {bool(self.gemini_key)} (len: {len(self.gemini_key) if self.gemini_key else 0})")
         print(f"### DEBUG: Loaded MISTRAL_API_KEY: {bool(self.mistral_key)} (len: {len(self.mistral_key) if self.mistral_key else 0})")
 
         # --- Pygame Mixer Initialization ---
+        step_start = time.perf_counter()
         try:
             pygame.mixer.pre_init(44100, -16, 2, 512)
             pygame.mixer.init()
             pygame.init()
         except pygame.error as e:
             messagebox.showerror("Audio Error", f"Could not initialize audio playback: {e}\nMusic and TTS may not work.")
+        TRACER.record("startup.mixer_init", "startup", step_start)
 
         # --- Initialize Sound Effects and Visual Feedback ---
+        step_start = time.perf_counter()
         try:
             self.sfx = SoundEffectManager()
             print("✓ Sound effects loaded successfully")
         except Exception as e:
             print(f"### WARNING: Failed to initialize sound effects: {e}")
             self.sfx = None
+        TRACER.record("startup.sound_effects", "startup", step_start)
+
+        # Game music is decoded into memory by the title screen warm-up; MUSIC_CACHE_MB=0 streams everything
+        self.music_manager = None
+        if pygame.mixer.get_init():
+            try:
+                self.music_manager = MusicManager(max_bytes=int(self.music_cache_mb * 1024 * 1024))
+            except Exception as e:
+                print(f"### WARNING: Failed to initialize the music cache, music will stream from disk: {e}")
         
+        # Shared decode/resize cache for every image asset (icon, feedback marks, background)
+        self.image_cache = ImageAssetCache()
+        self.icon_path = get_asset_path("TriviaRoyalIcon(2).png")
+
         try:
-            self.feedback_animator = FeedbackAnimator(self.root)
+            self.feedback_animator = FeedbackAnimator(self.root, self.image_cache)
             print("✓ Visual feedback system loaded")
         except Exception as e:
             print(f"### WARNING: Failed to initialize feedback animator: {e}")
             self.feedback_animator = None
 
-        # Initialize game state variables
+        step_start = time.perf_counter()
+        try:
+            self.tts_cache = TTSCache()
+            print(f"✓ TTS cache ready at {self.tts_cache.cache_dir}")
+        except Exception as e:
+            print(f"### WARNING: Failed to initialize TTS cache: {e}")
+            self.tts_cache = None
+        TRACER.record("startup.tts_cache", "startup", step_start)
+
+        step_start = time.perf_counter()
+        try:
+            self.question_bank = QuestionBank()
+            print(f"✓ Question bank ready at {self.question_bank.path}")
+        except Exception as e:
+            print(f"### WARNING: Failed to open question bank: {e}")
+            self.question_bank = None
+        TRACER.record("startup.question_bank", "startup", step_start)
+
+        self.llm_cache = None
+        if self.llm_cache_enabled:
+            try:
+                self.llm_cache = LLMResponseCache(ttl_hours=self.llm_cache_ttl_hours)
+                print(f"✓ LLM response cache enabled at {self.llm_cache.cache_dir} "
+                      f"({self.llm_cache_fresh:.0%} of each shard generated fresh)")
+            except Exception as e:
+                print(f"### WARNING: Failed to initialize LLM response cache: {e}")
+
+        self.generation_metrics = None
+        if self.generation_metrics_enabled:
+            try:
+                self.generation_metrics = GenerationMetrics()
+            except OSError as e:
+                print(f"### WARNING: Failed to initialize generation metrics: {e}")
+
+        # Pre-synthesis only helps when clips can land somewhere persistent
+        self.tts_prefetcher = None
+        if self.tts_cache:
+            self.tts_prefetcher = TTSPrefetcher(self.tts_cache, functools.partial(self._get_tts_clip, prefetch=True))
+
+        self.speech_player = None
+        if pygame.mixer.get_init():
+            step_start = time.perf_counter()
+            try:
+                self.speech_player = SpeechPlayer(self.root, self._get_tts_clip, self._speak_text_fallback)
+                print("✓ Speech playback service started")
+            except Exception as e:
+                print(f"### WARNING: Failed to start speech playback service: {e}")
+            TRACER.record("startup.speech_player", "startup", step_start)
+
+        # Game setup chosen on the setup screens; per-game state lives in self.engine
         self.num_rounds = 0
         self.num_teams = 0
         self.team_names = []
-        self.scores = []
-        self.wagers = {}
-        self.collecting_wagers = False
         self.selected_categories = []
         self.selected_difficulties = []
         self.questions = []
-        self.current_round = 1
-        self.current_team = 0
+        self.questions_pending = False  # True while a streamed LLM response is still adding questions
+        self.last_question_races = []  # HedgedQuestionRace.stats per shard attempt from the most recent generation
+        self.last_bank_served = 0  # Questions the most recent game got from the question bank
+        self.seen_pending = []  # Questions asked this game, written to the venue history at game over
+        self.seen_writer = None  # Thread writing the last game's seen_pending
+        self.engine = None
+        self.http = PooledHTTPClient()  # Shared by every Mistral request so shards reuse connections
+        # Every registered backend; each keeps one client for the whole session. The router picks the order.
+        self.llm_providers = [cls.from_settings(self.provider_settings, self.http) for cls in PROVIDER_REGISTRY.values()]
+        self.provider_router = ProviderRouter(self.llm_providers)
+        self.asset_warmer = None
+        self.music_ok = {}  # Music file -> readable MP3, filled in by the title screen warm-up
         self.bg_canvas = None
         self.original_bg_image = None
+        self.bg_image_path = None
         self.bg_photo = None
+        self.game_screen = None
 
         # Define UI element instance variables early
         self.reveal_prompt_label = None
         self.correctness_prompt_label = None
 
         # Load background image safely
+        step_start = time.perf_counter()
         try:
             bg_image_path = get_asset_path("images/backgrounds/TriviaRoyaleScene(2).jpg")
             if not os.path.exists(bg_image_path):
                  raise FileNotFoundError(f"Image file not found at {bg_image_path}")
-            self.original_bg_image = Image.open(bg_image_path)
+            self.original_bg_image = Image.open(bg_image_path)  # Lazy: pixels decode only on a cache miss
+            self.bg_image_path = bg_image_path
         except FileNotFoundError as fnf_error:
             self.original_bg_image = None
             messagebox.showerror("Image Error", f"Background image not found:\n{bg_image_path}\nPlease ensure it's in the 'assets' folder.")
         except Exception as e:
             self.original_bg_image = None
             messagebox.showerror("Image Error", f"Could not load background image: {e}")
+        TRACER.record("startup.background_image", "startup", step_start)
 
         self.title_screen()
 
+    @staticmethod
+    def _parse_hedge_delay(setting):
+        """LLM_HEDGE_DELAY: seconds before the backup provider starts, 0 for both at once, 'off' for sequential"""
+        if setting is None or not setting.strip():
+            return LLM_HEDGE_DELAY_S
+        if setting.strip().lower() in ("off", "none", "sequential"):
+            return None
+        try:
+            return max(0.0, float(setting))
+        except ValueError:
+            print(f"### WARNING: Invalid LLM_HEDGE_DELAY '{setting}', using {LLM_HEDGE_DELAY_S}s.")
+            return LLM_HEDGE_DELAY_S
+
+    @staticmethod
+    def _parse_float_setting(name, setting, default, minimum=None, maximum=None):
+        """Numeric setting clamped to [minimum, maximum]; default when unset or invalid"""
+        if not setting:
+            return default
+        try:
+            value = float(setting)
+        except ValueError:
+            print(f"### WARNING: Invalid {name} '{setting}', using {default}.")
+            return default
+        if minimum is not None:
+            value = max(minimum, value)
+        if maximum is not None:
+            value = min(maximum, value)
+        return value
+
     def _show_api_key_dialog(self):
         """Show dialog for API key entry with improved UI"""
         dialog = Toplevel(self.root)
@@ -370,9 +2856,8 @@ class TriviaGame:
             
             # Save to config file if keys provided
             if gemini_key or mistral_key:
-                config_dir = os.path.expanduser('~/.trivia_royale')
-                os.makedirs(config_dir, exist_ok=True)
-                config_file = os.path.join(config_dir, 'config.json')
+                os.makedirs(CONFIG_DIR, exist_ok=True)
+                config_file = os.path.join(CONFIG_DIR, 'config.json')
                 
                 stored_keys = {}
                 if gemini_key:
@@ -409,6 +2894,25 @@ class TriviaGame:
 
     def quit_game(self, event=None):
         """Safely exits the application."""
+        if getattr(self, 'asset_warmer', None):
+            self.asset_warmer.shutdown()
+        if getattr(self, 'speech_player', None):
+            self.speech_player.shutdown()
+        if getattr(self, 'tts_prefetcher', None):
+            self.tts_prefetcher.shutdown()
+        if getattr(self, 'tts_cache', None):
+            print(f"### INFO: TTS cache stats: {self.tts_cache.stats()}")
+        if getattr(self, 'llm_cache', None):
+            print(f"### INFO: LLM response cache stats: {self.llm_cache.stats()}")
+        if getattr(self, 'http', None):
+            print(f"### INFO: HTTP client stats: {self.http.stats()}")
+            self.http.close()
+        if getattr(self, 'question_bank', None):
+            self._flush_seen_questions()
+            print(f"### INFO: Question bank stats: {self.question_bank.stats()}")
+            self.question_bank.close()
+        if getattr(self, 'music_manager', None):
+            print(f"### INFO: Music cache stats: {self.music_manager.stats()}")
         if pygame.mixer.get_init():
             pygame.mixer.music.stop()
             pygame.mixer.quit()
@@ -421,9 +2925,11 @@ class TriviaGame:
         self.root.quit()
 
 
-    def clear_screen(self):
-        """Clear all widgets from the root window."""
+    def clear_screen(self, keep=None):
+        """Clear all widgets from the root window (except `keep`, if given)."""
         for widget in self.root.winfo_children():
+            if widget is keep:
+                continue
             try:
                 widget.destroy()
             except tk.TclError:
@@ -445,8 +2951,9 @@ class TriviaGame:
         screen_height = self.root.winfo_screenheight()
 
         try:
-            resized_bg = self.original_bg_image.resize((screen_width, screen_height), Image.LANCZOS)
-            self.bg_photo = ImageTk.PhotoImage(resized_bg)
+            # Scaled pixels and the PhotoImage are cached per resolution (memory + ~/.trivia_royale)
+            self.bg_photo = self.image_cache.get_photo(self.bg_image_path, (screen_width, screen_height),
+                                                       persist=True, source=self.original_bg_image)
             self.bg_canvas = Canvas(self.root, width=screen_width, height=screen_height, borderwidth=0, highlightthickness=0)
             self.bg_canvas.pack(fill=tk.BOTH, expand=True)
             self.bg_canvas.create_image(0, 0, anchor='nw', image=self.bg_photo)
@@ -458,8 +2965,10 @@ class TriviaGame:
              self.root.configure(bg=COLORS["light_blue"])
 
 
+    @traced_screen("title")
     def title_screen(self):
         self._resize_and_display_bg()
+        self._start_asset_warmup()
 
         # Title label commented out
         # title_label = Label(self.root, text="Trivia Royale", font=FONTS["large"], ...)
@@ -492,13 +3001,89 @@ class TriviaGame:
 
         self.root.after(1500, start_sequence)
 
+    def _start_asset_warmup(self):
+        """Uses the otherwise idle title screen to get later screens' images, music, clients and voice ready"""
+        if self.asset_warmer:
+            return
+        self.asset_warmer = AssetWarmer()
+        self.asset_warmer.run([
+            ("images", self._warm_images),
+            ("music", self._warm_music),
+            ("llm_clients", self._warm_llm_clients),
+            ("speech", self._warm_speech),
+            ("modules", self._warm_modules),
+        ])
+
+    def _warm_images(self):
+        """Decodes and scales the icon and feedback marks off the Tk thread, then has it make the PhotoImages"""
+        specs = [(self.icon_path, ICON_SIZE)]
+        if self.feedback_animator:
+            specs += [(path, FeedbackAnimator.IMAGE_SIZE) for path in self.feedback_animator.image_paths()]
+        warmed = 0
+        for path, size in specs:
+            if os.path.exists(path):
+                self.image_cache.get_image(path, size)
+                warmed += 1
+        try:
+            self.root.after(0, self._finish_image_warmup)
+        except (RuntimeError, tk.TclError):
+            pass  # Root already destroyed
+        return f"{warmed} of {len(specs)} images"
+
+    def _finish_image_warmup(self):
+        with TRACER.span("warmup.photos", "warmup"):
+            try:
+                self.image_cache.get_photo(self.icon_path, ICON_SIZE)
+            except Exception:
+                pass  # Remembered as failed; _load_icon_image shows the crown instead
+            if self.feedback_animator and not self.feedback_animator.images_loaded:
+                self.feedback_animator.load_images()
+
+    def _warm_music(self):
+        """Checks which in-game music files are usable MP3s and decodes them into the music cache"""
+        music_ok = {}
+        for filename in THINKING_THEMES + [FINAL_ROUND_THEME, WINNER_THEME]:
+            try:
+                music_ok[filename] = read_mp3_file(get_asset_path(filename))
+            except OSError as e:
+                music_ok[filename] = False
+                print(f"### WARNING: Music file {filename} is not readable: {e}")
+            if not music_ok[filename] and os.path.exists(get_asset_path(filename)):
+                print(f"### WARNING: Music file {filename} does not look like an MP3")
+        self.music_ok = music_ok
+        if not self.music_manager or not self.music_manager.max_bytes:
+            return f"{sum(music_ok.values())} of {len(music_ok)} music files"
+        cached = self.music_manager.preload([filename for filename, ok in music_ok.items() if ok])
+        return f"{sum(music_ok.values())} of {len(music_ok)} music files, {cached} decoded into memory"
+
+    def _warm_llm_clients(self):
+        """Builds the LLM provider clients and resolves their hosts ahead of the first request"""
+        ready = [provider for provider in self.llm_providers if provider.available]
+        for provider in ready:
+            provider.client()
+        hosts = [provider.host for provider in ready if provider.host]
+        return f"{resolve_hosts(hosts)} of {len(hosts)} hosts resolved"
+
+    def _warm_modules(self):
+        """Loads the remaining deferred modules (offline voice, clipboard)"""
+        loaded = 0
+        for module in LAZY_MODULES:
+            try:
+                module.load()
+                loaded += 1
+            except ImportError as e:
+                print(f"### WARNING: Optional module {module._name} is not available: {e}")
+        return f"{loaded} of {len(LAZY_MODULES)} modules"
+
+    def _warm_speech(self):
+        """Imports gTTS and resolves its host; speech itself is pre-synthesized per question once questions exist"""
+        importlib.import_module("gtts")
+        return f"{resolve_hosts([GTTS_HOST])} of 1 hosts resolved"
+
     def _load_icon_image(self, parent_frame):
         """Helper to load and display the Trivia Royale icon"""
         try:
-            icon_path = get_asset_path("TriviaRoyalIcon(2).png")
-            icon_img = Image.open(icon_path)
-            icon_img = icon_img.resize((80, 80), Image.LANCZOS)
-            icon_photo = ImageTk.PhotoImage(icon_img)
+            icon_photo = self.image_cache.get_photo(self.icon_path, ICON_SIZE)
             icon_label = Label(parent_frame, image=icon_photo, bg=COLORS["light_blue"])
             icon_label.image = icon_photo  # Keep reference
             icon_label.pack()
@@ -506,6 +3091,7 @@ class TriviaGame:
             # Fallback to crown emoji if image not found
             Label(parent_frame, text="\U0001F451", font=("Helvetica", 50), bg=COLORS["light_blue"]).pack()
 
+    @traced_screen("rounds")
     def get_number_of_rounds(self):
         self.clear_screen()
         self.root.configure(bg=COLORS["light_blue"])
@@ -594,6 +3180,7 @@ class TriviaGame:
         
         self.root.bind("<Return>", validate_input)
 
+    @traced_screen("teams")
     def get_number_of_teams(self):
         self.clear_screen()
         self.root.configure(bg=COLORS["light_blue"])
@@ -683,6 +3270,7 @@ class TriviaGame:
         
         self.root.bind("<Return>", validate_input)
 
+    @traced_screen("team_names")
     def get_team_names(self):
         """Collect names for all teams."""
         self.clear_screen()
@@ -779,7 +3367,6 @@ class TriviaGame:
                     if self.sfx:
                         self.sfx.play('button_click')
                     self.team_names = all_names
-                    self.scores = [0] * self.num_teams
                     self.root.unbind("<Return>")
                     self.select_categories()
                 else:
@@ -794,6 +3381,7 @@ class TriviaGame:
         self.root.bind("<Return>", handle_team_name_input)
 
 
+    @traced_screen("categories")
     def select_categories(self):
         self.clear_screen()
         self.root.configure(bg=COLORS["light_blue"])
@@ -901,6 +3489,7 @@ class TriviaGame:
         Button(popup, text="Save", command=save_label, font=FONTS["small"], bg=COLORS["dark_teal"], fg=COLORS["light_blue"]).pack(pady=5)
         popup.wait_window()
 
+    @traced_screen("difficulty")
     def select_difficulty(self):
         self.clear_screen()
         self.root.configure(bg=COLORS["light_blue"])
@@ -1015,20 +3604,8 @@ class TriviaGame:
         self.generate_and_load_questions()
 
     def generate_and_load_questions(self):
-        prompt = ""
         is_default = self.selected_categories == ["default"]
-        if is_default:
-            prompt = "default"
-        else:
-            categories_list = ", ".join(self.selected_categories)
-            order = {"Easy": 1, "Medium": 2, "Hard": 3}
-            sorted_difficulties = sorted(self.selected_difficulties, key=lambda x: order.get(x, 99))
-            if len(sorted_difficulties) == 1: diff_clause = f"The questions should be primarily {sorted_difficulties[0].lower()} difficulty."
-            elif len(sorted_difficulties) == 2: diff_clause = f"Include a mix of {sorted_difficulties[0].lower()} and {sorted_difficulties[1].lower()} difficulty questions."
-            else: diff_clause = "Include a mix of easy, medium, and hard difficulty questions."
-            num_questions_needed = self.num_rounds * self.num_teams + 1
-            if num_questions_needed < 10: num_questions_needed = 10
-            prompt = (f"Generate {num_questions_needed} unique trivia questions randomly selected from the following topics: {categories_list}. {diff_clause} Ensure that all answers are factually correct and concise. Output the results STRICTLY as a JSON array where each element is a JSON object containing ONLY two keys: \"question\" and \"answer\". Do NOT include any introductory text, explanations, markdown formatting (like ```json or ```), or comments outside the JSON structure.")
+        num_questions_needed = 0 if is_default else max(10, self.num_rounds * self.num_teams + 1)
 
         wait_window = None
         if not is_default:
@@ -1038,19 +3615,53 @@ class TriviaGame:
             wait_window = self.show_wait_message(wait_message)
 
         # Pass the wait_window object to the thread
-        loading_thread = Thread(target=self._load_questions_thread, args=(prompt, wait_window), daemon=True)
+        loading_thread = Thread(target=self._load_questions_thread, args=(num_questions_needed, wait_window), daemon=True)
         loading_thread.start()
 
-    def _load_questions_thread(self, prompt, wait_window=None):
-        """Thread for loading questions with LLM fallback logic"""
+    def _plan_question_shards(self, num_questions_needed):
+        """Splits num_questions_needed into [(count, topics)] of at most QUESTION_SHARD_SIZE each"""
+        if num_questions_needed <= 0:
+            return []
+        num_shards = -(-num_questions_needed // QUESTION_SHARD_SIZE)
+        base, extra = divmod(num_questions_needed, num_shards)
+        categories = list(self.selected_categories)
+        shards = []
+        for i in range(num_shards):
+            # With enough categories each shard covers its own slice, otherwise every shard draws from all of them
+            topics = categories[i::num_shards] if len(categories) >= num_shards else categories
+            shards.append((base + (1 if i < extra else 0), topics))
+        return shards
+
+    def _build_question_prompt(self, num_questions, categories):
+        categories_list = ", ".join(categories)
+        order = {"Easy": 1, "Medium": 2, "Hard": 3}
+        sorted_difficulties = sorted(self.selected_difficulties, key=lambda x: order.get(x, 99))
+        if len(sorted_difficulties) == 1: diff_clause = f"The questions should be primarily {sorted_difficulties[0].lower()} difficulty."
+        elif len(sorted_difficulties) == 2: diff_clause = f"Include a mix of {sorted_difficulties[0].lower()} and {sorted_difficulties[1].lower()} difficulty questions."
+        else: diff_clause = "Include a mix of easy, medium, and hard difficulty questions."
+        return (f"Generate {num_questions} unique trivia questions randomly selected from the following topics: {categories_list}. {diff_clause} Ensure that all answers are factually correct and concise. Output the results STRICTLY as a JSON array where each element is a JSON object containing ONLY two keys: \"question\" and \"answer\". Do NOT include any introductory text, explanations, markdown formatting (like ```json or ```), or comments outside the JSON structure.")
+
+    def _load_questions_thread(self, num_questions_needed, wait_window=None):
+        """Thread for loading questions: question bank first, LLM top-up, then default files (num_questions_needed=0)"""
         loaded_questions = []
-        llm_tried = False  # Track if we attempted any LLM
 
-        if prompt == "default":
+        # Everything this venue has already been asked (normalized text + MinHash); every source is checked against it
+        history_dups = NearDuplicateIndex()
+        with TRACER.span("questions.history_index", "llm") as span_args:
+            self._wait_for_seen_writer()  # The previous game's questions count as seen
+            history_keys = self._index_seen_history(history_dups) if self.question_bank else set()
+            span_args["seen"] = len(history_keys)
+        stream_state = {"started": False, "duplicates": 0, "near_duplicates": 0}
+        signatures = {}  # Question text -> packed MinHash, stored in the bank alongside the question
+        accept = self._question_filter(history_dups, history_keys, stream_state, signatures)
+
+        if not num_questions_needed:
             # Load default questions logic here...
             if wait_window:
                 self.root.after(0, self.update_wait_label, wait_window, "Default Files")
-            # ... existing default loading code ...
+            loaded_questions = [q_data for q_data in self._load_default_questions() if accept(q_data)]
+            if not loaded_questions:
+                print("### CRITICAL ERROR: Failed to load ANY default questions.")
         else:
             # Debug logging with instance variables
             print(f"### DEBUG: Attempting LLM generation with GEMINI_API_KEY present: {bool(self.gemini_key)}")
@@ -1058,172 +3669,323 @@ class TriviaGame:
             print(f"### DEBUG: Attempting LLM generation with MISTRAL_API_KEY present: {bool(self.mistral_key)}")
             print(f"### DEBUG: MISTRAL_API_KEY length: {len(self.mistral_key) if self.mistral_key else 0}")
 
-            # --- LLM Generation Logic ---
-            raw_json_text = None # Initialize raw_json_text
-
-            # --- Attempt Gemini ---
-            if self.gemini_key:
-                llm_tried = True
-                print("### INFO: Attempting Gemini...")
-                # Schedule update for Gemini model name
-                if wait_window:
-                    self.root.after(0, self.update_wait_label, wait_window, GEMINI_MODEL)
-                # Make the actual call
-                raw_json_text = self.generate_trivia_questions_gemini(prompt)
-            else:
-                print("### INFO: Gemini API Key not found, skipping Gemini.")
-                raw_json_text = None # Ensure it's None if key is missing
-
-            # --- Attempt Mistral (if Gemini failed/skipped and key exists) ---
-            if raw_json_text is None and self.mistral_key:
-                llm_tried = True
-                print("### INFO: Gemini failed or key missing, attempting Mistral...")
-                # Schedule update for Mistral model name
-                if wait_window:
-                    self.root.after(0, self.update_wait_label, wait_window, MISTRAL_MODEL)
-                # Make the actual call
-                raw_json_text = self.generate_trivia_questions_mistral(prompt)
-            elif raw_json_text is None and not self.mistral_key:
-                print("### INFO: Mistral API Key not found, skipping Mistral.")
-
-            # --- Process Result (if any LLM was attempted and returned something) ---
-            if raw_json_text:
-                print("### INFO: Received response from LLM, attempting to parse...")
+            # --- LLM Generation Logic (sharded, streamed and hedged: the game starts once num_teams questions are parsed) ---
+            min_ready = max(1, self.num_teams)
+            difficulties = self.selected_difficulties or ["Easy", "Medium", "Hard"]
+            live_questions = []  # The list handed to the game once it starts; later arrivals are appended to it
+            merge_lock = Lock()  # Shard winners deliver concurrently
+
+            def on_question(q_data, replay=False):
+                """Filters like accept(); kept questions start the game at min_ready and then stream into it"""
+                if not accept(q_data, replay):
+                    return False
+                with merge_lock:
+                    if stream_state["started"]:
+                        self.root.after(0, self._add_streamed_question, live_questions, q_data)
+                        return True
+                    live_questions.append(q_data)
+                    if len(live_questions) >= min_ready:
+                        stream_state["started"] = True
+                        print(f"### INFO: {len(live_questions)} questions ready, starting game while the rest stream in.")
+                        self.root.after(0, self._finish_loading, live_questions, wait_window, True)
+                    return True
+
+            # --- Question bank first: only what it cannot supply is generated ---
+            banked = []
+            bank_start = time.perf_counter()
+            if self.question_bank:
                 try:
-                    # Clean potential markdown formatting
-                    cleaned_json = raw_json_text.strip().lstrip('```json').rstrip('```').strip()
-                    # Be more robust finding the start/end of the list/object
-                    list_start = cleaned_json.find('[')
-                    obj_start = cleaned_json.find('{')
-
-                    if list_start != -1 and (obj_start == -1 or list_start < obj_start):
-                        # Looks like a list is intended
-                        if not cleaned_json.startswith('['): cleaned_json = cleaned_json[list_start:]
-                        list_end = cleaned_json.rfind(']')
-                        if list_end != -1: cleaned_json = cleaned_json[:list_end+1]
-                    elif obj_start != -1:
-                         # Might be a single object or object containing a list
-                         if not cleaned_json.startswith('{'): cleaned_json = cleaned_json[obj_start:]
-                         obj_end = cleaned_json.rfind('}')
-                         if obj_end != -1: cleaned_json = cleaned_json[:obj_end+1]
-                    else:
-                         # If neither [ nor { are found, assume it might be a raw list/object without them
-                         pass # Keep cleaned_json as is for the json.loads attempt
-
-
-                    parsed_data = json.loads(cleaned_json)
-
-                    # Handle potential structure variations (e.g., object with a 'questions' key)
-                    potential_list = None
-                    if isinstance(parsed_data, list):
-                        potential_list = parsed_data
-                    elif isinstance(parsed_data, dict):
-                        # Look for common key names that might contain the list
-                        for key in ['questions', 'trivia', 'data', 'results']:
-                             if key in parsed_data and isinstance(parsed_data[key], list):
-                                 potential_list = parsed_data[key]
-                                 break
-                        # If no common key found, but it's a dict, maybe it's just one question/answer pair? Unlikely but possible.
-                        # We primarily expect a list.
-                    else:
-                         print("### ERROR: LLM JSON was neither a list nor a recognized dictionary structure.")
-
-
-                    # Validate the structure of the final list
-                    if potential_list and all(isinstance(item, dict) and 'question' in item and 'answer' in item for item in potential_list):
-                        loaded_questions = potential_list # Assign successfully parsed questions
-                        print(f"### INFO: Successfully parsed {len(loaded_questions)} questions from LLM.")
-                    else:
-                        print("### ERROR: Parsed LLM JSON has unexpected structure or missing keys (question/answer).")
-                        loaded_questions = [] # Ensure it's empty if parsing/validation fails
-
-                except json.JSONDecodeError as e:
-                    print(f"### ERROR: Failed to decode LLM JSON: {e}")
-                    print(f"--- Start Raw LLM Response ---\n{raw_json_text}\n--- End Raw LLM Response ---")
-                    loaded_questions = [] # Ensure empty on decode error
-                except Exception as e:
-                    print(f"### ERROR: Unexpected error processing LLM response: {e}")
-                    loaded_questions = [] # Ensure empty on other errors
-
-            # --- Fallback to Default (if LLMs were tried but failed/yielded no questions, or keys were missing) ---
-            # Use the llm_tried flag here
-            if not loaded_questions and (llm_tried or (not self.gemini_key and not self.mistral_key)):
-                # Only print fallback message if an LLM was actually attempted or if no keys existed at all
-                print("### WARNING: LLM generation failed or produced invalid data. Falling back to default questions.")
+                    banked = self.question_bank.fetch(self.selected_categories, difficulties, self.venue,
+                                                      limit=num_questions_needed)
+                except sqlite3.Error as e:
+                    print(f"### ERROR: Question bank lookup failed: {e}")
+                print(f"### INFO: Question bank supplied {len(banked)} of {num_questions_needed} questions.")
+            # Banked questions may paraphrase each other or the venue history, so they pass the same filter
+            live_questions.extend(q_data for q_data in banked if accept(q_data))
+            if len(live_questions) < len(banked):
+                print(f"### INFO: Dropped {len(banked) - len(live_questions)} banked questions as repeats.")
+            self.last_bank_served = len(live_questions)
+            TRACER.record("questions.bank_fetch", "llm", bank_start, served=len(live_questions))
+            missing = num_questions_needed - len(live_questions)
+            shards = self._plan_question_shards(missing) if missing > 0 else []
+
+            for provider in self.llm_providers:
+                if not provider.available:
+                    print(f"### INFO: {provider.name} API Key not found, skipping {provider.name}.")
+            providers = [(provider.name, provider.stream) for provider in self.provider_router.ranked(claim=False)]
+            if providers:
+                print(f"### INFO: Provider order {[name for name, _ in providers]} ({self.provider_router.describe()}).")
+            elif any(provider.available for provider in self.llm_providers):
+                print(f"### WARNING: Every LLM provider is cooling down ({self.provider_router.describe()}).")
+
+            self.last_question_races = []
+            if providers and shards:
+                if len(live_questions) >= min_ready:
+                    # The bank already covers the first turns: start now and stream the generated rest in
+                    stream_state["started"] = True
+                    print(f"### INFO: {len(live_questions)} banked questions ready, starting game while the rest stream in.")
+                    self.root.after(0, self._finish_loading, live_questions, wait_window, True)
+                model_names = {provider.name: provider.model for provider in self.llm_providers}
+                started_models = []
+
+                def on_start(name):
+                    # Schedule update for the model name(s) currently generating
+                    with merge_lock:
+                        if model_names[name] in started_models:
+                            return
+                        started_models.append(model_names[name])
+                        label = " + ".join(started_models)
+                    if wait_window:
+                        self.root.after(0, self.update_wait_label, wait_window, label)
+
+                cache_models = [model_names[name] for name, _ in providers]
+
+                def run_shard(shard_index, count, topics):
+                    kept = []
+                    races = []
+                    shard_prompt = self._build_question_prompt(count, topics)
+                    if self.llm_cache:
+                        cached_model, cached = self.llm_cache.get(cache_models, shard_prompt)
+                        replay_target = count - round(count * self.llm_cache_fresh)
+                        for q_data in random.sample(cached, len(cached)):
+                            if len(kept) >= replay_target:
+                                break
+                            if on_question(q_data, replay=True):
+                                kept.append(q_data)
+                        if cached:
+                            print(f"### INFO: Shard {shard_index + 1} replayed {len(kept)} of {count} questions "
+                                  f"from the {cached_model} response cache.")
+
+                    for attempt in range(1 + QUESTION_SHARD_RETRIES):
+                        missing = count - len(kept)
+                        if missing <= 0:
+                            break
+                        if attempt:
+                            print(f"### INFO: Shard {shard_index + 1} came back {missing} short, retrying (attempt {attempt + 1}).")
+
+                        new_questions = []
+                        received = []
+
+                        def on_shard_question(q_data):
+                            received.append(q_data)
+                            if on_question(q_data):
+                                new_questions.append(q_data)
+
+                        prompt = self._build_question_prompt(missing, topics)
+                        on_finish = functools.partial(self._record_generation, prompt=prompt, requested=missing,
+                                                      shard=shard_index, attempt=attempt)
+                        # Ranked per attempt so a provider due a trial request gets exactly one, from one shard
+                        shard_providers = [(p.name, p.stream) for p in self.provider_router.ranked()]
+                        race = HedgedQuestionRace(shard_providers, min(min_ready, missing), on_shard_question,
+                                                  hedge_delay=self.llm_hedge_delay, on_start=on_start,
+                                                  on_finish=on_finish)
+                        with TRACER.span("llm.shard", "llm", shard=shard_index, attempt=attempt,
+                                         requested=missing) as span_args:
+                            span_args["winner"] = race.run(prompt)
+                            span_args["kept"] = len(new_questions)
+                        races.append(dict(race.stats, shard=shard_index, attempt=attempt, requested=missing))
+                        self.provider_router.record_race(race.stats)
+                        kept.extend(new_questions)
+                        if self.llm_cache and race.winner and received:
+                            try:
+                                self.llm_cache.put(model_names[race.winner], shard_prompt, received,
+                                                   count * LLM_CACHE_POOL_FACTOR)
+                            except (OSError, ValueError) as e:
+                                print(f"### WARNING: Could not write the LLM response cache: {e}")
+                        if self.question_bank and new_questions:
+                            try:
+                                self.question_bank.add_many(new_questions, topics, difficulties, source=race.winner,
+                                                            signatures=signatures)
+                            except sqlite3.Error as e:
+                                print(f"### ERROR: Could not store generated questions in the question bank: {e}")
+                    return len(kept), races
+
+                print(f"### INFO: Generating {sum(c for c, _ in shards)} questions in {len(shards)} shard(s).")
+                shard_start = time.perf_counter()
+                with ThreadPoolExecutor(max_workers=QUESTION_SHARD_WORKERS, thread_name_prefix="question-shard") as pool:
+                    futures = [pool.submit(run_shard, i, count, topics) for i, (count, topics) in enumerate(shards)]
+                    results = [future.result() for future in futures]
+                self.last_question_races = [race for _, races in results for race in races]
+                self.provider_router.save()
+                TRACER.record("llm.generate", "llm", shard_start, shards=len(shards),
+                              kept=sum(kept for kept, _ in results), duplicates=stream_state["duplicates"],
+                              near_duplicates=stream_state["near_duplicates"])
+                print(f"### INFO: {sum(kept for kept, _ in results)} questions from {len(shards)} shard(s) in "
+                      f"{time.perf_counter() - shard_start:.2f}s ({stream_state['duplicates']} duplicates and "
+                      f"{stream_state['near_duplicates']} near-duplicates dropped).")
+
+            if stream_state["started"]:
+                # The game is already running on live_questions; top up a short or truncated stream, then close it
+                # live_questions is still being appended to on the Tk thread, so count what was kept instead
+                delivered = self.last_bank_served + sum(kept for kept, _ in results)
+                if delivered < num_questions_needed:
+                    missing = num_questions_needed - delivered
+                    print(f"### WARNING: Question stream ended {missing} short of {num_questions_needed}. "
+                          "Topping up with default questions.")
+                    for q_data in [q for q in self._load_default_questions() if accept(q)][:missing]:
+                        self.root.after(0, self._add_streamed_question, live_questions, q_data)
+                self.root.after(0, self._end_question_stream, live_questions)
+                return
+            loaded_questions = live_questions
+
+            # --- Fallback to Default (LLMs failed or fell short, keys were missing or every provider is cooling down) ---
+            if len(loaded_questions) < num_questions_needed:
+                if loaded_questions:
+                    print(f"### WARNING: Only {len(loaded_questions)} of {num_questions_needed} questions after "
+                          "filtering. Topping up with default questions.")
+                else:
+                    print("### WARNING: LLM generation failed or produced invalid data. Falling back to default questions.")
                 # Schedule update for Default Files message
                 if wait_window:
                     self.root.after(0, self.update_wait_label, wait_window, "Default Files")
 
-                # --- Load from Default Files (Fallback Logic) ---
-                files_to_load = []
-                difficulty_map = {"Easy": "questions_easy.json", "Medium": "questions_medium.json", "Hard": "questions_hard.json"}
-                for diff in self.selected_difficulties:
-                    filename = difficulty_map.get(diff)
-                    if filename:
-                        files_to_load.append(get_asset_path(filename))
-                if not files_to_load:
-                    files_to_load.append(get_asset_path("questions_medium.json"))
-
-                for fname in files_to_load:
-                    try:
-                        with open(fname, 'r', encoding='utf-8') as file:
-                            data = json.load(file)
-                            loaded_questions.extend(data)
-                    except FileNotFoundError: print(f"### ERROR: Default file (fallback) not found: {fname}")
-                    except json.JSONDecodeError as e: print(f"### ERROR: JSON decode error in {os.path.basename(fname)} (fallback): {e}")
-                    except Exception as e: print(f"### ERROR: Error reading {os.path.basename(fname)} (fallback): {e}")
-
-                if loaded_questions:
-                    random.shuffle(loaded_questions)
-                    num_needed = self.num_rounds * self.num_teams + 1
-                    if len(loaded_questions) > num_needed + 20:
-                        loaded_questions = loaded_questions[:num_needed + 20]
-                else:
-                     print("### CRITICAL ERROR: Failed to load ANY questions (LLM and Default fallback failed).")
+                missing = num_questions_needed - len(loaded_questions)
+                loaded_questions += [q_data for q_data in self._load_default_questions() if accept(q_data)][:missing]
+                if not loaded_questions:
+                    print("### CRITICAL ERROR: Failed to load ANY questions (LLM and Default fallback failed).")
+
+
+        # --- Schedule _finish_loading to run on the main thread ---
+        self.root.after(0, self._finish_loading, loaded_questions, wait_window)
+
+    def _question_filter(self, history_dups, history_keys, stream_state, signatures):
+        """Returns accept(q_data, replay=False): True if the question is valid and new to this game and venue
+
+        Exact and near duplicates of questions already kept this game, or of the venue history, are dropped and
+        counted in stream_state. replay=True is for response-cache hits, which are deliberately served again and
+        so skip the venue history. Safe to call from several shard threads at once.
+        """
+        game_dups = NearDuplicateIndex()
+        game_keys = set()
+        lock = Lock()
+
+        def accept(q_data, replay=False):
+            question, answer = q_data.get("question"), q_data.get("answer")
+            if not isinstance(question, str) or not question.strip() or answer is None or not str(answer).strip():
+                return False
+            key = normalize_question_text(question)
+            signature = game_dups.signature(question)
+            with lock:
+                if key in game_keys or (not replay and key in history_keys):
+                    stream_state["duplicates"] += 1
+                    return False
+                repeat = game_dups.find(question, answer, signature)
+                if repeat is None and not replay:
+                    repeat = history_dups.find(question, answer, signature)
+                if repeat:
+                    stream_state["near_duplicates"] += 1
+                    print(f"### DEBUG: Dropped near-duplicate '{question}' (repeats '{repeat}')")
+                    return False
+                game_keys.add(key)
+                game_dups.add(question, answer, signature)
+                signatures[question] = game_dups.pack(signature)
+                return True
+
+        return accept
+
+    def _index_seen_history(self, near_dups):
+        """Adds every question this venue has been asked to near_dups; returns their normalized texts"""
+        try:
+            rows = self.question_bank.seen_questions(self.venue)
+        except sqlite3.Error as e:
+            print(f"### ERROR: Could not read seen questions from the question bank: {e}")
+            return set()
+        backfill = {}
+        for question, answer, blob in rows:
+            signature = near_dups.unpack(blob)
+            if signature is None:
+                signature = near_dups.signature(question)
+                backfill[question] = near_dups.pack(signature)
+            near_dups.add(question, answer, signature)
+        if backfill:
+            try:
+                self.question_bank.store_signatures(backfill)
+            except sqlite3.Error as e:
+                print(f"### WARNING: Could not store question signatures: {e}")
+        return {normalize_question_text(question) for question, _, _ in rows}
+
+    def _load_default_questions(self):
+        """Samples this game's questions (plus 20 spare) from the indexed default files for the selected difficulties"""
+        files_to_load = []
+        difficulty_map = {"Easy": "questions_easy.json", "Medium": "questions_medium.json", "Hard": "questions_hard.json"}
+        for diff in self.selected_difficulties:
+            filename = difficulty_map.get(diff)
+            if filename:
+                files_to_load.append(get_asset_path(filename))
+        if not files_to_load:
+            files_to_load.append(get_asset_path("questions_medium.json"))
+
+        stores = []
+        for fname in files_to_load:
+            try:
+                stores.append(QuestionStore(fname))
+            except FileNotFoundError: print(f"### ERROR: Default file (fallback) not found: {fname}")
+            except json.JSONDecodeError as e: print(f"### ERROR: JSON decode error in {os.path.basename(fname)} (fallback): {e}")
+            except Exception as e: print(f"### ERROR: Error reading {os.path.basename(fname)} (fallback): {e}")
 
+        num_needed = self.num_rounds * self.num_teams + 1
+        try:
+            with TRACER.span("questions.default_sample", "llm", files=len(stores)):
+                return QuestionStore.sample_questions(stores, num_needed + 20)
+        except (OSError, ValueError) as e:
+            print(f"### ERROR: Could not sample default questions: {e}")
+            return []
+
+    def _finish_loading(self, loaded_questions, wait_window=None, streaming=False):
+        """Runs on the main thread to update UI after loading (or once a stream has enough questions)."""
+        # --- Reset Cursor FIRST (on root) ---
+        try:
+            # Only reset the root window's cursor
+            self.root.config(cursor="")
+            self.root.update_idletasks() # Optional: ensure reset is processed
+            print("### DEBUG: Root cursor reset to default")
+        except tk.TclError as e:
+             print(f"### WARNING: Could not reset root cursor: {e}")
+        except Exception as e:
+             print(f"### ERROR: Unexpected error resetting cursor: {e}")
+        # ------------------------------------
 
-        # --- Nested Function to Finalize Loading on Main Thread ---
-        def finish_loading():
-            """Runs on the main thread to update UI after loading."""
-            # --- Reset Cursor FIRST (on root) ---
+        # --- Destroy Wait Window ---
+        if wait_window:
             try:
-                # Only reset the root window's cursor
-                self.root.config(cursor="")
-                self.root.update_idletasks() # Optional: ensure reset is processed
-                print("### DEBUG: Root cursor reset to default")
-            except tk.TclError as e:
-                 print(f"### WARNING: Could not reset root cursor: {e}")
+                if wait_window.winfo_exists():
+                    # No need to reset wait_window cursor as we didn't set it
+                    wait_window.destroy()
+            except tk.TclError:
+                pass # Window might already be gone
             except Exception as e:
-                 print(f"### ERROR: Unexpected error resetting cursor: {e}")
-            # ------------------------------------
-
-            # --- Destroy Wait Window ---
-            if wait_window:
-                try:
-                    if wait_window.winfo_exists():
-                        # No need to reset wait_window cursor as we didn't set it
-                        wait_window.destroy()
-                except tk.TclError:
-                    pass # Window might already be gone
-                except Exception as e:
-                    print(f"### ERROR: Unexpected error destroying wait window: {e}")
-
-            # --- Process Loaded Questions ---
-            if loaded_questions:
-                # ... (process questions and start game) ...
-                self.questions = loaded_questions
-                num_needed = self.num_rounds * self.num_teams + 1
+                print(f"### ERROR: Unexpected error destroying wait window: {e}")
+
+        # --- Process Loaded Questions ---
+        if loaded_questions:
+            self.questions = loaded_questions
+            self.questions_pending = streaming
+            num_needed = self.num_rounds * self.num_teams + 1
+            if streaming:
+                print(f"--- First {len(self.questions)} questions ready; more are streaming in. ---")
+            else:
                 if len(self.questions) < num_needed:
                      messagebox.showwarning("Question Shortage", f"Warning: Only {len(self.questions)} questions loaded (needed {num_needed}). Game may end early or repeat questions if defaults were limited.")
                 print(f"--- Question Loading Complete: {len(self.questions)} questions ready. ---")
-                self.game_play() # Start the game
-            else:
-                # ... (handle critical loading error) ...
-                messagebox.showerror("Loading Error", "CRITICAL: Failed to load any trivia questions from LLM or default files. Cannot start the game.")
-                self.title_screen() # Go back to title screen
-
-        # --- Schedule finish_loading to run on the main thread ---
-        self.root.after(0, finish_loading)
+            self.prefetch_speech(start_index=0)
+            self.game_play() # Start the game
+        else:
+            messagebox.showerror("Loading Error", "CRITICAL: Failed to load any trivia questions from LLM or default files. Cannot start the game.")
+            self.title_screen() # Go back to title screen
+
+    def _add_streamed_question(self, live_questions, q_data):
+        """Main thread: append a question that arrived after the game started."""
+        live_questions.append(q_data)
+        if self.engine and self.engine.questions is live_questions:
+            self.engine.questions_arrived()
+            self.prefetch_speech()
+
+    def _end_question_stream(self, live_questions):
+        """Main thread: the LLM stream has finished, so the engine stops waiting for more."""
+        print(f"--- Question Stream Complete: {len(live_questions)} questions received. ---")
+        if self.engine and self.engine.questions is live_questions:
+            self.questions_pending = False
+            self.engine.finish_questions()
 
     def update_wait_label(self, wait_window, model_name):
         """Safely updates the label text in the wait_window."""
@@ -1244,6 +4006,7 @@ class TriviaGame:
         except Exception as e:
             print(f"### ERROR: Unexpected error updating wait label: {e}")
 
+    @traced_screen("loading")
     def show_wait_message(self, message="Please wait..."):
         wait_window = Toplevel(self.root)
         wait_window.title("Loading")
@@ -1290,87 +4053,100 @@ class TriviaGame:
         return wait_window
 
     # --- LLM Interaction ---
-    def generate_trivia_questions_gemini(self, prompt):
-        if not self.gemini_key:
-            print("### ERROR: Gemini API Key not found.")
-            return None
-            
-        genai.configure(api_key=self.gemini_key)
-        # Use the constant here:
-        model = genai.GenerativeModel(GEMINI_MODEL)
-        try:
-            response = model.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            print(f"### ERROR: Gemini API Exception: {e}")
-            return None
+    def _record_generation(self, name, stats, prompt, requested, shard=None, attempt=0, mode="stream"):
+        """Appends one generation call to the metrics log; stats is a HedgedQuestionRace provider entry.
+
+        Runs on the thread that made the call so the provider's last_call() (retries, token usage) is its own.
+        """
+        provider = next((p for p in self.llm_providers if p.name == name), None)
+        call = provider.last_call() if provider else {}
+        if not self.generation_metrics:
+            return
+        usage = call.get("usage") or {}
+        parse = stats.get("parse") or {}
+        started = stats.get("started_s") or 0.0
+
+        def since_start(key):
+            return round(stats[key] - started, 3) if stats.get(key) is not None else None
+
+        self.generation_metrics.append({
+            "provider": name,
+            "model": provider.model if provider else None,
+            "mode": mode,
+            "status": stats.get("status"),
+            "error": stats.get("error"),
+            "venue": self.venue,
+            "shard": shard,
+            "attempt": attempt,
+            "requested": requested,
+            "prompt_chars": len(prompt),
+            "response_chars": stats.get("response_chars", 0),
+            "prompt_tokens": usage.get("prompt_tokens"),
+            "completion_tokens": usage.get("completion_tokens"),
+            "ttfb_s": since_start("first_chunk_s"),
+            "first_question_s": since_start("first_question_s"),
+            "total_s": since_start("ended_s"),
+            "questions": stats.get("questions", 0),
+            "rejected": parse.get("rejected", 0),
+            "truncated": parse.get("truncated", False),
+            "retries": call.get("retries", 0),
+        })
 
-    def generate_trivia_questions_mistral(self, prompt):
-        if not self.mistral_key:
-            print("### ERROR: Mistral API Key not found.")
+    def get_trivia_questions_from_llm(self, prompt):
+        raw_json_text = None
+        ranked = self.provider_router.ranked()
+        tried = []
+        for provider in ranked:
+            tried.append(provider.name)
+            start = time.perf_counter()
+            raw_json_text = provider.generate(prompt)
+            elapsed = round(time.perf_counter() - start, 3)
+            parsed_questions, report = extract_questions(raw_json_text) if raw_json_text else ([], {})
+            # Whole-response time is not time to a first question, so only the outcome feeds the router
+            self.provider_router.record(provider.name, bool(parsed_questions))
+            # Without streaming the first byte and the first question arrive with the whole response
+            self._record_generation(provider.name, {
+                "status": "won" if parsed_questions else "failed", "started_s": 0.0, "ended_s": elapsed,
+                "first_chunk_s": elapsed if raw_json_text else None,
+                "first_question_s": elapsed if parsed_questions else None,
+                "response_chars": len(raw_json_text or ""), "questions": len(parsed_questions), "parse": report,
+            }, prompt, requested=None, mode="generate")
+            if parsed_questions:
+                break
+        self.provider_router.release(p.name for p in ranked if p.name not in tried)  # Trials never reached
+        self.provider_router.save()
+        if not raw_json_text:
+            print("### ERROR: Both LLMs failed.")
             return None
-
-        try:
-            headers = {
-                "Authorization": f"Bearer {self.mistral_key}",
-                "Content-Type": "application/json"
-            }
-            data = {
-                "model": MISTRAL_MODEL,
-                "messages": [{"role": "user", "content": prompt}]
-            }
-            response = requests.post(
-                "https://api.mistral.ai/v1/chat/completions",
-                headers=headers,
-                json=data
-            )
-            if response.status_code == 200:
-                return response.json()['choices'][0]['message']['content']
-            else:
-                print(f"### ERROR: Mistral API Error: {response.status_code}")
-                return None
-        except Exception as e:
-            print(f"### ERROR: Mistral API Exception: {e}")
+        if report["rejected"] or report["truncated"]:
+            print(f"### WARNING: Recovered {report['recovered']} questions from a damaged LLM response "
+                  f"({report['rejected']} malformed objects skipped, truncated: {report['truncated']}).")
+        if not parsed_questions:
+            print(f"### ERROR: No questions found in LLM response.\n--- Start Raw ---\n{raw_json_text}\n--- End Raw ---")
             return None
-
-    def get_trivia_questions_from_llm(self, prompt):
-        raw_json_text = self.generate_trivia_questions_gemini(prompt)
-        if raw_json_text is None:
-            raw_json_text = self.generate_trivia_questions_mistral(prompt)
-        if raw_json_text:
-            try:
-                cleaned_json = raw_json_text.strip().lstrip('```json').rstrip('```').strip()
-                if not cleaned_json.startswith('['): list_start = cleaned_json.find('['); cleaned_json = cleaned_json[list_start:] if list_start != -1 else cleaned_json
-                if not cleaned_json.endswith(']'): list_end = cleaned_json.rfind(']'); cleaned_json = cleaned_json[:list_end+1] if list_end != -1 else cleaned_json
-                parsed_questions = json.loads(cleaned_json)
-                if isinstance(parsed_questions, list) and all(isinstance(item, dict) and 'question' in item and 'answer' in item for item in parsed_questions):
-                    return parsed_questions
-                else: print("### ERROR: Parsed LLM JSON has unexpected structure."); return None
-            except json.JSONDecodeError as e: print(f"### ERROR: Failed to decode LLM JSON: {e}\n--- Start Raw ---\n{raw_json_text}\n--- End Raw ---"); return None
-            except Exception as e: print(f"### ERROR: Error processing LLM response: {e}"); return None
-        else: print("### ERROR: Both LLMs failed."); return None
+        return parsed_questions
 
      # --- Text-to-Speech (IMPROVED WITH gTTS) ---
-    def speak_text(self, text):
-        """Speak text using gTTS (Google Text-to-Speech) for high-quality natural voice."""
+    def speak_text(self, text, on_complete=None):
+        """Speak text using gTTS (Google Text-to-Speech) for high-quality natural voice.
+
+        With the speech playback service running this returns immediately and
+        on_complete is called on the Tk thread once the clip has finished.
+        """
         if not text:
             return
 
+        if self.speech_player:
+            self.speech_player.preempt(text, on_complete)
+            return
+
+        # Blocking path, only used when the mixer could not be initialized
         try:
-            from gtts import gTTS
-            import tempfile
-            
-            # Create temporary file for audio
-            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
-                temp_file = fp.name
-            
-            # Generate speech using Google's TTS (much more natural than pyttsx3)
-            tts = gTTS(text=text, lang='en', slow=False)
-            tts.save(temp_file)
-            
+            clip_path, is_temp = self._get_tts_clip(text)
+
             # Play the audio using pygame
             try:
-                pygame.mixer.music.load(temp_file)
+                pygame.mixer.music.load(clip_path)
                 pygame.mixer.music.play()
                 
                 # Wait for playback to finish
@@ -1378,11 +4154,12 @@ class TriviaGame:
                     pygame.time.Clock().tick(10)
                     
             finally:
-                # Clean up temporary file
-                try:
-                    os.remove(temp_file)
-                except:
-                    pass
+                # Cached clips stay on disk; only uncached temp files are removed
+                if is_temp:
+                    try:
+                        os.remove(clip_path)
+                    except:
+                        pass
                     
         except ImportError:
             print("### WARNING: gTTS not available, falling back to pyttsx3")
@@ -1390,10 +4167,62 @@ class TriviaGame:
         except Exception as e:
             print(f"### ERROR: gTTS failed ({e}), falling back to pyttsx3")
             self._speak_text_fallback(text)
+        if on_complete:
+            on_complete()
+
+    def speak_then(self, text, min_delay_ms, callback, *args):
+        """Speak text, then run callback once speech has ended and at least min_delay_ms has passed."""
+        if not self.speech_player:
+            # Blocking TTS holds the mainloop, so the callback naturally waits for speech to end
+            self.root.after(10, self.speak_text, text)
+            self.root.after(min_delay_ms, callback, *args)
+            return
+
+        started = time.monotonic()
+        def on_spoken():
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            self.root.after(max(0, min_delay_ms - elapsed_ms), callback, *args)
+        self.speak_text(text, on_complete=on_spoken)
+
+    def _get_tts_clip(self, text, lang='en', prefetch=False):
+        """Returns (mp3_path, is_temp) for text, synthesizing with gTTS only on a cache miss."""
+        if self.tts_cache:
+            cached_path = self.tts_cache.get(text, lang, prefetch=prefetch)
+            if cached_path:
+                if not prefetch:
+                    TRACER.record("tts.cache_hit", "tts", time.perf_counter(), chars=len(text))
+                return cached_path, False
+
+        synth_start = time.perf_counter()
+        from gtts import gTTS
+
+        if self.tts_cache:
+            temp_file = self.tts_cache.new_temp_path()
+        else:
+            with tempfile.NamedTemporaryFile(delete=False, suffix='.mp3') as fp:
+                temp_file = fp.name
+
+        try:
+            # Generate speech using Google's TTS (much more natural than pyttsx3)
+            tts = gTTS(text=text, lang=lang, slow=False)
+            tts.save(temp_file)
+        except Exception as e:
+            TRACER.record("tts.synthesize", "tts", synth_start, chars=len(text), error=type(e).__name__)
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+        TRACER.record("tts.synthesize", "tts", synth_start, chars=len(text))
+
+        if self.tts_cache:
+            return self.tts_cache.put(text, temp_file, lang), False
+        return temp_file, True
     
     def _speak_text_fallback(self, text):
         """Fallback TTS using pyttsx3 if gTTS fails."""
         engine = None
+        fallback_start = time.perf_counter()
         try:
             try:
                 engine = pyttsx3.init(driverName='nsss')
@@ -1422,12 +4251,16 @@ class TriviaGame:
         finally:
             if engine is not None:
                 del engine
+            TRACER.record("tts.fallback_speak", "tts", fallback_start, chars=len(text))
 
 
     # --- Music Control ---
     def stop_music(self):
         if pygame.mixer.get_init():
             try:
+                if self.music_manager:
+                    self.music_manager.stop()
+                    return
                 pygame.mixer.music.stop()
                 pygame.mixer.music.unload()
             except pygame.error as e:
@@ -1443,9 +4276,12 @@ class TriviaGame:
                 print(f"### WARNING: Music file not found at {music_path}")
                 return
 
+            if self.music_manager:
+                self.music_manager.play(filename, loops=loops)
+                return
             self.stop_music()
             pygame.mixer.music.load(music_path)
-            pygame.mixer.music.set_volume(0.5)
+            pygame.mixer.music.set_volume(MUSIC_VOLUME)
             pygame.mixer.music.play(loops=loops)
         except pygame.error as e:
             print(f"### ERROR: Pygame error playing music file {filename}: {e}")
@@ -1454,24 +4290,93 @@ class TriviaGame:
 
 
     def play_intro_theme(self):
-        self.play_music("audio/TriviaRoyaleTheme(2).mp3", loops=0)
+        self.play_music(INTRO_THEME, loops=0)
 
     def play_thinking_theme(self):
-        random_number = random.randint(1, 7)
-        theme_file = f"audio/TQ_music_{random_number}.mp3"
-        self.play_music(theme_file, loops=-1)
+        # Once the warm-up has checked the files, only pick themes that are there and look playable
+        themes = [theme for theme in THINKING_THEMES if self.music_ok.get(theme, True)]
+        self.play_music(random.choice(themes or THINKING_THEMES), loops=-1)
 
     def play_winner_music(self):
-        self.play_music("audio/TriviaChampion.mp3", loops=0)
+        self.play_music(WINNER_THEME, loops=0)
+
+    def prefetch_speech(self, start_index=None):
+        """Queue background synthesis for the next few questions (defaults to the engine's question_index)."""
+        if self.tts_prefetcher and self.questions:
+            if start_index is None:
+                start_index = self.engine.question_index if self.engine else 0
+            self.tts_prefetcher.schedule(self.questions, start_index)
 
     # --- Game Flow ---
+    # Rules live in GameEngine; these methods only render its events and forward input.
     def game_play(self):
         if not self.questions:
              messagebox.showerror("Game Error", "No questions loaded!")
              self.title_screen(); return
-        self.question_index = 0; self.current_round = 1; self.current_team = 0
-        self.scores = [0] * self.num_teams; self.wagers = {}; self.collecting_wagers = False
-        self.show_question()
+        self._flush_seen_questions(background=True)  # Anything left from an abandoned game
+        self.engine = GameEngine(self.team_names, self.num_rounds, self.questions, questions_pending=self.questions_pending)
+        self.engine.subscribe(self._on_engine_event)
+        self.engine.start()
+
+    def _flush_seen_questions(self, background=False):
+        """Records the questions asked so far in the venue history with one batched write
+
+        Questions are only collected while the game runs so no database write ever blocks the Tk thread mid-game.
+        """
+        if not background:
+            self._wait_for_seen_writer()
+        asked, self.seen_pending = self.seen_pending, []
+        if not asked or not self.question_bank:
+            return
+
+        def write():
+            try:
+                self.question_bank.mark_seen(asked, self.venue)
+            except sqlite3.Error as e:
+                print(f"### ERROR: Could not record {len(asked)} asked questions in the question bank: {e}")
+
+        if background:
+            self._wait_for_seen_writer()  # Keeps batches in order
+            self.seen_writer = Thread(target=write, name="seen-history", daemon=True)
+            self.seen_writer.start()
+        else:
+            write()
+
+    def _wait_for_seen_writer(self):
+        if self.seen_writer is not None:
+            self.seen_writer.join()
+            self.seen_writer = None
+
+    def _on_engine_event(self, event, payload):
+        """Routes GameEngine events to the Tk screens."""
+        if event in ("question", "final_question") and self.question_bank:
+            self.seen_pending.append(self.engine.current_question())
+        if event == "question":
+            self.show_question()
+        elif event == "answer":
+            self.show_answer(payload["question"], payload["answer"])
+        elif event == "waiting_for_questions":
+            self.show_waiting_for_questions()
+        elif event == "question_skipped":
+            if self.tts_prefetcher:
+                self.tts_prefetcher.cancel(payload["index"])
+        elif event == "final_round":
+            self.final_question_round()
+        elif event == "wager_needed":
+            self.collect_wager_for_team(payload["team_index"])
+        elif event == "final_question":
+            self.display_final_question()
+        elif event == "final_answer":
+            self.show_final_answer(payload["question"], payload["answer"])
+        elif event == "final_judgement_needed":
+            self.prompt_final_correctness(self.engine.current_question()["question"], payload["team_index"])
+        elif event == "game_over":
+            self._flush_seen_questions(background=True)
+            if payload["reason"] == "out_of_questions":
+                messagebox.showinfo("Game End", "No more questions available.")
+            elif payload["reason"] == "no_final_question":
+                messagebox.showinfo("Game End", "No question left for final round!")
+            self.show_winner()
 
     def display_scoreboard(self):
         """Displays a polished scoreboard at the top of the game screen."""
@@ -1481,12 +4386,12 @@ class TriviaGame:
         score_frame = Frame(score_container, bg=COLORS["light_blue"], padx=10, pady=5)
         score_frame.pack(fill=tk.X)
         
-        for i, (name, score) in enumerate(zip(self.team_names, self.scores)):
+        for i, (name, score) in enumerate(zip(self.engine.team_names, self.engine.scores)):
             team_container = Frame(score_frame, bg=COLORS["light_blue"])
             team_container.pack(side=tk.LEFT, expand=True, padx=10)
             
             # Highlight current team
-            is_current = (i == self.current_team)
+            is_current = (i == self.engine.current_team)
             fg_color = COLORS["soft_yellow"] if is_current else COLORS["soft_coral"]
             font_style = ("Helvetica", 14, "bold") if not is_current else ("Helvetica", 16, "bold")
             
@@ -1494,31 +4399,21 @@ class TriviaGame:
             Label(team_container, text=f"{score} pts", font=("Helvetica", 18, "bold"), fg=COLORS["soft_yellow"], bg=COLORS["light_blue"]).pack(side=tk.TOP)
         return score_container
 
-    def show_progress_bar(self):
-        """Displays a visual progress bar indicating game completion."""
-        if self.num_rounds == 0: return
-        
-        progress_container = Frame(self.root, bg=COLORS["light_blue"])
-        progress_container.pack(fill=tk.X, padx=100, pady=(0, 20))
-        
-        # Calculate progress Percentage (total rounds * total teams)
-        total_questions = self.num_rounds * self.num_teams
-        current_question_num = ((self.current_round - 1) * self.num_teams) + self.current_team + 1
-        progress_percent = min(1.0, current_question_num / total_questions) if total_questions > 0 else 0
-        
-        # Background bar
-        bar_bg = Frame(progress_container, bg=COLORS["dark_teal"], height=10)
-        bar_bg.pack(fill=tk.X, pady=5)
-        bar_bg.pack_propagate(False)
-        
-        # Foreground bar (filled)
-        bar_fg = Frame(bar_bg, bg=COLORS["soft_yellow"], height=10)
-        bar_fg.place(relx=0, rely=0, relwidth=progress_percent)
-        
-        # Text indicator
-        Label(progress_container, 
-              text=f"Question {current_question_num} of {total_questions}", 
-              font=FONTS["xsmall"], fg=COLORS["soft_coral"], bg=COLORS["light_blue"]).pack()
+    @traced_screen("game")
+    def show_game_screen(self):
+        """Returns the retained question/answer screen, building it only if it was torn down."""
+        if not (self.game_screen and self.game_screen.is_alive()):
+            self.clear_screen()
+            self.game_screen = GameScreen(self.root, self._load_icon_image)
+        else:
+            # Drop anything else (e.g. feedback overlays) but keep the retained tree
+            self.clear_screen(keep=self.game_screen.frame)
+        self.root.configure(bg=COLORS["light_blue"])
+
+        self.game_screen.update_scoreboard(self.engine.team_names, self.engine.scores, self.engine.current_team)
+        if self.engine.num_rounds:
+            self.game_screen.update_progress(*self.engine.progress())
+        return self.game_screen
 
 
     # Callback function for root.after (for UI updates/key bindings)
@@ -1535,8 +4430,8 @@ class TriviaGame:
                  self.unbind_key("<Key-x>")
                  self.unbind_key("<Key-X>")
 
-                 if self.question_index < len(self.questions):
-                    current_q_data = self.questions[self.question_index]
+                 current_q_data = self.engine.current_question()
+                 if current_q_data is not None:
                     self.bind_key("<Return>", lambda e, data=current_q_data: self.handle_reveal_answer(data))
                  else:
                      print("### ERROR: Cannot bind Return, question index out of bounds!")
@@ -1548,70 +4443,41 @@ class TriviaGame:
 
 
     def show_question(self):
-        if self.question_index >= len(self.questions):
-            messagebox.showinfo("Game End", "No more questions available.")
-            self.determine_final_round_or_winner(); return
-
-        self.clear_screen(); self.root.configure(bg=COLORS["light_blue"])
-        
-        # Title with icon
-        title_frame = Frame(self.root, bg=COLORS["light_blue"])
-        title_frame.pack(pady=(10, 5))
-        self._load_icon_image(title_frame)
-        Label(title_frame, text="Trivia Royale", font=FONTS["big"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"]).pack()
-        
-        self.display_scoreboard()
-        self.show_progress_bar()
-
-        if self.current_round > self.num_rounds:
-             self.final_question_round(); return
-
-        # Current Turn Indicator
-        turn_frame = Frame(self.root, bg=COLORS["dark_teal"], padx=2, pady=2)
-        turn_frame.pack(pady=10)
-        Label(turn_frame, text=f" Round {self.current_round}/{self.num_rounds} • {self.team_names[self.current_team]}'s Turn ", 
-              font=FONTS["big_italic"], fg=COLORS["light_blue"], bg=COLORS["dark_teal"]).pack()
-
-        if self.question_index < len(self.questions):
-            current_q_data = self.questions[self.question_index]
-            current_question = current_q_data["question"]
-        else:
+        current_q_data = self.engine.current_question()
+        if current_q_data is None:
             print("### ERROR: question_index out of bounds in show_question!")
-            self.determine_final_round_or_winner(); return
-
-        # Question text with better spacing
-        question_label = Label(self.root, text=current_question, 
-                               font=FONTS["medium"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"], 
-                               wraplength=self.root.winfo_screenwidth() * 0.8, justify="center")
-        question_label.pack(pady=30)
+            return
+        current_question = current_q_data["question"]
 
-        # Trigger TTS Synchronously via root.after
-        tts_delay_ms = 10
-        self.root.after(tts_delay_ms, self.speak_text, current_question)
+        self.prefetch_speech()
+        screen = self.show_game_screen()
 
-        # UI Update / Key Binding Setup
-        self.reveal_prompt_label = Label(self.root, text="", font=FONTS["medium_bold"], fg=COLORS["soft_coral"], bg=COLORS["light_blue"])
-        self.reveal_prompt_label.pack(pady=40)
+        # Current turn indicator, question text and (empty) reveal prompt
+        turn_text = f" Round {self.engine.current_round}/{self.engine.num_rounds} • {self.engine.team_names[self.engine.current_team]}'s Turn "
+        self.reveal_prompt_label = screen.show_question_view(turn_text, current_question)
 
-        # Schedule the UI update/bindings using a SEPARATE `after` call
+        # Speak the question; prompt/bindings follow once speech ends (at least 2.5s)
         ui_setup_delay_ms = 2500
-        self.root.after(ui_setup_delay_ms, self.setup_reveal_prompt)
+        self.speak_then(current_question, ui_setup_delay_ms, self.setup_reveal_prompt)
+
+
+    def show_waiting_for_questions(self):
+        """Shown when play outruns a streaming LLM response; the engine resumes on the next arrival."""
+        self.stop_music()
+        screen = self.show_game_screen()
+        self.reveal_prompt_label = screen.show_question_view(" One Moment Please... ", "Fetching more questions...")
 
 
     def handle_reveal_answer(self, question_data, event=None):
         self.stop_music()
         self.unbind_keys_for_reveal()
-        self.show_answer(question_data["question"], question_data["answer"])
+        self.engine.reveal_answer()
 
 
     def handle_skip_question(self, event=None):
         self.stop_music()
         self.unbind_keys_for_reveal()
-        self.next_turn_logic()
-        if self.current_round > self.num_rounds:
-             self.final_question_round()
-        else:
-             self.show_question()
+        self.engine.skip_question()
 
     def unbind_keys_for_reveal(self):
         self.unbind_key("<Return>")
@@ -1620,38 +4486,12 @@ class TriviaGame:
 
 
     def show_answer(self, question_text, answer_text):
-        self.clear_screen(); self.root.configure(bg=COLORS["light_blue"])
-        
-        # Title with icon
-        title_frame = Frame(self.root, bg=COLORS["light_blue"])
-        title_frame.pack(pady=(10, 5))
-        self._load_icon_image(title_frame)
-        Label(title_frame, text="Trivia Royale", font=FONTS["big"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"]).pack()
-        
-        self.display_scoreboard()
-        self.show_progress_bar()
+        screen = self.show_game_screen()
 
-        Label(self.root, text="Answer", font=FONTS["big_italic"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"]).pack(pady=40)
-        
-        # Answer container for emphasis
-        answer_container = Frame(self.root, bg=COLORS["dark_teal"], padx=3, pady=3)
-        answer_container.pack(pady=20)
-        
-        answer_label = Label(answer_container, text=answer_text, 
-                             font=("Helvetica", 28, "bold"), 
-                             fg=COLORS["soft_yellow"], bg=COLORS["light_blue"], 
-                             wraplength=self.root.winfo_screenwidth() * 0.8,
-                             padx=40, pady=20)
-        answer_label.pack()
-
-
-        # Trigger Answer TTS Synchronously via root.after
-        tts_delay_ms = 10
-        self.root.after(tts_delay_ms, self.speak_text, answer_text)
-
-        # Create correctness prompt label
-        self.correctness_prompt_label = Label(self.root, text=f"Team {self.team_names[self.current_team]} was your answer correct?\n(Y)es  (N)o  (G)oogle it", font=FONTS["medium_bold"], fg=COLORS["soft_coral"], bg=COLORS["light_blue"])
-        self.correctness_prompt_label.pack(pady=60)
+        # Answer text and correctness prompt
+        team_name = self.engine.team_names[self.engine.current_team]
+        prompt_text = f"Team {team_name} was your answer correct?\n(Y)es  (N)o  (G)oogle it"
+        self.correctness_prompt_label = screen.show_answer_view(answer_text, prompt_text)
 
         # Bind keys for correctness - Schedule this after a longer delay
         bind_delay_ms = 2500
@@ -1663,18 +4503,15 @@ class TriviaGame:
              self.bind_key("<Key-N>", lambda e: self.handle_correctness_input("n", question_text))
              self.bind_key("<Key-g>", lambda e: self.handle_correctness_input("g", question_text))
              self.bind_key("<Key-G>", lambda e: self.handle_correctness_input("g", question_text))
-        self.root.after(bind_delay_ms, bind_correctness_keys)
+        self.speak_then(answer_text, bind_delay_ms, bind_correctness_keys)
 
 
     def handle_correctness_input(self, key_char, question_text):
         """Process Y/N/G input after answer reveal."""
         self.unbind_keys_for_correctness()
 
-        if key_char == "y":
-            self.scores[self.current_team] += 10
-            self.next_turn()
-        elif key_char == "n":
-            self.next_turn()
+        if key_char in ("y", "n"):
+            self.engine.mark_answer(key_char == "y")
         elif key_char == "g":
             try:
                  pyperclip.copy(question_text)
@@ -1683,7 +4520,8 @@ class TriviaGame:
 
             # Re-prompt for Y/N *only*
             if self.correctness_prompt_label and self.correctness_prompt_label.winfo_exists():
-                self.correctness_prompt_label.config(text=f"After checking... Team {self.team_names[self.current_team]}, correct?\n(Y = Yes / N = No)")
+                team_name = self.engine.team_names[self.engine.current_team]
+                self.correctness_prompt_label.config(text=f"After checking... Team {team_name}, correct?\n(Y = Yes / N = No)")
                 # Re-bind *only* Y and N
                 self.bind_key("<Key-y>", lambda e: self.handle_correctness_input("y", question_text))
                 self.bind_key("<Key-Y>", lambda e: self.handle_correctness_input("y", question_text))
@@ -1691,7 +4529,7 @@ class TriviaGame:
                 self.bind_key("<Key-N>", lambda e: self.handle_correctness_input("n", question_text))
             else:
                  print("### ERROR: Cannot re-prompt for Y/N, correctness_prompt_label is None or destroyed.")
-            # Do NOT call next_turn() here
+            # Do NOT advance the engine here
 
 
     def unbind_keys_for_correctness(self):
@@ -1703,24 +4541,6 @@ class TriviaGame:
         self.unbind_key("<Key-G>")
 
 
-    def next_turn(self):
-        """Advances the game state AFTER a correct/incorrect decision."""
-        self.next_turn_logic()
-        if self.current_round > self.num_rounds:
-            if not self.collecting_wagers:
-                 self.final_question_round()
-        else:
-             self.show_question()
-
-
-    def next_turn_logic(self):
-         """Handles the logic of incrementing team, round, and question index."""
-         self.current_team = (self.current_team + 1) % self.num_teams
-         if self.current_team == 0:
-             self.current_round += 1
-         self.question_index += 1
-
-
     def bind_key(self, key, func):
         self.root.bind(key, func)
 
@@ -1730,18 +4550,13 @@ class TriviaGame:
     # --- Final Question Round ---
     # Apply similar synchronous TTS scheduling via root.after
 
+    @traced_screen("final_round")
     def final_question_round(self):
-        if self.question_index >= len(self.questions):
-             messagebox.showinfo("Game End", "No question left for final round!")
-             self.show_winner(); return
-        if self.collecting_wagers: return
         self.clear_screen(); self.root.configure(bg=COLORS["light_blue"])
         self.display_title_and_scoreboard()
         Label(self.root, text="Final Question Round!", font=FONTS["large"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"]).pack(pady=20)
         Label(self.root, text="Teams, prepare your wagers.", font=FONTS["medium"], bg=COLORS["light_blue"], fg=COLORS["soft_yellow"]).pack(pady=10)
-        self.play_music("audio/FinalQuestionRound.mp3", loops=-1)
-        self.wagers = {}; self.collecting_wagers = True
-        self.collect_wager_for_team(0)
+        self.play_music(FINAL_ROUND_THEME, loops=-1)
 
     def display_title_and_scoreboard(self):
         """Displays consistent title with icon and scoreboard."""
@@ -1751,10 +4566,9 @@ class TriviaGame:
         Label(title_frame, text="Trivia Royale", font=FONTS["big"], fg=COLORS["soft_yellow"], bg=COLORS["light_blue"]).pack()
         self.display_scoreboard()
 
+    @traced_screen("wager")
     def collect_wager_for_team(self, team_index):
-        if team_index >= self.num_teams:
-            self.collecting_wagers = False; self.display_final_question(); return
-        team_name = self.team_names[team_index]; team_score = self.scores[team_index]; max_wager = max(0, team_score)
+        team_name = self.engine.team_names[team_index]; max_wager = self.engine.max_wager(team_index)
         wager_frame = Frame(self.root, bg=COLORS["light_blue"]); wager_frame.pack(pady=20, fill='x')
         wager_label = Label(wager_frame, text=f"{team_name}, enter wager (0-{max_wager}):", font=FONTS["medium_bold"], bg=COLORS["light_blue"], fg=COLORS["soft_yellow"]); wager_label.pack(pady=(10, 5))
 
@@ -1775,31 +4589,26 @@ class TriviaGame:
             try:
                 wager_input = wager_entry.get(); wager = int(wager_input) if wager_input else -1 # Handle empty
                 if 0 <= wager <= max_wager:
-                    self.wagers[team_name] = wager
-                    self.unbind_key("<Return>"); wager_frame.destroy(); self.collect_wager_for_team(team_index + 1)
+                    self.unbind_key("<Return>"); wager_frame.destroy(); self.engine.submit_wager(wager)
                 else: error_label.config(text=f"Invalid! Enter 0 to {max_wager}."); wager_entry.select_range(0, tk.END)
             except ValueError: error_label.config(text="Invalid! Enter a number."); wager_entry.select_range(0, tk.END)
         self.bind_key("<Return>", submit_wager)
 
 
+    @traced_screen("final_question")
     def display_final_question(self):
         self.stop_music()
         self.clear_screen(); self.root.configure(bg=COLORS["light_blue"])
         self.display_title_and_scoreboard()
-        if self.question_index >= len(self.questions): print("### ERROR: No final question index available!"); self.show_winner(); return
 
-        if self.question_index < len(self.questions):
-            current_q_data = self.questions[self.question_index]
-            current_question = current_q_data["question"]
-        else: print("### ERROR: Final question index out of bounds!"); self.show_winner(); return
+        current_q_data = self.engine.current_question()
+        if current_q_data is None: print("### ERROR: Final question index out of bounds!"); return
+        current_question = current_q_data["question"]
+        self.prefetch_speech()
 
         Label(self.root, text="Final Question!", font=FONTS["large"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"]).pack(pady=20)
         Label(self.root, text=current_question, font=FONTS["medium"], bg=COLORS["light_blue"], fg=COLORS["soft_yellow"], wraplength=self.root.winfo_screenwidth() * 0.7).pack(pady=20)
 
-        # Schedule Final Question TTS
-        tts_delay_ms = 10
-        self.root.after(tts_delay_ms, self.speak_text, current_question)
-
         # Setup Reveal Prompt
         self.reveal_prompt_label = Label(self.root, text="", font=FONTS["medium_bold"], fg=COLORS["soft_coral"], bg=COLORS["light_blue"]); self.reveal_prompt_label.pack(pady=60)
 
@@ -1814,41 +4623,34 @@ class TriviaGame:
              self.unbind_key("<Return>") # Ensure clean bind
              self.bind_key("<Return>", lambda e, data=current_q_data: self.handle_final_reveal(data))
 
-        # Schedule UI update after a longer delay
+        # Speak the final question; prompt follows once speech ends (at least 2.5s)
         ui_setup_delay_ms = 2500
-        self.root.after(ui_setup_delay_ms, setup_final_reveal_prompt)
+        self.speak_then(current_question, ui_setup_delay_ms, setup_final_reveal_prompt)
 
     def handle_final_reveal(self, question_data, event=None):
          self.stop_music(); self.unbind_key("<Return>")
-         self.show_final_answer(question_data["question"], question_data["answer"])
+         self.engine.reveal_final_answer()
 
+    @traced_screen("final_answer")
     def show_final_answer(self, question_text, answer_text):
         self.clear_screen(); self.root.configure(bg=COLORS["light_blue"])
         self.display_title_and_scoreboard()
         Label(self.root, text="Final Answer", font=FONTS["large"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"]).pack(pady=20)
         Label(self.root, text=answer_text, font=FONTS["medium"], bg=COLORS["light_blue"], fg=COLORS["soft_yellow"], wraplength=self.root.winfo_screenwidth() * 0.7).pack(pady=20)
 
-        # Schedule Final Answer TTS
-        tts_delay_ms = 10
-        self.root.after(tts_delay_ms, self.speak_text, answer_text)
-
-        # Schedule the prompt check slightly later to ensure TTS has started blocking
+        # Speak the final answer; correctness prompts follow once speech ends
         prompt_delay_ms = 500
-        self.root.after(prompt_delay_ms, self.prompt_final_correctness, question_text, 0)
+        self.speak_then(answer_text, prompt_delay_ms, self.prompt_final_correctness, question_text, 0)
 
 
     def prompt_final_correctness(self, question_text, team_index):
-        if team_index >= self.num_teams: self.show_winner(); return
-        team_name = self.team_names[team_index]
+        team_name = self.engine.team_names[team_index]
         prompt_frame = Frame(self.root, bg=COLORS["light_blue"]); prompt_frame.pack(pady=30, fill='x')
         correctness_label = Label(prompt_frame, text=f"{team_name}, correct? (Y/N/G)", font=FONTS["medium_bold"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"]); correctness_label.pack()
 
         def handle_final_correctness_input(key_char):
              self.unbind_keys_for_final_correctness()
-             wager = self.wagers.get(team_name, 0)
-             if key_char == "y": self.scores[team_index] += wager
-             elif key_char == "n": self.scores[team_index] -= wager
-             elif key_char == "g":
+             if key_char == "g":
                  try: pyperclip.copy(question_text); webbrowser.open(f"https://www.google.com/search?q={requests.utils.quote(question_text)}")
                  except Exception as e: print(f"### ERROR: Final Google failed: {e}")
 
@@ -1863,7 +4665,7 @@ class TriviaGame:
                  return # Wait for Y/N
              if prompt_frame.winfo_exists():
                  prompt_frame.destroy()
-             self.prompt_final_correctness(question_text, team_index + 1)
+             self.engine.mark_final_answer(key_char == "y")
 
         self.unbind_keys_for_final_correctness() # Unbind before binding new ones
         self.bind_key("<Key-y>", lambda e: handle_final_correctness_input("y"))
@@ -1880,29 +4682,16 @@ class TriviaGame:
         self.unbind_key("<Key-g>"); self.unbind_key("<Key-G>")
 
 
-    def determine_final_round_or_winner(self):
-         if self.current_round > self.num_rounds and not self.collecting_wagers:
-             self.final_question_round()
-         else:
-             self.show_winner()
-
+    @traced_screen("winner")
     def show_winner(self):
         self.stop_music()
         self.clear_screen(); self.root.configure(bg=COLORS["light_blue"])
         self.display_title_and_scoreboard()
-        if not self.scores: Label(self.root, text="Game Over!", font=FONTS["large"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"]).pack(pady=100); return
-        if not self.scores:
-            max_score = 0; winners = []
-        else:
-            try:
-                 max_score = max(self.scores)
-                 winners = [(self.team_names[i], score) for i, score in enumerate(self.scores) if score == max_score]
-            except ValueError:
-                 max_score = 0; winners = []
+        max_score, winners = self.engine.winners()
+        if not winners: Label(self.root, text="Game Over!", font=FONTS["large"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"]).pack(pady=100); return
 
         if len(winners) == 1: win_text = f"Winner: {winners[0][0]} ({winners[0][1]} pts)!"
-        elif len(winners) > 1: win_text = f"Tie: {', '.join([w[0] for w in winners])} ({max_score} pts)!"
-        else: win_text = "Game Over!"
+        else: win_text = f"Tie: {', '.join([w[0] for w in winners])} ({max_score} pts)!"
         Label(self.root, text=win_text, font=FONTS["big_italic"], bg=COLORS["light_blue"], fg=COLORS["soft_coral"], wraplength=self.root.winfo_screenwidth()*0.8).pack(pady=80)
 
         # Music call RESTORED
@@ -1912,7 +4701,21 @@ class TriviaGame:
 
 
 # --- Main Execution ---
+def parse_command_line(argv=None):
+    parser = argparse.ArgumentParser(description="Trivia Royale")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Write startup, screen, LLM and TTS timings here on exit (or set TRIVIA_TRACE)")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS,
+                        help="json (spans plus summary) or chrome (chrome://tracing / Perfetto); "
+                             "default: chrome for *.trace.json, else json")
+    # parse_known_args: app bundles may be launched with extra platform arguments
+    return parser.parse_known_args(argv)[0]
+
+
 if __name__ == "__main__":
+    options = parse_command_line()
+    if options.trace:
+        TRACER.configure(options.trace, options.trace_format)
     try:
         root = tk.Tk()
         game = TriviaGame(root)
@@ -1923,4 +4726,6 @@ if __name__ == "__main__":
         if pygame.get_init(): pygame.quit()
         try: messagebox.showerror("Fatal Error", f"An unexpected error occurred:\n{main_e}\n\nApplication will close.")
         except: pass
+        TRACER.dump()
         sys.exit(1)
+    TRACER.dump()
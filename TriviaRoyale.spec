@@ -6,7 +6,8 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[('assets', 'assets')],
-    hiddenimports=['google.generativeai', 'mistralai', 'pyttsx3.drivers', 'pyttsx3.drivers.sapi5'],
+    hiddenimports=['google.generativeai', 'mistralai', 'requests', 'pyttsx3', 'pyttsx3.drivers', 'pyttsx3.drivers.sapi5',
+                   'pyperclip', 'gtts'],  # Imported lazily by name at runtime, so analysis cannot see them
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
@@ -0,0 +1,537 @@
+#!/usr/bin/env python3
+"""
+Game-Simulation Benchmark for Trivia Royale
+Drives the full game flow with a mocked Tk root, a mocked pygame mixer and a
+stubbed LLM, then reports per-phase wall time, turns per second and peak RSS
+as JSON.
+
+    python benchmark_game.py --games 5 --rounds 10 --teams 4 --output bench.json
+
+Flow exercised per game:
+    generate_and_load_questions -> game_play -> show_question / show_answer /
+    handle_correctness_input -> final_question_round -> show_winner
+"""
+
+import argparse
+import contextlib
+import heapq
+import io
+import itertools
+import json
+import os
+import re
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import types
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# --- Mocked Tk ---
+class FakeWidget:
+    """Stands in for every Tk widget; tracks parent/children so clear_screen/winfo_exists behave"""
+    def __init__(self, master=None, *args, **kwargs):
+        self.master = master
+        self.options = dict(kwargs)
+        self.children_list = []
+        self.destroyed = False
+        self.value = ""
+        if isinstance(master, FakeWidget):
+            master.children_list.append(self)
+            root = master
+            while root.master is not None:
+                root = root.master
+            if isinstance(root, FakeRoot):
+                root.widgets_created += 1
+                if isinstance(self, FakeEntry):
+                    root.last_entry = self
+
+    def __getattr__(self, name):
+        # pack/place/grid/focus_set/pack_propagate/create_image/... are all no-ops
+        return lambda *args, **kwargs: None
+
+    def config(self, **kwargs):
+        self.options.update(kwargs)
+
+    configure = config
+
+    def cget(self, key):
+        return self.options.get(key, "")
+
+    def winfo_exists(self):
+        return not self.destroyed
+
+    def winfo_children(self):
+        return list(self.children_list)
+
+    def destroy(self):
+        for child in list(self.children_list):
+            child.destroy()
+        self.destroyed = True
+        if isinstance(self.master, FakeWidget) and self in self.master.children_list:
+            self.master.children_list.remove(self)
+
+    def winfo_screenwidth(self):
+        return 1920
+
+    def winfo_screenheight(self):
+        return 1080
+
+    winfo_width = winfo_screenwidth
+    winfo_height = winfo_screenheight
+
+    def winfo_rootx(self):
+        return 0
+
+    winfo_rooty = winfo_rootx
+
+
+class FakeEntry(FakeWidget):
+    def get(self):
+        return self.value
+
+    def insert(self, index, text):
+        self.value = str(text)
+
+    def delete(self, *args):
+        self.value = ""
+
+
+class FakeVar:
+    def __init__(self, value=False):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    def set(self, value):
+        self.value = value
+
+
+class FakeRoot(FakeWidget):
+    """Tk root with a virtual-time `after` queue that background threads may also post to"""
+    def __init__(self):
+        self.widgets_created = 0
+        self.last_entry = None
+        super().__init__(None)
+        self.bindings = {}
+        self.now_ms = 0
+        self._timers = []
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+
+    def after(self, ms, func=None, *args):
+        with self._lock:
+            timer_id = next(self._seq)
+            heapq.heappush(self._timers, (self.now_ms + int(ms), timer_id, func, args))
+        self._wakeup.set()
+        return timer_id
+
+    def bind(self, sequence, func=None, *args):
+        self.bindings[sequence] = func
+
+    def unbind(self, sequence, *args):
+        self.bindings.pop(sequence, None)
+
+    def fire(self, sequence):
+        handler = self.bindings.get(sequence)
+        if handler is None:
+            raise RuntimeError(f"No handler bound for {sequence}")
+        handler(types.SimpleNamespace(widget=self, x=0, y=0))
+
+    def pump(self, until=None, timeout=30.0):
+        """Run due callbacks in virtual time until idle (and `until()` is true, if given)"""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                item = heapq.heappop(self._timers) if self._timers else None
+                if item:
+                    self.now_ms = max(self.now_ms, item[0])
+                self._wakeup.clear()
+            if item:
+                if item[2] is not None:
+                    item[2](*item[3])
+                continue
+            if until is None or until():
+                return
+            if time.monotonic() > deadline:
+                raise TimeoutError("Timed out waiting for background work")
+            self._wakeup.wait(0.01)
+
+
+class InstantSpeechPlayer:
+    """SpeechPlayer replacement: resolves the clip (exercising the TTS cache) and completes at once"""
+    def __init__(self, root, get_clip, fallback_speak):
+        self.root = root
+        self.get_clip = get_clip
+
+    def preempt(self, text, on_complete=None):
+        self.get_clip(text)
+        if on_complete:
+            self.root.after(0, on_complete)
+
+    play = preempt
+
+    def stop(self):
+        pass
+
+    shutdown = stop
+
+    def is_busy(self):
+        return False
+
+
+# --- Mocked pygame ---
+def make_fake_pygame():
+    class FakeSound:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def __getattr__(self, name):
+            return lambda *args, **kwargs: None
+
+        def get_length(self):
+            return 0.0
+
+    class FakeChannel(FakeSound):
+        def get_busy(self):
+            return False
+
+    music = types.SimpleNamespace(
+        load=lambda *a, **k: None, play=lambda *a, **k: None, stop=lambda *a, **k: None,
+        unload=lambda *a, **k: None, set_volume=lambda *a, **k: None, get_busy=lambda: False,
+        fadeout=lambda *a, **k: None,
+    )
+    mixer = types.SimpleNamespace(
+        pre_init=lambda *a, **k: None, init=lambda *a, **k: None, get_init=lambda: (44100, -16, 2),
+        quit=lambda: None, set_reserved=lambda *a: None, set_num_channels=lambda *a: None,
+        Sound=FakeSound, Channel=FakeChannel, music=music,
+    )
+    return types.SimpleNamespace(
+        mixer=mixer, init=lambda: None, get_init=lambda: True, quit=lambda: None,
+        error=Exception, time=types.SimpleNamespace(Clock=lambda: types.SimpleNamespace(tick=lambda *a: None)),
+    )
+
+
+def make_fake_gtts():
+    class FakeGTTS:
+        def __init__(self, text, lang='en', slow=False):
+            self.text = text
+
+        def save(self, path):
+            with open(path, 'wb') as f:
+                f.write(b"ID3" + self.text.encode('utf-8')[:64])
+
+    module = types.ModuleType("gtts")
+    module.gTTS = FakeGTTS
+    return module
+
+
+def make_llm_stub(latency_ms, rng, ms_per_question=0.0):
+    """Returns (generate, stream) replacements for one provider's methods"""
+    def generate(self, prompt):
+        match = re.search(r"Generate (\d+)", prompt)
+        count = int(match.group(1)) if match else 10
+        time.sleep((latency_ms + ms_per_question * count) / 1000.0)
+        questions = []
+        for _ in range(count):
+            token = f"{rng.random():.12f}"
+            # Distinct answers too, otherwise the near-duplicate filter rightly treats these as one question
+            questions.append({"question": f"Benchmark question {token}?", "answer": f"Answer {token}"})
+        return json.dumps(questions)
+
+    def stream(self, prompt):
+        text = generate(self, prompt)
+        for offset in range(0, len(text), 256):
+            yield text[offset:offset + 256]
+    return generate, stream
+
+
+def install_mocks(tr, args, rng):
+    """Patch the TriviaRoyale module namespace so the real game code runs without a display or audio"""
+    tr.pygame = make_fake_pygame()
+    tr.Label = tr.Frame = tr.Canvas = tr.Button = tr.Checkbutton = tr.Toplevel = FakeWidget
+    tr.Entry = FakeEntry
+    tr.BooleanVar = FakeVar
+    tr.ImageTk = types.SimpleNamespace(PhotoImage=lambda *a, **k: object())
+    tr.messagebox = types.SimpleNamespace(showerror=lambda *a, **k: None, showwarning=lambda *a, **k: None,
+                                          showinfo=lambda *a, **k: None)
+    tr.SpeechPlayer = InstantSpeechPlayer
+    sys.modules["gtts"] = make_fake_gtts()
+    tr.GeminiProvider.generate, tr.GeminiProvider.stream = make_llm_stub(
+        args.llm_latency_ms, rng, args.llm_ms_per_question)
+    tr.MistralProvider.generate, tr.MistralProvider.stream = make_llm_stub(
+        args.mistral_latency_ms, rng, args.llm_ms_per_question)
+
+
+# --- Benchmark Driver ---
+def import_time_report(top=8):
+    """Cold `python -X importtime -c "import TriviaRoyale"` in a fresh interpreter: total and costliest direct imports"""
+    env = dict(os.environ, SDL_AUDIODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="hide")
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import TriviaRoyale"],
+                            cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+                            capture_output=True, text=True, timeout=300)
+    total_us = None
+    direct = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_part, cumulative, name = line.split("|")
+        name = name.rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0 and name.strip() == "TriviaRoyale":
+            total_us = int(cumulative)
+        elif depth == 1:
+            direct.append((int(cumulative), name.strip()))
+    direct.sort(reverse=True)
+    return {
+        "total_ms": round(total_us / 1000, 1) if total_us is not None else None,
+        "top_direct_imports_ms": {name: round(us / 1000, 1) for us, name in direct[:top]},
+    }
+
+
+def peak_rss_kb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # macOS reports bytes
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_game(tr, args, rng):
+    """Play one full game through the Tk front-end; returns phase timings and per-turn latencies"""
+    phases = {}
+    turn_latencies = []
+
+    start = time.perf_counter()
+    root = FakeRoot()
+    game = tr.TriviaGame(root)
+    root.pump()
+    phases["startup"] = time.perf_counter() - start
+
+    # The title screen is up for several seconds in a real game; let its warm-up finish as it would there
+    start = time.perf_counter()
+    if game.asset_warmer:
+        game.asset_warmer.done.wait(30)
+    root.pump()
+    phases["title_warmup"] = time.perf_counter() - start
+
+    # Setup screens are skipped: fill in what they would have collected
+    game.num_rounds = args.rounds
+    game.num_teams = args.teams
+    game.team_names = [f"Team {i + 1}" for i in range(args.teams)]
+    game.selected_categories = ["History", "Geography", "Music"]
+    game.selected_difficulties = ["Easy", "Medium"]
+
+    start = time.perf_counter()
+    game.generate_and_load_questions()
+    root.pump(until=lambda: game.engine is not None)
+    phases["question_loading"] = time.perf_counter() - start
+    # Streamed generation may still be appending; wait so rounds are timed on a full question list
+    root.pump(until=lambda: not game.questions_pending)
+    phases["question_generation_total"] = time.perf_counter() - start
+
+    engine = game.engine
+    turns = 0
+    start = time.perf_counter()
+    final_start = None
+    while engine.phase != "finished":
+        phase = engine.phase
+        if phase == "wagers" and final_start is None:
+            phases["regular_rounds"] = time.perf_counter() - start
+            final_start = time.perf_counter()
+
+        turn_start = time.perf_counter()
+        if phase == "question":
+            root.fire("<Key-x>" if rng.random() < args.skip_rate else "<Return>")
+        elif phase == "answer":
+            root.fire("<Key-y>" if rng.random() < 0.5 else "<Key-n>")
+            turns += 1
+        elif phase == "wagers":
+            root.last_entry.value = str(engine.max_wager(engine.final_team))
+            root.fire("<Return>")
+        elif phase == "final_question":
+            root.fire("<Return>")
+        elif phase == "final_answer":
+            root.fire("<Key-y>" if rng.random() < 0.5 else "<Key-n>")
+        root.pump()
+        if phase in ("question", "answer"):
+            turn_latencies.append(time.perf_counter() - turn_start)
+
+    if final_start is None:
+        phases["regular_rounds"] = time.perf_counter() - start
+        phases["final_round"] = 0.0
+    else:
+        phases["final_round"] = time.perf_counter() - final_start
+
+    game.quit_game()
+    return {
+        "phases": phases,
+        "turns": turns,
+        "turn_latencies": turn_latencies,
+        "widgets_created": root.widgets_created,
+        "tts_cache": game.tts_cache.stats() if game.tts_cache else None,
+        "question_races": game.last_question_races,
+        "bank_served": game.last_bank_served,
+        "llm_cache": game.llm_cache.stats() if game.llm_cache else None,
+        "asset_warmup": game.asset_warmer.stats() if game.asset_warmer else None,
+        "provider_order": list(game.last_question_races[0]["providers"]) if game.last_question_races else None,
+    }
+
+
+def run_engine_benchmark(tr, args, rng):
+    """Headless GameEngine throughput: whole games per second with no UI at all"""
+    questions = [{"question": f"q{i}", "answer": "a"} for i in range(args.rounds * args.teams + 1)]
+    team_names = [f"Team {i + 1}" for i in range(args.teams)]
+
+    def play():
+        engine = tr.GameEngine(team_names, args.rounds, questions)
+        pending = []
+        engine.subscribe(lambda event, payload: pending.append((event, payload)))
+        engine.start()
+        while pending:
+            event, payload = pending.pop(0)
+            if event == "question":
+                engine.reveal_answer()
+            elif event == "answer":
+                engine.mark_answer(rng.random() < 0.5)
+            elif event == "wager_needed":
+                engine.submit_wager(payload["max_wager"])
+            elif event == "final_question":
+                engine.reveal_final_answer()
+            elif event in ("final_answer", "final_judgement_needed"):
+                engine.mark_final_answer(rng.random() < 0.5)
+
+    start = time.perf_counter()
+    for _ in range(args.engine_games):
+        play()
+    elapsed = time.perf_counter() - start
+    return {"games": args.engine_games, "seconds": round(elapsed, 4),
+            "games_per_second": round(args.engine_games / elapsed, 1) if elapsed else None}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Trivia Royale game flow headlessly.")
+    parser.add_argument("--games", type=int, default=3, help="Full UI-driven games to play")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--teams", type=int, default=4)
+    parser.add_argument("--skip-rate", type=float, default=0.05, help="Fraction of questions skipped with X")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated Gemini response time")
+    parser.add_argument("--mistral-latency-ms", type=float, default=0.0, help="Simulated Mistral response time")
+    parser.add_argument("--llm-ms-per-question", type=float, default=0.0,
+                        help="Extra simulated generation time per requested question (both providers)")
+    parser.add_argument("--venues", type=int, default=1,
+                        help="Rotate games across this many venues (the question bank only repeats questions across venues)")
+    parser.add_argument("--hedge-delay", default=None, help="LLM_HEDGE_DELAY for the run (seconds, 0, or off)")
+    parser.add_argument("--engine-games", type=int, default=2000, help="Headless GameEngine games to simulate")
+    parser.add_argument("--skip-import-report", action="store_true",
+                        help="Skip the cold `python -X importtime` subprocess run")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Also write the game's span trace here (chrome format for *.trace.json, else json)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--verbose", action="store_true", help="Show the game's own console output")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    # Keep caches and config out of the real ~/.trivia_royale
+    home = tempfile.mkdtemp(prefix="trivia_bench_")
+    os.environ["HOME"] = home
+    os.environ["USERPROFILE"] = home
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("MISTRAL_API_KEY", "benchmark")
+    if args.hedge_delay is not None:
+        os.environ["LLM_HEDGE_DELAY"] = args.hedge_delay
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        start = time.perf_counter()
+        import TriviaRoyale as tr
+        import_seconds = time.perf_counter() - start
+        install_mocks(tr, args, rng)
+        games = []
+        for game_index in range(args.games):
+            os.environ["TRIVIA_VENUE"] = f"venue-{game_index % args.venues + 1}"
+            games.append(run_game(tr, args, rng))
+        engine_report = run_engine_benchmark(tr, args, rng)
+        if args.trace:
+            tr.TRACER.dump(args.trace)
+
+    phase_names = ["startup", "title_warmup", "question_loading", "question_generation_total", "regular_rounds", "final_round"]
+    phase_report = {}
+    for name in phase_names:
+        values = [g["phases"][name] for g in games]
+        phase_report[name] = {"mean_s": round(statistics.mean(values), 5), "max_s": round(max(values), 5)}
+
+    latencies = [lat for g in games for lat in g["turn_latencies"]]
+    total_turns = sum(g["turns"] for g in games)
+    total_round_time = sum(g["phases"]["regular_rounds"] for g in games)
+
+    races = [race for g in games for race in g["question_races"]]
+    win_times = [r["win_seconds"] for r in races if r["win_seconds"] is not None]
+    winners = {}
+    for race in races:
+        winners[race["winner"]] = winners.get(race["winner"], 0) + 1
+
+    report = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "verbose", "trace")},
+        "import_seconds": round(import_seconds, 4),
+        "import_report": {
+            "cold": import_time_report() if not args.skip_import_report else None,
+            "deferred_seconds": dict(tr.LAZY_IMPORT_SECONDS),  # Loaded later, e.g. by the title screen warm-up
+        },
+        "phases": phase_report,
+        "turns": total_turns,
+        "turns_per_second": round(total_turns / total_round_time, 1) if total_round_time else None,
+        "turn_latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3) if latencies else None,
+            "p95": round(percentile(latencies, 95) * 1000, 3) if latencies else None,
+            "max": round(max(latencies) * 1000, 3) if latencies else None,
+        },
+        "question_generation": {
+            "mode": races[0]["mode"] if races else None,
+            "shard_attempts": len(races),
+            "provider_order_per_game": [g["provider_order"] for g in games],
+            "bank_served_per_game": [g["bank_served"] for g in games],
+            "response_cache_per_game": [g["llm_cache"] for g in games],
+            "winners": winners,
+            "win_seconds_mean": round(statistics.mean(win_times), 3) if win_times else None,
+            "win_seconds_max": round(max(win_times), 3) if win_times else None,
+        },
+        "widgets_created_per_game": round(statistics.mean(g["widgets_created"] for g in games), 1),
+        "tts_cache": games[-1]["tts_cache"] if games else None,
+        "asset_warmup": games[-1]["asset_warmup"] if games else None,
+        "spans": tr.TRACER.summary(),  # Startup steps, screens, LLM and TTS across all games
+        "engine": engine_report,
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+        print(f"✓ Benchmark report written to {args.output}")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
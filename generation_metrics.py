@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Generation Metrics Summary for Trivia Royale
+Reads the append-only log the game writes for every LLM generation call
+(~/.trivia_royale/generation_metrics.jsonl, plus the rotated .1 file) and
+prints latency percentiles, failure rates and throughput per provider and model.
+
+    python generation_metrics.py
+    python generation_metrics.py --by provider,model,requested --since-hours 24
+    python generation_metrics.py --json > metrics.json
+
+Does not import the game, so it runs without pygame or Tk.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".trivia_royale", "generation_metrics.jsonl")
+LATENCY_FIELDS = ("ttfb_s", "first_question_s", "total_s")
+GROUP_FIELDS = ("provider", "model", "mode", "status", "venue", "requested")
+
+
+def percentile(values, pct):
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def mean(values):
+    return round(sum(values) / len(values), 3) if values else None
+
+
+def read_records(path, since=None):
+    """Every parseable record from the rotated file and then the live one; skips a torn last line"""
+    records = []
+    skipped = 0
+    for candidate in (path + ".1", path):
+        try:
+            with open(candidate, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        skipped += 1
+                        continue
+                    if since is None or record.get("ts", 0) >= since:
+                        records.append(record)
+        except FileNotFoundError:
+            continue
+    return records, skipped
+
+
+def summarize(records):
+    """Percentiles and rates for one group of records"""
+    completed = [r for r in records if r.get("status") in ("won", "lost") and r.get("total_s")]
+    failed = [r for r in records if r.get("status") == "failed"]
+    summary = {
+        "calls": len(records),
+        "failed": len(failed),
+        "failure_rate": round(len(failed) / len(records), 3) if records else None,
+        "cancelled": sum(1 for r in records if r.get("status") == "cancelled"),
+    }
+    for field in LATENCY_FIELDS:
+        values = [r[field] for r in records if r.get(field) is not None]
+        summary[field] = {f"p{pct}": percentile(values, pct) for pct in (50, 90, 99)}
+    # Throughput only from calls that ran to the end of their stream
+    summary["questions_per_s"] = mean([r.get("questions", 0) / r["total_s"] for r in completed])
+    summary["questions"] = sum(r.get("questions", 0) for r in records)
+    summary["rejected"] = sum(r.get("rejected", 0) for r in records)
+    summary["truncated"] = sum(1 for r in records if r.get("truncated"))
+    summary["mean_retries"] = mean([r.get("retries", 0) for r in records])
+    summary["mean_prompt_tokens"] = mean([r["prompt_tokens"] for r in records if r.get("prompt_tokens") is not None])
+    summary["mean_completion_tokens"] = mean([r["completion_tokens"] for r in records
+                                              if r.get("completion_tokens") is not None])
+    return summary
+
+
+def group_records(records, fields):
+    groups = {}
+    for record in records:
+        key = tuple(str(record.get(field)) for field in fields)
+        groups.setdefault(key, []).append(record)
+    return {key: summarize(group) for key, group in sorted(groups.items())}
+
+
+def format_seconds(value):
+    return "-" if value is None else f"{value:.2f}"
+
+
+def print_table(grouped, fields):
+    header = ["/".join(fields), "calls", "fail%", "ttfb p50/p90/p99", "first q p50/p90/p99",
+              "total p50/p90/p99", "q/s", "retries", "rejected", "trunc"]
+    rows = []
+    for key, s in grouped.items():
+        rows.append([
+            "/".join(key),
+            str(s["calls"]),
+            "-" if s["failure_rate"] is None else f"{s['failure_rate']:.0%}",
+            *["/".join(format_seconds(s[field][f"p{pct}"]) for pct in (50, 90, 99)) for field in LATENCY_FIELDS],
+            format_seconds(s["questions_per_s"]),
+            format_seconds(s["mean_retries"]),
+            str(s["rejected"]),
+            str(s["truncated"]),
+        ])
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize Trivia Royale LLM generation metrics.")
+    parser.add_argument("--path", default=DEFAULT_PATH, help="Metrics log (the rotated PATH.1 is read too)")
+    parser.add_argument("--by", default="provider,model",
+                        help=f"Comma-separated fields to group by ({', '.join(GROUP_FIELDS)})")
+    parser.add_argument("--since-hours", type=float, default=None, help="Only calls from the last N hours")
+    parser.add_argument("--json", action="store_true", help="Print the summary as JSON instead of a table")
+    args = parser.parse_args()
+
+    fields = [field.strip() for field in args.by.split(",") if field.strip()]
+    unknown = [field for field in fields if field not in GROUP_FIELDS]
+    if not fields or unknown:
+        parser.error(f"--by takes fields from: {', '.join(GROUP_FIELDS)}")
+
+    since = time.time() - args.since_hours * 3600 if args.since_hours is not None else None
+    records, skipped = read_records(os.path.expanduser(args.path), since)
+    if not records:
+        print(f"No generation metrics in {args.path}", file=sys.stderr)
+        sys.exit(1)
+    if skipped:
+        print(f"### WARNING: Skipped {skipped} unreadable lines", file=sys.stderr)
+
+    grouped = group_records(records, fields)
+    if args.json:
+        print(json.dumps({"records": len(records), "group_by": fields,
+                          "groups": [dict(zip(fields, key), **summary) for key, summary in grouped.items()]},
+                         indent=2))
+    else:
+        print_table(grouped, fields)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Local LLM Stand-in Server for Trivia Royale
+Speaks the chat-completions JSON shape (plain and stream=true server-sent
+events) used by the game's Mistral client so question generation can be
+exercised offline with controllable latency, errors and malformed output.
+
+    python llm_standin_server.py --port 8765 --latency-ms 800 --error-rate 0.1 --malformed-rate 0.2
+    MISTRAL_BASE_URL=http://127.0.0.1:8765/v1 MISTRAL_API_KEY=local python TriviaRoyale.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+DEFAULT_TOPICS = ["General Knowledge"]
+
+
+def parse_prompt(prompt):
+    """Pull the requested question count and topic list out of the game's generation prompt"""
+    count_match = re.search(r"Generate (\d+)", prompt)
+    count = int(count_match.group(1)) if count_match else 10
+    topics_match = re.search(r"following topics: (.*?)\.\s", prompt)
+    topics = [t.strip() for t in topics_match.group(1).split(",")] if topics_match else DEFAULT_TOPICS
+    return count, [t for t in topics if t] or DEFAULT_TOPICS
+
+
+def build_questions(count, topics, rng, pad_chars=0):
+    questions = []
+    for i in range(count):
+        topic = topics[i % len(topics)]
+        token = rng.randrange(10 ** 8)
+        question = f"[Stand-in {token:08d}] Question {i + 1} about {topic}?"
+        if pad_chars:
+            question += " " + ("lorem ipsum " * (pad_chars // 12 + 1))[:pad_chars]
+        questions.append({"question": question, "answer": f"Answer {i + 1}"})
+    return questions
+
+
+def malform(content, rng):
+    """Corrupt a well-formed JSON array the way real models do"""
+    mode = rng.choice(["truncate", "fence", "prose", "trailing_comma"])
+    if mode == "truncate":
+        return content[:max(1, int(len(content) * rng.uniform(0.3, 0.95)))]
+    if mode == "fence":
+        return f"```json\n{content}\n```"
+    if mode == "prose":
+        return f"Sure! Here are your trivia questions:\n{content}\nLet me know if you need more."
+    return content[:-1] + ",]"
+
+
+def usage(prompt, content):
+    """Rough token counts (4 characters per token) in the chat-completions usage shape"""
+    return {
+        "prompt_tokens": len(prompt) // 4,
+        "completion_tokens": len(content) // 4,
+        "total_tokens": (len(prompt) + len(content)) // 4,
+    }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    server_version = "TriviaRoyaleStandIn/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive like the real API, so client connection reuse can be measured
+
+    def log_message(self, fmt, *args):
+        if not self.server.options.quiet:
+            super().log_message(fmt, *args)
+
+    def _send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip("/") in ("/health", "/v1/health"):
+            self._send_json(200, {"status": "ok", "requests": self.server.request_count})
+        elif self.path.rstrip("/") in ("/models", "/v1/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": self.server.options.model, "object": "model"}]})
+        else:
+            self._send_json(404, {"error": {"message": "Not found"}})
+
+    def do_POST(self):
+        if self.path.rstrip("/") not in ("/chat/completions", "/v1/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        options = self.server.options
+        rng = self.server.next_rng()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            prompt = request["messages"][-1]["content"]
+        except Exception as e:
+            self._send_json(400, {"error": {"message": f"Bad request: {e}"}})
+            return
+
+        # For streamed requests this is the time to first byte
+        delay_ms = max(0.0, rng.gauss(options.latency_ms, options.latency_jitter_ms))
+        time.sleep(delay_ms / 1000.0)
+
+        if rng.random() < options.error_rate:
+            status = rng.choice([429, 500, 502, 503])
+            headers = {"Retry-After": "1"} if status == 429 else None
+            self._send_json(status, {"error": {"message": f"Injected {status}", "type": "stand_in_error"}}, headers)
+            return
+
+        count, topics = parse_prompt(prompt)
+        if options.questions:
+            count = options.questions
+        content = json.dumps(build_questions(count, topics, rng, options.pad_chars))
+        if rng.random() < options.malformed_rate:
+            content = malform(content, rng)
+
+        if request.get("stream"):
+            self._send_stream(request.get("model", options.model), content, prompt)
+            return
+
+        self._send_json(200, {
+            "id": f"standin-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", options.model),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": usage(prompt, content),
+        })
+
+    def _write_chunk(self, data):
+        """One chunked transfer-encoding frame (an empty one ends the body)"""
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_stream(self, model, content, prompt):
+        """Server-sent events in the chat-completions streaming shape; usage rides on the last chunk, then [DONE]"""
+        options = self.server.options
+        completion_id = f"standin-{uuid.uuid4().hex[:12]}"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        step = max(1, options.chunk_chars)
+        try:
+            for offset in range(0, len(content), step):
+                last = offset + step >= len(content)
+                event = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {"content": content[offset:offset + step]},
+                                 "finish_reason": "stop" if last else None}],
+                }
+                if last:
+                    event["usage"] = usage(prompt, content)
+                self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                if options.chunk_delay_ms:
+                    time.sleep(options.chunk_delay_ms / 1000.0)
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # Client cancelled mid-stream
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, options):
+        super().__init__(address, StandInHandler)
+        self.options = options
+        self.request_count = 0
+        self._rng = random.Random(options.seed)
+        self._lock = threading.Lock()
+
+    def next_rng(self):
+        """Per-request RNG derived from the seed so concurrent runs stay reproducible by arrival order"""
+        with self._lock:
+            self.request_count += 1
+            return random.Random(self._rng.random())
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Local chat-completions stand-in for offline question generation.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--model", default="standin-trivia")
+    parser.add_argument("--latency-ms", type=float, default=500.0, help="Mean response latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=100.0, help="Std-dev of response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429/5xx")
+    parser.add_argument("--malformed-rate", type=float, default=0.0, help="Fraction of responses with broken JSON")
+    parser.add_argument("--questions", type=int, default=0, help="Fixed question count (default: what the prompt asks for)")
+    parser.add_argument("--pad-chars", type=int, default=0, help="Extra characters per question to inflate output size")
+    parser.add_argument("--chunk-chars", type=int, default=48, help="Characters per streamed delta (stream=true)")
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0, help="Delay between streamed deltas")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="Suppress per-request logging")
+    return parser
+
+
+def serve(options):
+    server = StandInServer((options.host, options.port), options)
+    print(f"✓ LLM stand-in listening on http://{options.host}:{server.server_address[1]}/v1")
+    print(f"  Point the game at it with MISTRAL_BASE_URL=http://{options.host}:{server.server_address[1]}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    serve(build_parser().parse_args())
@@ -3,7 +3,9 @@
 Test script to verify Trivia Royale enhancements are working
 """
 
+import json
 import os
+import random
 import sys
 
 def test_asset_paths():
@@ -95,6 +97,307 @@ def test_trivia_royale_classes():
         print(f"✗ Failed to import TriviaRoyale: {e}")
         return False
 
+def _fuzz_response(rng):
+    """Random LLM-style response: (text, end offset of each question object)"""
+    alphabet = 'abc XYZ é"\\{}[],:\n\t'
+    questions = []
+    for i in range(rng.randint(1, 12)):
+        noise = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 8)))
+        questions.append({"question": f"Question {i} {noise}?", "answer": rng.choice([f"Answer {noise}", i, 3.5])})
+
+    prefix = rng.choice(["", "```json\n", "Sure! Here are {your} questions:\n", '{"questions": '])
+    text = prefix + "["
+    ends = []
+    for i, q_data in enumerate(questions):
+        text += (", " if i else "") + json.dumps(q_data, indent=rng.choice([None, 2]), ensure_ascii=rng.random() < 0.5)
+        ends.append(len(text))
+    text += "]" + ("}" if prefix.startswith("{") else "") + rng.choice(["", "\n```", "\nHope that helps!"])
+    return text, ends
+
+
+def test_question_extraction(iterations=300):
+    """Fuzz the shared LLM JSON extraction: noisy, truncated and arbitrarily chunked responses"""
+    print("\n\n🔍 Fuzzing LLM question extraction...\n")
+
+    try:
+        sys.path.insert(0, os.getcwd())
+        from TriviaRoyale import IncrementalQuestionParser, extract_questions
+    except Exception as e:
+        print(f"✗ Failed to import TriviaRoyale: {e}")
+        return False
+
+    rng = random.Random(2024)
+    failures = 0
+    for _ in range(iterations):
+        text, ends = _fuzz_response(rng)
+        cut = rng.randint(1, len(text)) if rng.random() < 0.5 else len(text)
+        response = text[:cut]
+        expected = sum(1 for end in ends if end <= cut)
+
+        whole, report = extract_questions(response)
+
+        parser = IncrementalQuestionParser()
+        streamed = []
+        pos = 0
+        while pos < len(response):
+            size = rng.randint(1, 40)
+            streamed.extend(parser.feed(response[pos:pos + size]))
+            pos += size
+
+        if len(whole) != expected or streamed != whole or report["recovered"] != expected:
+            failures += 1
+            if failures <= 3:
+                print(f"✗ Expected {expected} questions, got {len(whole)} whole / {len(streamed)} streamed:\n{response!r}")
+
+    salvaged, report = extract_questions('[{"Question": "Kept?", "answer": "yes",}, {"question": "Broken", "ans')
+    if len(salvaged) != 1 or not report["truncated"]:
+        failures += 1
+        print(f"✗ Trailing comma / truncation salvage failed: {salvaged} {report}")
+
+    if failures:
+        print(f"✗ {failures} of {iterations} fuzzed responses parsed incorrectly")
+        return False
+    print(f"✓ {iterations} fuzzed responses parsed identically whole and streamed")
+    return True
+
+def test_game_engine():
+    """Drives a two-team GameEngine through every phase, a streaming pause and both early endings"""
+    print("\n\n🔍 Checking the game engine...\n")
+
+    try:
+        sys.path.insert(0, os.getcwd())
+        from TriviaRoyale import GameEngine, GameStateError
+    except Exception as e:
+        print(f"✗ Failed to import TriviaRoyale: {e}")
+        return False
+
+    def make_engine(questions, num_rounds=2, pending=False):
+        engine = GameEngine(["Red", "Blue"], num_rounds, questions, questions_pending=pending)
+        events = []
+        engine.subscribe(lambda event, payload: events.append((event, payload)))
+        return engine, events
+
+    def question(i):
+        return {"question": f"Question {i}?", "answer": f"Answer {i}"}
+
+    # Streamed game: two questions so far, so turn three waits until more arrive
+    questions = [question(0), question(1)]
+    engine, events = make_engine(questions, pending=True)
+    engine.start()
+    for correct in (True, False):
+        engine.reveal_answer()
+        engine.mark_answer(correct)
+    if engine.phase != "waiting" or events[-1][0] != "waiting_for_questions":
+        print(f"✗ Running out of streamed questions gave phase '{engine.phase}'")
+        return False
+    engine.questions_arrived()  # Nothing new yet: still waiting
+    questions.extend(question(i) for i in range(2, 5))
+    engine.questions_arrived()
+    if engine.phase != "question" or engine.current_question() != questions[2]:
+        print(f"✗ questions_arrived did not resume the game (phase '{engine.phase}')")
+        return False
+    try:
+        engine.mark_answer(True)
+        print("✗ mark_answer was allowed before the answer was revealed")
+        return False
+    except GameStateError:
+        pass
+    engine.skip_question()  # Red's round-two question; Blue gets the next one
+    engine.reveal_answer()
+    engine.mark_answer(True)
+    engine.finish_questions()
+    if engine.phase != "wagers" or engine.scores != [10, 10]:
+        print(f"✗ Expected wagers with scores [10, 10], got '{engine.phase}' {engine.scores}")
+        return False
+    try:
+        engine.submit_wager(11)
+        print("✗ A wager above the team's score was accepted")
+        return False
+    except ValueError:
+        pass
+    engine.submit_wager(5)
+    engine.submit_wager(10)
+    engine.reveal_final_answer()
+    engine.mark_final_answer(False)
+    engine.mark_final_answer(True)
+    event, payload = events[-1]
+    if event != "game_over" or payload["reason"] is not None or engine.scores != [5, 20] \
+            or payload["winners"] != [("Blue", 20)]:
+        print(f"✗ Unexpected ending {event} {payload} with scores {engine.scores}")
+        return False
+    print(f"✓ Two-team game: waited for streamed questions, resumed, wagered and finished {engine.scores}")
+
+    engine, events = make_engine([question(i) for i in range(4)])
+    engine.start()
+    for _ in range(4):
+        engine.reveal_answer()
+        engine.mark_answer(True)
+    if events[-1][0] != "game_over" or events[-1][1]["reason"] != "no_final_question":
+        print(f"✗ Expected no_final_question, got {events[-1]}")
+        return False
+
+    engine, events = make_engine([question(i) for i in range(3)], pending=True)
+    engine.start()
+    for _ in range(3):
+        engine.reveal_answer()
+        engine.mark_answer(False)
+    engine.finish_questions()
+    if events[-1][0] != "game_over" or events[-1][1]["reason"] != "out_of_questions":
+        print(f"✗ Expected out_of_questions, got {events[-1]}")
+        return False
+    print("✓ Games end early with no_final_question and out_of_questions")
+    return True
+
+def test_provider_routing():
+    """Registry, the local stand-in provider end to end, latency ranking and the circuit breaker"""
+    print("\n\n🔍 Checking LLM provider routing...\n")
+
+    try:
+        sys.path.insert(0, os.getcwd())
+        import tempfile
+        import threading
+        from types import SimpleNamespace
+        from TriviaRoyale import PROVIDER_REGISTRY, HedgedQuestionRace, PooledHTTPClient, ProviderRouter, TriviaGame
+        from llm_standin_server import StandInServer, build_parser
+    except Exception as e:
+        print(f"✗ Failed to import TriviaRoyale / llm_standin_server: {e}")
+        return False
+
+    options = build_parser().parse_args(["--port", "0", "--latency-ms", "20", "--latency-jitter-ms", "0",
+                                         "--chunk-delay-ms", "0", "--quiet", "--seed", "7"])
+    server = StandInServer(("127.0.0.1", 0), options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    passed = True
+    try:
+        settings = {"LOCAL_LLM_URL": f"http://127.0.0.1:{server.server_address[1]}/v1"}
+        providers = [cls.from_settings(settings, PooledHTTPClient()) for cls in PROVIDER_REGISTRY.values()]
+        available = [provider.name for provider in providers if provider.available]
+        if available != ["Local"]:
+            print(f"✗ Expected only the local stand-in to be available, got {available}")
+            return False
+        print(f"✓ Registered providers: {', '.join(PROVIDER_REGISTRY)}")
+
+        warmed = TriviaGame._warm_llm_clients(SimpleNamespace(llm_providers=providers))
+        if warmed != "1 of 1 hosts resolved":
+            print(f"✗ Title screen warm-up of the Local provider gave '{warmed}'")
+            return False
+        print(f"✓ Warm-up resolved the Local provider's host ({warmed})")
+
+        stats_path = os.path.join(tempfile.mkdtemp(prefix="trivia_router_"), "provider_stats.json")
+        router = ProviderRouter(providers, path=stats_path)
+        received = []
+        race = HedgedQuestionRace([(p.name, p.stream) for p in router.ranked()], 3, received.append)
+        if race.run("Generate 5 unique trivia questions") != "Local" or len(received) != 5:
+            print(f"✗ Stand-in race returned {len(received)} questions: {race.stats}")
+            return False
+        router.record_race(race.stats)
+        print(f"✓ Local stand-in streamed {len(received)} questions ({router.describe()})")
+
+        fast, slow = SimpleNamespace(name="Fast", available=True), SimpleNamespace(name="Slow", available=True)
+        router = ProviderRouter([slow, fast], path=stats_path)
+        router.record("Slow", True, 3.0)
+        router.record("Fast", True, 0.4)
+        if [p.name for p in router.ranked()] != ["Fast", "Slow"]:
+            print("✗ Faster provider was not ranked first")
+            passed = False
+        for _ in range(3):
+            router.record("Fast", False)
+        router.save()
+        reloaded = ProviderRouter([slow, fast], path=stats_path)
+        if [p.name for p in reloaded.ranked()] != ["Slow"]:
+            print(f"✗ Open circuit did not survive a reload: {reloaded.stats()}")
+            passed = False
+        else:
+            print("✓ Three failures open the circuit, and it persists between runs")
+
+        reloaded._state["Fast"]["open_until"] = 0.0  # Cooldown over: Fast is due one trial request
+        first, second = [p.name for p in reloaded.ranked()], [p.name for p in reloaded.ranked()]
+        reloaded.release(["Fast"])
+        if first != ["Slow", "Fast"] or second != ["Slow"] or "Fast" not in [p.name for p in reloaded.ranked()]:
+            print(f"✗ Half-open trial was not handed out exactly once: {first}, then {second}")
+            passed = False
+        else:
+            print("✓ A half-open provider gets one trial request at a time")
+    finally:
+        server.shutdown()
+        server.server_close()
+    return passed
+
+def test_music_cache():
+    """Game music decodes into memory, evicts least recently played tracks and switches without reloading"""
+    print("\n\n🔍 Checking music cache...\n")
+
+    try:
+        sys.path.insert(0, os.getcwd())
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        import pygame
+        from TriviaRoyale import MusicManager, THINKING_THEMES
+        pygame.mixer.init()
+    except Exception as e:
+        print(f"✗ Failed to set up the mixer: {e}")
+        return False
+
+    try:
+        first, second, third = THINKING_THEMES[:3]
+        manager = MusicManager(max_bytes=12 * 1024 * 1024)  # Room for two ~5 MB thinking themes
+        if manager.preload([first, second]) != 2:
+            print(f"✗ Thinking themes were not decoded: {manager.stats()}")
+            return False
+        manager.play(first)
+        manager.play(second)  # Crossfades; first is now the least recently played
+        manager.load(third)
+        if manager.is_cached(first) or not manager.is_cached(second) or not manager.is_cached(third):
+            print(f"✗ Eviction did not drop the least recently played track: {manager.stats()}")
+            return False
+        manager.stop()
+        stats = manager.stats()
+        print(f"✓ {stats['tracks']} tracks in {stats['mb']} of {stats['max_mb']} MB, {stats['evicted']} evicted, "
+              f"{stats['hits']} instant switches")
+        return True
+    finally:
+        pygame.mixer.quit()
+
+def test_generation_metrics():
+    """Metrics records append and rotate, and the summary CLI's percentiles and failure rate match known input"""
+    print("\n\n🔍 Checking generation metrics...\n")
+
+    try:
+        sys.path.insert(0, os.getcwd())
+        import tempfile
+        from TriviaRoyale import GenerationMetrics
+        from generation_metrics import group_records, read_records
+    except Exception as e:
+        print(f"✗ Failed to import TriviaRoyale / generation_metrics: {e}")
+        return False
+
+    path = os.path.join(tempfile.mkdtemp(prefix="trivia_metrics_"), "generation_metrics.jsonl")
+    metrics = GenerationMetrics(path, max_bytes=2048)
+    for i in range(10):
+        failed = i >= 8
+        metrics.append({"provider": "Fast", "model": "m", "status": "failed" if failed else "won",
+                        "ttfb_s": None if failed else 0.1 * (i + 1), "first_question_s": None if failed else 0.2 * (i + 1),
+                        "total_s": 1.0 + i, "questions": 0 if failed else 10, "rejected": 1 if i == 0 else 0,
+                        "retries": 2 if failed else 0, "padding": "x" * 200})
+    if not os.path.exists(path + ".1") or os.path.getsize(path) > 2048:
+        print("✗ Metrics log did not rotate at 2048 bytes")
+        return False
+    records, skipped = read_records(path)
+    if len(records) != 10 or skipped:
+        print(f"✗ Expected 10 records across the live and rotated files, read {len(records)} ({skipped} skipped)")
+        return False
+    print(f"✓ {metrics.written} records written, rotated to .1 and read back in order")
+
+    summary = group_records(records, ["provider"])[("Fast",)]
+    expected = {"calls": 10, "failed": 2, "failure_rate": 0.2, "rejected": 1, "mean_retries": 0.4}
+    wrong = {key: summary[key] for key, value in expected.items() if summary[key] != value}
+    ttfb = summary["ttfb_s"]
+    if wrong or [round(ttfb[p], 3) for p in ("p50", "p90", "p99")] != [0.5, 0.7, 0.8]:
+        print(f"✗ Unexpected summary {wrong or ttfb}")
+        return False
+    print(f"✓ Summary: {summary['failure_rate']:.0%} failed, ttfb p50/p90/p99 "
+          f"{ttfb['p50']:.1f}/{ttfb['p90']:.1f}/{ttfb['p99']:.1f}s, {summary['questions_per_s']} questions/s")
+    return True
+
 def main():
     print("=" * 70)
     print("  Trivia Royale - Enhancement Verification Test")
@@ -107,6 +410,11 @@ def main():
     results.append(("Asset Paths", test_asset_paths()))
     results.append(("Module Imports", test_imports()))
     results.append(("TriviaRoyale Classes", test_trivia_royale_classes()))
+    results.append(("Question Extraction", test_question_extraction()))
+    results.append(("Game Engine", test_game_engine()))
+    results.append(("Provider Routing", test_provider_routing()))
+    results.append(("Music Cache", test_music_cache()))
+    results.append(("Generation Metrics", test_generation_metrics()))
     
     # Summary
     print("\n\n" + "=" * 70)